@@ -0,0 +1,78 @@
+# Memory footprint of the core table objects, measured with tracemalloc.
+# Run from the repository root:
+#
+#     python -m benchmarks.footprint [--check]
+#
+# With --check the script exits non-zero when a measurement is over budget.
+
+import argparse
+import gc
+import random
+import sys
+import tracemalloc
+
+from typing import Callable, Dict
+
+from components import Deck, Shoe
+from games import BlackJack, AI
+
+# Bytes per object. Raise a budget only alongside the change that needs it.
+BUDGETS: Dict[str, int] = {
+    'idle table': 3500,
+    'active seat': 2500,
+    'shoe': 30000,
+}
+
+def measure(build: Callable[[], object], count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del objects
+    return (after - before) / count
+
+def active_table(cards: Deck, seats: int, rounds: int) -> BlackJack:
+    table = BlackJack(25, deck=cards, limit=seats)
+    for _ in range(seats):
+        table.join(AI(1000))
+    for _ in range(rounds):
+        table.play()
+    return table
+
+def report(tables: int = 500, seats: int = 6, rounds: int = 20, shoes: int = 50, num_decks: int = 8) -> Dict[str, float]:
+    random.seed(0)
+    cards = Deck.create_standard_deck(num_decks)
+
+    # Shoes share Card objects between tables, so a table's own shoe is only
+    # the list holding them; the cards themselves are counted once per shoe.
+    empty = measure(lambda: BlackJack(25, deck=Deck(), limit=seats), tables)
+    dealt = measure(lambda: BlackJack(25, deck=cards, limit=seats), tables // 5)
+    active = measure(lambda: active_table(cards, seats, rounds), tables // 5)
+
+    return {
+        'idle table': empty,
+        'active seat': (active - dealt) / seats,
+        'shoe': measure(lambda: Shoe.standard(num_decks), shoes),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Report bytes per idle table, per active seat and per shoe.")
+    parser.add_argument("--check", action="store_true", help="exit non-zero when a measurement is over budget")
+    args = parser.parse_args()
+
+    over = []
+    for name, size in report().items():
+        budget = BUDGETS[name]
+        flag = "" if size <= budget else "  OVER BUDGET"
+        print(f"{name:>12}: {size:10,.0f} bytes (budget {budget:,}){flag}")
+        if size > budget:
+            over.append(name)
+
+    if args.check and over:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
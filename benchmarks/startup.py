@@ -0,0 +1,43 @@
+# Time-to-first-hand for a fresh interpreter: start Python, import the
+# packages, seat an AI and play one round. Run from the repository root:
+#
+#     python -m benchmarks.startup [--runs N]
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STAGES = {
+    'interpreter': "pass",
+    'import': "from games import BlackJack, AI",
+    'first hand': "from games import BlackJack, AI\ntable = BlackJack(25)\ntable.join(AI(1000))\ntable.play()",
+}
+
+def time_stage(code: str, runs: int) -> List[float]:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+def report(runs: int = 10) -> Dict[str, List[float]]:
+    return {name: time_stage(code, runs) for name, code in STAGES.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time-to-first-hand for a fresh interpreter.")
+    parser.add_argument("--runs", type=int, default=10, help="interpreters started per stage")
+    args = parser.parse_args()
+
+    for name, times in report(args.runs).items():
+        print(f"{name:>12}: median {statistics.median(times) * 1000:7.1f} ms, best {min(times) * 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
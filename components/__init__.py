@@ -1,27 +1,43 @@
-from .utils import *
-from .deck import *
-from .wheel import *
-from .chip import Chip
-from .pot import Pot
-from .player import *
-from .table import *
+from importlib import import_module
 
-__all__ = [
-    'Card',
-    'Chip',
-    'Pot',
-    'Deck',
-    'Spoke',
-    'Wheel',
-    'Color',
-    'Suit',
-    'Symbol',
-    'Player',
-    'Table',
-    'Seat',
-    'get_card_color',
-    'bool_input',
-]
+# Attributes are imported on first use, so a worker that only needs a deck
+# does not pay for the rest of the package.
+_exports = {
+    'Card': '.deck',
+    'Chip': '.chip',
+    'Pot': '.pot',
+    'Balance': '.balance',
+    'Journal': '.balance',
+    'Deck': '.deck',
+    'Shoe': '.shoe',
+    'ContinuousShuffler': '.shoe',
+    'Procedure': '.shuffle',
+    'Spoke': '.wheel',
+    'Wheel': '.wheel',
+    'Color': '.utils',
+    'Suit': '.utils',
+    'Symbol': '.utils',
+    'Player': '.player',
+    'Table': '.table',
+    'Seat': '.table',
+    'TableLedger': '.ledger',
+    'CasinoLedger': '.ledger',
+    'get_card_color': '.utils',
+    'bool_input': '.utils',
+}
+
+__all__ = list(_exports)
+
+def __getattr__(name: str):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(_exports[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 """
 Core components of the standard 52 card deck used it most
@@ -0,0 +1,181 @@
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+from .chip import Chip
+from .pot import Pot
+from .utils import Color
+
+class Transaction(NamedTuple):
+    kind: str
+    amount: int
+    balance: int
+
+class Journal:
+    # Append only. Kinds are stored as small codes and amounts as signed
+    # integers, so an entry costs nine bytes however long a session runs.
+    KINDS = ('deposit', 'withdraw', 'buy_in', 'cash_out', 'bet', 'pay')
+    _codes = {kind: code for code, kind in enumerate(KINDS)}
+
+    __slots__ = ('_kinds', '_amounts')
+
+    def __init__(self):
+        self._kinds = array('b')
+        self._amounts = array('q')
+
+    def record(self, kind: str, amount: int):
+        self._kinds.append(self._codes[kind])
+        self._amounts.append(amount)
+
+    @property
+    def balance(self) -> int:
+        return sum(self._amounts)
+
+    def totals(self) -> Dict[str, int]:
+        totals = {kind: 0 for kind in self.KINDS}
+        for code, amount in zip(self._kinds, self._amounts):
+            totals[self.KINDS[code]] += amount
+        return totals
+
+    def __len__(self) -> int:
+        return len(self._amounts)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        balance = 0
+        for code, amount in zip(self._kinds, self._amounts):
+            balance += amount
+            yield Transaction(self.KINDS[code], amount, balance)
+
+    def __getitem__(self, index: int) -> Transaction:
+        return Transaction(self.KINDS[self._kinds[index]], self._amounts[index], sum(self._amounts[:index % len(self) + 1]))
+
+    def __repr__(self):
+        return f"Journal(entries={len(self)}, balance=${self.balance}.00)"
+
+class Balance:
+    # A bankroll held as one integer. It answers the parts of the Pot
+    # interface the tables use, and only breaks itself into chips when
+    # something asks for colors or counts.
+    __slots__ = ('_total', '_journal', '_chips')
+
+    def __init__(self, total: int = 0, journal: bool = False):
+        self._check(total)
+        self._total = total
+        self._journal: Optional[Journal] = Journal() if journal else None
+        self._chips: Optional[Pot] = None
+
+        if journal and total:
+            self._journal.record('deposit', total)
+
+    @staticmethod
+    def _check(amount: int):
+        if amount % Chip.min_value() != 0:
+            raise ValueError(f"Value must be a factor of {Chip.min_value()}, Value is {amount}.")
+        if amount < 0:
+            raise ValueError(f"A balance cannot hold a negative amount, Value is {amount}.")
+
+    @staticmethod
+    def _amount(val: Union['Balance', Pot, Chip, int]) -> int:
+        if isinstance(val, (Balance, Pot)):
+            return val.total
+        if isinstance(val, Chip):
+            return val.value
+        if isinstance(val, int):
+            return val
+        raise ValueError("Balances are constrained to Balance, Pot, Chip, and Int types.")
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    @property
+    def journal(self) -> Optional[Journal]:
+        return self._journal
+
+    @property
+    def chips(self) -> Pot:
+        if self._chips is None:
+            self._chips = Pot.from_int(self._total)
+        return self._chips
+
+    @property
+    def count(self) -> int:
+        return self.chips.count
+
+    @property
+    def empty(self) -> bool:
+        return not self._total
+
+    def deposit(self, val: Union['Balance', Pot, Chip, int], kind: str = 'deposit') -> 'Balance':
+        amount = self._amount(val)
+        self._check(amount)
+
+        self._total += amount
+        self._chips = None
+        if self._journal is not None:
+            self._journal.record(kind, amount)
+        return Balance(amount)
+
+    def withdraw(self, val: Union['Balance', Pot, Chip, int], kind: str = 'withdraw') -> 'Balance':
+        amount = self._amount(val)
+        self._check(amount)
+        if amount > self._total:
+            raise ValueError("Pot cannot be negative, value removed is greater than Pot total value.")
+
+        self._total -= amount
+        self._chips = None
+        if self._journal is not None:
+            self._journal.record(kind, -amount)
+        return Balance(amount)
+
+    def append(self, val: Union['Balance', Pot, Chip, int]) -> 'Balance':
+        self.deposit(val)
+        return self
+
+    def remove(self, val: Union['Balance', Pot, Chip, int]) -> 'Balance':
+        return self.withdraw(val)
+
+    def clear(self):
+        if self._total:
+            self.withdraw(self._total)
+
+    def multiply(self, x: int) -> 'Balance':
+        return Balance(self._total * x)
+
+    def divide(self, x: int) -> 'Balance':
+        return Balance(Chip.to_chip_int(self._total // x))
+
+    def optimize(self):
+        pass
+
+    def to_chips(self) -> List[Chip]:
+        return self.chips.to_chips()
+
+    def keys(self):
+        return self.chips.keys()
+
+    def values(self):
+        return self.chips.values()
+
+    def items(self):
+        return self.chips.items()
+
+    def __getitem__(self, color: Color) -> int:
+        return self.chips[color]
+
+    def __iter__(self) -> Iterator[Color]:
+        return iter(self.chips)
+
+    def __len__(self) -> int:
+        return len(self.chips)
+
+    def __bool__(self) -> bool:
+        return self._total > 0
+
+    def __add__(self, other: Union['Balance', Pot]) -> 'Balance':
+        return self.append(other)
+
+    def __str__(self):
+        return f"(Value: ${self._total}.00)"
+
+    def __repr__(self):
+        return f"Balance(value=${self._total}.00{', journal=' + str(len(self._journal)) if self._journal is not None else ''})"
\ No newline at end of file
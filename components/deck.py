@@ -3,7 +3,9 @@ from typing import List, Optional, Union
 import random    
 
 class Card:
-    __slot__ = ('suit', 'symbol', 'name', 'color')
+    # A shoe holds hundreds of cards, so only the symbol and suit are stored
+    # and the display name and color are derived on demand.
+    __slots__ = ('suit', 'symbol')
 
     def __init__(self, symbol: Symbol, suit: Optional[Suit] = None) -> None:
         if symbol != Symbol.JOKER and suit is None:
@@ -11,9 +13,18 @@ class Card:
         
         self.suit = suit
         self.symbol = symbol
-        self.name = "Joker" if symbol is Symbol.JOKER else f"{symbol.name.capitalize()} of {suit.value}"
-        self.color = None if symbol is Symbol.JOKER else get_card_color(suit)
+
+    @property
+    def name(self) -> str:
+        return "Joker" if self.symbol is Symbol.JOKER else f"{self.symbol.name.capitalize()} of {self.suit.value}"
+
+    @property
+    def color(self) -> Optional[Color]:
+        return None if self.symbol is Symbol.JOKER else get_card_color(self.suit)
     
+    def __reduce__(self):
+        return Card, (self.symbol, self.suit)
+
     def __repr__(self):
         return f"Card({self.name})"
 
@@ -82,6 +93,9 @@ class Deck(List[Card]):
             raise TypeError("Deck can only contain Card instances")
         super().__setitem__(index, value)
 
+    def __reduce__(self):
+        return Deck, (list(self),)
+
     def __str__(self):
         return f"({', '.join([card.name for card in self])})"
 
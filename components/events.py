@@ -0,0 +1,155 @@
+import json
+import sys
+
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, TextIO, Union
+
+class Event(NamedTuple):
+    kind: str
+    round: int
+    seat: Optional[int]
+    player: Optional[str]
+    data: Dict[str, Any]
+    hand: int = 0
+
+class Subscriber(ABC):
+    # None subscribes to every kind of event.
+    kinds: Optional[Iterable[str]] = None
+
+    @abstractmethod
+    def handle(self, event: Event):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+class _Callback(Subscriber):
+    def __init__(self, function: Callable[[Event], Any], kinds: Optional[Iterable[str]] = None):
+        self._function = function
+        self.kinds = kinds
+
+    def handle(self, event: Event):
+        self._function(event)
+
+class EventBus:
+    def __init__(self):
+        self._subscribers: List[Subscriber] = []
+        self._routes: Dict[str, List[Subscriber]] = {}
+
+    @property
+    def subscribers(self) -> List[Subscriber]:
+        return list(self._subscribers)
+
+    # Emitters check the bus before building an event, so a bus with no
+    # subscribers costs a single truth test per call site.
+    def __bool__(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, subscriber: Union[Subscriber, Callable[[Event], Any]], kinds: Optional[Iterable[str]] = None) -> Subscriber:
+        if not isinstance(subscriber, Subscriber):
+            subscriber = _Callback(subscriber, kinds)
+        elif kinds is not None:
+            raise ValueError("Subscriber objects declare their own kinds.")
+
+        self._subscribers.append(subscriber)
+        self._routes.clear()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.remove(subscriber)
+        self._routes.clear()
+
+    def _route(self, kind: str) -> List[Subscriber]:
+        route = self._routes.get(kind)
+        if route is None:
+            route = self._routes[kind] = [subscriber for subscriber in self._subscribers if subscriber.kinds is None or kind in subscriber.kinds]
+        return route
+
+    def emit(self, kind: str, round: int, seat: Optional[int] = None, player: Optional[str] = None, hand: int = 0, **data: Any):
+        route = self._route(kind)
+        if not route:
+            return
+
+        event = Event(kind, round, seat, player, data, hand)
+        for subscriber in route:
+            subscriber.handle(event)
+
+    def flush(self):
+        for subscriber in self._subscribers:
+            subscriber.flush()
+
+    def close(self):
+        for subscriber in self._subscribers:
+            subscriber.close()
+        self._subscribers.clear()
+        self._routes.clear()
+
+class JsonLinesLogger(Subscriber):
+    def __init__(self, path: Optional[str] = None, stream: Optional[TextIO] = None, batch_size: int = 1024, kinds: Optional[Iterable[str]] = None):
+        if (path is None) == (stream is None):
+            raise ValueError("JsonLinesLogger needs exactly one of a path or a stream.")
+
+        self._file = open(path, "a") if path is not None else None
+        self._stream = self._file or stream
+        self._batch_size = batch_size
+        self._pending: List[Event] = []
+        self.kinds = frozenset(kinds) if kinds is not None else None
+
+    def handle(self, event: Event):
+        self._pending.append(event)
+        if len(self._pending) >= self._batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+
+        lines = [json.dumps({'kind': event.kind, 'round': event.round, 'seat': event.seat, 'hand': event.hand, 'player': event.player, **self._plain(event.data)}) for event in self._pending]
+        self._pending.clear()
+        self._stream.write("\n".join(lines) + "\n")
+        self._stream.flush()
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def _plain(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {getattr(key, 'name', key): JsonLinesLogger._plain(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [JsonLinesLogger._plain(item) for item in value]
+        if value is None or isinstance(value, (str, int, float)):
+            return value
+        return getattr(value, 'name', str(value))
+
+class StreamWriter(Subscriber):
+    def __init__(self, stream: Optional[TextIO] = None, batch_size: int = 256):
+        self._stream = stream
+        self._batch_size = batch_size
+        self._pending: List[Event] = []
+
+    @abstractmethod
+    def format(self, event: Event) -> Optional[str]:
+        pass
+
+    def handle(self, event: Event):
+        self._pending.append(event)
+        if len(self._pending) >= self._batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+
+        events, self._pending = self._pending, []
+        lines = [line for line in map(self.format, events) if line is not None]
+        if lines:
+            stream = self._stream or sys.stdout
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
\ No newline at end of file
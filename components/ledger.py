@@ -0,0 +1,182 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from .player import Player
+
+# Chips are whole dollars; the ledger keeps every amount in integer cents so
+# house figures never round.
+CENTS = 100
+
+class LedgerEntry(NamedTuple):
+    round: int
+    wagers: int
+    payouts: int
+    insurance: int
+    insurance_paid: int
+    fills: int
+    credits: int
+    tray: int
+
+    @property
+    def net(self) -> int:
+        return self.wagers + self.insurance - self.payouts - self.insurance_paid
+
+class Discrepancy(NamedTuple):
+    table: str
+    round: int
+    house: int
+    players: int
+
+    def __str__(self):
+        return f"Discrepancy(table={self.table}, round={self.round}, house net={self.house / CENTS:+.2f}, players net={self.players / CENTS:+.2f})"
+
+class TableLedger:
+    _entry_dtype = np.dtype([(name, 'int64') for name in LedgerEntry._fields])
+
+    # Chip movements inside a round are only summed as integers. Once the
+    # round is over the house net is checked against the change in the
+    # players' Pot totals, and the tray is filled from or credited to the
+    # cage when it leaves its band.
+    def __init__(self, name: str, tray: int = 50000, fill_below: Optional[int] = None, credit_above: Optional[int] = None, strict: bool = False, batch_size: int = 1024):
+        if tray < 0 or batch_size < 1:
+            raise ValueError("A table ledger needs a non-negative tray and a positive batch size.")
+
+        self._name = name
+        self._par = tray * CENTS
+        self._tray = self._par
+        self._fill_below = (fill_below if fill_below is not None else tray // 2) * CENTS
+        self._credit_above = (credit_above if credit_above is not None else tray * 2) * CENTS
+        if not self._fill_below <= self._par <= self._credit_above:
+            raise ValueError(f"The tray par must sit between the fill and credit levels, Values are {fill_below}, {tray} and {credit_above}.")
+
+        self._strict = strict
+        self._batch_size = batch_size
+
+        self._players: List[Player] = []
+        self._opening = 0
+        self._wagers = self._payouts = self._insurance = self._insurance_paid = 0
+
+        self._entries: List[tuple] = []
+        self._chunks: List[np.ndarray] = []
+        self._totals = np.zeros(len(LedgerEntry._fields), dtype=np.int64)
+        self._discrepancies: List[Discrepancy] = []
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def tray(self) -> int:
+        return self._tray
+
+    @property
+    def discrepancies(self) -> List[Discrepancy]:
+        return self._discrepancies
+
+    def open(self, players: Iterable[Player], staked: int):
+        # Called once bets are down; the stakes are still the players' money.
+        self._players = list(players)
+        self._opening = (sum(player.bankroll.total for player in self._players) + staked) * CENTS
+        self._wagers = self._payouts = self._insurance = self._insurance_paid = 0
+
+    def settle(self, bet: int, amount: int):
+        self._wagers += bet
+        self._payouts += amount
+
+    def insure(self, amount: int):
+        self._insurance += amount
+
+    def pay_insurance(self, amount: int):
+        self._insurance_paid += amount
+
+    def close(self, round: int) -> LedgerEntry:
+        wagers, payouts = self._wagers * CENTS, self._payouts * CENTS
+        insurance, insurance_paid = self._insurance * CENTS, self._insurance_paid * CENTS
+        house = wagers + insurance - payouts - insurance_paid
+
+        players = sum(player.bankroll.total for player in self._players) * CENTS - self._opening
+        if players != -house:
+            discrepancy = Discrepancy(self._name, round, house, players)
+            if self._strict:
+                raise ValueError(f"House and player totals do not reconcile: {discrepancy}")
+            self._discrepancies.append(discrepancy)
+
+        self._tray += house
+        fills = credits = 0
+        if self._tray < self._fill_below:
+            fills = self._par - self._tray
+        elif self._tray > self._credit_above:
+            credits = self._tray - self._par
+        self._tray += fills - credits
+
+        entry = LedgerEntry(round, wagers, payouts, insurance, insurance_paid, fills, credits, self._tray)
+        self._entries.append(entry)
+        if len(self._entries) >= self._batch_size:
+            self.flush()
+
+        self._players = []
+        return entry
+
+    def flush(self):
+        if not self._entries:
+            return
+
+        batch = np.array(self._entries, dtype=self._entry_dtype)
+        self._entries.clear()
+        self._chunks.append(batch)
+        for index, name in enumerate(LedgerEntry._fields):
+            if name not in ('round', 'tray'):
+                self._totals[index] += batch[name].sum()
+
+    @property
+    def entries(self) -> np.ndarray:
+        self.flush()
+        if not self._chunks:
+            return np.zeros(0, dtype=self._entry_dtype)
+        if len(self._chunks) > 1:
+            self._chunks = [np.concatenate(self._chunks)]
+        return self._chunks[0]
+
+    def totals(self) -> Dict[str, int]:
+        self.flush()
+        totals = dict(zip(LedgerEntry._fields, self._totals.tolist()))
+        del totals['round']
+        totals['tray'] = self._tray
+        totals['net'] = totals['wagers'] + totals['insurance'] - totals['payouts'] - totals['insurance_paid']
+        return totals
+
+    def __repr__(self):
+        totals = self.totals()
+        return f"TableLedger(name={self._name}, net=${totals['net'] / CENTS:,.2f}, tray=${self._tray / CENTS:,.2f}, fills=${totals['fills'] / CENTS:,.2f}, credits=${totals['credits'] / CENTS:,.2f})"
+
+class CasinoLedger:
+    def __init__(self, name: str = "Casino"):
+        self._name = name
+        self._tables: Dict[str, TableLedger] = {}
+
+    @property
+    def tables(self) -> Dict[str, TableLedger]:
+        return self._tables
+
+    def table(self, name: str, **kwargs) -> TableLedger:
+        if name in self._tables:
+            raise ValueError(f"The casino already has a table named {name}.")
+
+        ledger = self._tables[name] = TableLedger(name, **kwargs)
+        return ledger
+
+    @property
+    def discrepancies(self) -> List[Discrepancy]:
+        return [discrepancy for ledger in self._tables.values() for discrepancy in ledger.discrepancies]
+
+    def totals(self) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for ledger in self._tables.values():
+            for name, value in ledger.totals().items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def __repr__(self):
+        totals = self.totals()
+        return f"CasinoLedger(name={self._name}, tables={len(self._tables)}, net=${totals.get('net', 0) / CENTS:,.2f}, fills=${totals.get('fills', 0) / CENTS:,.2f}, credits=${totals.get('credits', 0) / CENTS:,.2f})"
\ No newline at end of file
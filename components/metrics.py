@@ -0,0 +1,261 @@
+import bisect
+import math
+import os
+import sys
+import threading
+import time
+
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Sequence, TextIO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str = ""):
+        self._name = name
+        self._help = help
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        pass
+
+    def expose(self) -> str:
+        lines = [f"# HELP {self._name} {self._help}", f"# TYPE {self._name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str = ""):
+        super().__init__(name, help)
+        self._value = 0
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def inc(self, amount: float = 1):
+        if amount < 0:
+            raise ValueError("Counters can only increase.")
+        self._value += amount
+
+    def samples(self) -> List[str]:
+        return [f"{self._name} {self._value}"]
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str = "", function: Optional[Callable[[], float]] = None):
+        super().__init__(name, help)
+        self._value = 0
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        return self._function() if self._function is not None else self._value
+
+    def set(self, value: float):
+        self._value = value
+
+    def inc(self, amount: float = 1):
+        self._value += amount
+
+    def samples(self) -> List[str]:
+        return [f"{self._name} {self.value}"]
+
+class Histogram(Metric):
+    kind = "histogram"
+    default_buckets = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.1, 1.0)
+
+    def __init__(self, name: str, help: str = "", buckets: Optional[Sequence[float]] = None):
+        super().__init__(name, help)
+        self._bounds = sorted(buckets or self.default_buckets)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def observe(self, value: float):
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+        self._sum += value
+        self._count += 1
+
+    def time(self) -> '_Timer':
+        return _Timer(self)
+
+    def samples(self) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self._bounds, self._counts):
+            cumulative += count
+            lines.append(f'{self._name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{self._name}_bucket{{le="+Inf"}} {self._count}')
+        lines.append(f"{self._name}_sum {self._sum}")
+        lines.append(f"{self._name}_count {self._count}")
+        return lines
+
+class _Timer:
+    __slots__ = ('_histogram', '_start')
+
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start)
+
+class Registry:
+    def __init__(self, prefix: str = ""):
+        self._prefix = prefix
+        self._metrics: Dict[str, Metric] = {}
+
+    @property
+    def metrics(self) -> Dict[str, Metric]:
+        return self._metrics
+
+    def _get(self, cls, name: str, *args, **kwargs) -> Metric:
+        name = f"{self._prefix}{name}"
+        if name in self._metrics:
+            metric = self._metrics[name]
+            if not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}.")
+            return metric
+
+        metric = cls(name, *args, **kwargs)
+        self._metrics[name] = metric
+        return metric
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "", function: Optional[Callable[[], float]] = None) -> Gauge:
+        return self._get(Gauge, name, help, function)
+
+    def histogram(self, name: str, help: str = "", buckets: Optional[Sequence[float]] = None) -> Histogram:
+        return self._get(Histogram, name, help, buckets)
+
+    def expose(self) -> str:
+        return "\n".join(metric.expose() for metric in list(self._metrics.values())) + "\n"
+
+class MetricsServer:
+    def __init__(self, registry: Registry, port: int = 9100, host: str = "127.0.0.1"):
+        self._registry = registry
+        self._address = (host, port)
+        self._server: Optional['ThreadingHTTPServer'] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1] if self._server is not None else self._address[1]
+
+    def start(self) -> 'MetricsServer':
+        # http.server is slow to import, and only tables that serve metrics need it.
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self._registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+
+                body = registry.expose().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(self._address, Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+class MetricsFile:
+    def __init__(self, registry: Registry, path: str, interval: float = 5.0):
+        self._registry = registry
+        self._path = path
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'MetricsFile':
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            self.write()
+
+    def write(self):
+        temp = f"{self._path}.tmp"
+        with open(temp, "w") as file:
+            file.write(self._registry.expose())
+        os.replace(temp, self._path)
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+class Progress:
+    def __init__(self, label: str = "Game", interval: float = 2.0, total: Optional[int] = None, stream: Optional[TextIO] = None):
+        self._label = label
+        self._interval = interval
+        self._total = total
+        self._stream = stream or sys.stdout
+        self._count = 0
+        self._start = time.monotonic()
+        self._last = -math.inf
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self._start
+        return self._count / elapsed if elapsed > 0 else 0.0
+
+    def update(self, amount: int = 1):
+        self._count += amount
+
+        now = time.monotonic()
+        if now - self._last >= self._interval:
+            self._last = now
+            self.report()
+
+    def report(self):
+        total = f"/{self._total}" if self._total is not None else ""
+        print(f"{self._label} # {self._count}{total} ({self.rate:.1f}/s)", file=self._stream, flush=True)
\ No newline at end of file
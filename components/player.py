@@ -1,17 +1,21 @@
 from typing import Optional, Union
 from .pot import Pot
 from .chip import Chip
+from .balance import Balance, Journal
 
 class Player():
+    __slots__ = ('_name', '_cash', '_bankroll', '_initial')
     __player_count = 0
 
-    def __init__(self, cash: int, name: Optional[str] = None):
+    # With journal=True the bankroll is an integer Balance that records every
+    # movement; chips are only counted out when something asks for them.
+    def __init__(self, cash: int, name: Optional[str] = None, journal: bool = False):
         if not name:
             Player.__player_count += 1
         
         self._name = name.capitalize() if name else f"Player{self.__player_count}"
         self._cash = cash
-        self._bankroll = Pot()
+        self._bankroll = Balance(journal=True) if journal else Pot()
         self._initial = self._cash
 
     @property
@@ -26,24 +30,39 @@ class Player():
     def bankroll(self):
         return self._bankroll
 
-    def bet(self, amount: Union[int, Pot]) -> Pot:
+    @property
+    def journal(self) -> Optional[Journal]:
+        if isinstance(self._bankroll, Balance):
+            return self._bankroll.journal
+        return None
+
+    def bet(self, amount: Union[int, Pot, Balance]) -> Union[Pot, Balance]:
+        if isinstance(self._bankroll, Balance):
+            return self._bankroll.withdraw(amount, 'bet')
         return self._bankroll.remove(amount)
     
-    def pay(self, amount: Union[int, Pot]) -> Pot:
-        self._bankroll.append(amount)
+    def pay(self, amount: Union[int, Pot, Balance]) -> Union[Pot, Balance]:
+        if isinstance(self._bankroll, Balance):
+            return self._bankroll.deposit(amount, 'pay')
 
         if isinstance(amount, int):
-            return Pot.from_int(amount)
-        
+            amount = Pot.from_int(amount)
+
+        self._bankroll.append(amount)
         return amount
 
     def buy_in(self, amount: Optional[int] = None, ask: Optional[Pot] = None):
         if not amount:
+            if isinstance(self._bankroll, Balance):
+                self._bankroll.deposit(self._cash, 'buy_in')
+                self._cash = 0
+                return
+
             self._bankroll += Pot.buy_in(self._cash)
             self._cash = 0
             return
 
-        amount = amount if amount % Chip.min_value() == 0 else amount - (amount // Chip.min_value())
+        amount = Chip.to_chip_int(amount)
 
         if amount < 0:
             raise ValueError(f"A player cannot buy in for less than ${Chip.min_value()}!")
@@ -51,15 +70,26 @@ class Player():
         if amount > self._cash:
             raise ValueError("A player cannot buy in more than is in their wallet!")
         
+        if isinstance(self._bankroll, Balance):
+            self._bankroll.deposit(Pot.buy_in(amount, ask) if ask is not None else amount, 'buy_in')
+            self._cash -= amount
+            return
+
         self._bankroll += Pot.buy_in(amount, ask)
         self._cash -= amount
     
     def cash_out(self, chips: Optional[Pot | int] = None):
         if chips:
             if isinstance(chips, int):
-                chips = chips if chips % Chip.min_value() == 0 else chips - (chips // Chip.min_value())
-                
+                chips = Chip.to_chip_int(chips)
+
+            if isinstance(self._bankroll, Balance):
+                self._cash += self._bankroll.withdraw(chips, 'cash_out').total
+                return
+
             self._cash += self._bankroll.remove(chips).total
+        elif isinstance(self._bankroll, Balance):
+            self._cash += self._bankroll.withdraw(self._bankroll.total, 'cash_out').total
         else:
             self._cash += self._bankroll.total
             self._bankroll.clear()
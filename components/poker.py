@@ -0,0 +1,227 @@
+from collections import Counter
+from functools import lru_cache
+from itertools import combinations, combinations_with_replacement
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .deck import Card
+from .utils import Suit, Symbol
+
+# Cards are encoded as rank * 4 + suit, with ranks running from deuce (0) to
+# ace (12). Hand values follow Cactus Kev's scale: 1 is a royal flush and
+# 7462 is the worst high card, so lower values are stronger hands.
+#
+# Every rank has a weight chosen so that the weights of any five or seven
+# card rank multiset sum to a unique key. That key indexes a table directly,
+# so evaluating a hand is a handful of gathers and one lookup.
+RANK_KEYS = (0, 1, 5, 22, 98, 453, 2031, 8698, 22854, 83661, 262349, 636345, 1479181)
+SUITS = list(Suit)
+HAND_CLASSES = (
+    (10, "Straight Flush"),
+    (166, "Four of a Kind"),
+    (322, "Full House"),
+    (1599, "Flush"),
+    (1609, "Straight"),
+    (2467, "Three of a Kind"),
+    (3325, "Two Pair"),
+    (6185, "One Pair"),
+    (7462, "High Card"),
+)
+
+_KEY = np.array([RANK_KEYS[card >> 2] for card in range(52)], dtype=np.int32)
+_BIT = np.array([1 << (card >> 2) for card in range(52)], dtype=np.int32)
+_SUIT = np.array([1 << (card & 3) for card in range(52)], dtype=np.int32)
+_NIBBLE = np.array([1 << (4 * (card & 3)) for card in range(52)], dtype=np.int32)
+
+class _Tables(NamedTuple):
+    flush: np.ndarray
+    ranks: np.ndarray
+
+class Equity(NamedTuple):
+    win: float
+    tie: float
+    equity: float
+
+def encode(card: Card) -> int:
+    if card.symbol is Symbol.JOKER:
+        raise ValueError("Jokers cannot be encoded for poker hands.")
+    return ((card.symbol.rank - 2) % 13) * 4 + SUITS.index(card.suit)
+
+def encode_cards(cards: Iterable[Card]) -> np.ndarray:
+    return np.array([encode(card) for card in cards], dtype=np.intp)
+
+def decode(code: int) -> Card:
+    rank = code >> 2
+    symbol = Symbol.ACE if rank == 12 else Symbol(rank + 2)
+    return Card(symbol, SUITS[code & 3])
+
+def hand_class(value: int) -> str:
+    for bound, name in HAND_CLASSES:
+        if value <= bound:
+            return name
+    raise ValueError(f"Hand values run from 1 to 7462, Value is {value}.")
+
+def _strength(ranks: Tuple[int, ...], flush: bool) -> Tuple[int, Tuple[int, ...]]:
+    counts = Counter(ranks)
+    groups = sorted(counts.items(), key=lambda item: (item[1], item[0]), reverse=True)
+    shape = tuple(count for _, count in groups)
+    order = tuple(rank for rank, _ in groups)
+
+    if shape == (1, 1, 1, 1, 1):
+        if order[0] - order[4] == 4:
+            return (8 if flush else 4, (order[0],))
+        if order == (12, 3, 2, 1, 0):
+            return (8 if flush else 4, (3,))
+        return (5 if flush else 0, order)
+
+    categories = {(4, 1): 7, (3, 2): 6, (3, 1, 1): 3, (2, 2, 1): 2, (2, 1, 1, 1): 1}
+    return (categories[shape], order)
+
+def _multisets(size: int) -> List[Tuple[int, ...]]:
+    return [ranks for ranks in combinations_with_replacement(range(13), size) if max(Counter(ranks).values()) <= 4]
+
+@lru_cache(maxsize=None)
+def _values() -> dict:
+    hands = []
+    for ranks in _multisets(5):
+        hands.append(_strength(ranks, False))
+        if len(set(ranks)) == 5:
+            hands.append(_strength(ranks, True))
+
+    return {strength: value for value, strength in enumerate(sorted(set(hands), reverse=True), 1)}
+
+@lru_cache(maxsize=None)
+def _tables5() -> _Tables:
+    values = _values()
+    flush = np.zeros(1 << 13, dtype=np.int16)
+    ranks = np.zeros(4 * RANK_KEYS[12] + RANK_KEYS[11] + 1, dtype=np.int16)
+
+    for hand in _multisets(5):
+        ranks[sum(RANK_KEYS[rank] for rank in hand)] = values[_strength(hand, False)]
+        if len(set(hand)) == 5:
+            flush[sum(1 << rank for rank in hand)] = values[_strength(hand, True)]
+
+    return _Tables(flush, ranks)
+
+@lru_cache(maxsize=None)
+def _tables7() -> _Tables:
+    # The best five card value for every flush rank mask and every rank
+    # multiset, so a seven card hand never looks at its 21 subsets.
+    five = _tables5()
+    flush = np.zeros(1 << 13, dtype=np.int16)
+    for size in (5, 6, 7):
+        for hand in combinations(range(13), size):
+            flush[sum(1 << rank for rank in hand)] = min(five.flush[sum(1 << rank for rank in subset)] for subset in combinations(hand, 5))
+
+    keys = np.array(RANK_KEYS, dtype=np.int64)
+    multisets = np.array(_multisets(7), dtype=np.intp)
+    best = np.full(len(multisets), 7463, dtype=np.int16)
+    for subset in combinations(range(7), 5):
+        best = np.minimum(best, five.ranks[keys[multisets[:, list(subset)]].sum(axis=1)])
+
+    ranks = np.zeros(4 * RANK_KEYS[12] + 3 * RANK_KEYS[11] + 1, dtype=np.int16)
+    ranks[keys[multisets].sum(axis=1)] = best
+    return _Tables(flush, ranks)
+
+def _columns(cards: np.ndarray, size: int) -> Tuple[Tuple[int, ...], np.ndarray]:
+    cards = np.asarray(cards, dtype=np.intp)
+    if cards.shape[-1] != size:
+        raise ValueError(f"Expected hands of {size} cards, Value is {cards.shape[-1]}.")
+    return cards.shape[:-1], cards.reshape(-1, size).T
+
+def evaluate5(cards: np.ndarray) -> np.ndarray:
+    tables = _tables5()
+    shape, columns = _columns(cards, 5)
+
+    keys = _KEY[columns[0]]
+    suits = _SUIT[columns[0]]
+    for column in columns[1:]:
+        keys += _KEY[column]
+        suits &= _SUIT[column]
+
+    values = tables.ranks[keys]
+
+    flush = np.flatnonzero(suits)
+    if flush.size:
+        masks = np.bitwise_or.reduce(_BIT[columns[:, flush]], axis=0)
+        values[flush] = tables.flush[masks]
+
+    return values.reshape(shape)
+
+def evaluate7(cards: np.ndarray) -> np.ndarray:
+    tables = _tables7()
+    shape, columns = _columns(cards, 7)
+
+    keys = _KEY[columns[0]]
+    suits = _NIBBLE[columns[0]]
+    for column in columns[1:]:
+        keys += _KEY[column]
+        suits += _NIBBLE[column]
+
+    values = tables.ranks[keys]
+
+    # A suit holding five or more cards shows up as a nibble of at least 5.
+    flush = np.flatnonzero(suits & ((suits << 1) | (suits << 2)) & 0x4444)
+    if flush.size:
+        hands = columns[:, flush]
+        suit = np.zeros(flush.size, dtype=np.intp)
+        for index in range(1, 4):
+            suit[((suits[flush] >> (4 * index)) & 15) >= 5] = index
+        masks = np.where((hands & 3) == suit, _BIT[hands], 0).sum(axis=0)
+        values[flush] = np.minimum(values[flush], tables.flush[masks])
+
+    return values.reshape(shape)
+
+def evaluate(cards: Sequence[Card]) -> int:
+    codes = encode_cards(cards)
+    if len(codes) == 5:
+        return int(evaluate5(codes))
+    if len(codes) == 7:
+        return int(evaluate7(codes))
+    raise ValueError(f"Poker hands are evaluated from 5 or 7 cards, Value is {len(codes)}.")
+
+def equity(hands: Sequence[Sequence[Card]], board: Sequence[Card] = (), trials: int = 100000, seed: Optional[int] = None, batch_size: int = 65536) -> List[Equity]:
+    holes = [encode_cards(hand) for hand in hands]
+    board = encode_cards(board)
+
+    if len(holes) < 2:
+        raise ValueError("Equity needs at least two hands.")
+    if any(len(hole) != 2 for hole in holes):
+        raise ValueError("Each hand must hold exactly two cards.")
+    if len(board) > 5:
+        raise ValueError(f"A board has at most 5 cards, Value is {len(board)}.")
+
+    known = np.concatenate(holes + [board])
+    if len(set(known.tolist())) != len(known):
+        raise ValueError("The same card appears more than once.")
+
+    deck = np.setdiff1d(np.arange(52), known)
+    missing = 5 - len(board)
+    rng = np.random.default_rng(seed)
+
+    wins = np.zeros(len(holes))
+    ties = np.zeros(len(holes))
+    shares = np.zeros(len(holes))
+
+    done = 0
+    while done < trials:
+        size = min(batch_size, trials - done)
+        done += size
+
+        if missing:
+            draws = deck[np.argpartition(rng.random((size, len(deck))), missing - 1, axis=1)[:, :missing]]
+            boards = np.concatenate([np.broadcast_to(board, (size, len(board))), draws], axis=1)
+        else:
+            boards = np.broadcast_to(board, (size, 5))
+
+        values = np.stack([evaluate7(np.concatenate([np.broadcast_to(hole, (size, 2)), boards], axis=1)) for hole in holes])
+        best = values.min(axis=0)
+        winners = values == best
+        split = winners.sum(axis=0)
+
+        wins += (winners & (split == 1)).sum(axis=1)
+        ties += (winners & (split > 1)).sum(axis=1)
+        shares += (winners / split).sum(axis=1)
+
+    return [Equity(win / trials, tie / trials, share / trials) for win, tie, share in zip(wins, ties, shares)]
\ No newline at end of file
@@ -0,0 +1,202 @@
+import math
+import random
+
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, TYPE_CHECKING
+
+from .deck import Card, Deck
+from .utils import Symbol
+
+if TYPE_CHECKING:
+    from .shuffle import Procedure
+
+class Shoe:
+    # Cards are dealt by moving an index along a fixed buffer. Dealt cards
+    # stay where they are, so discarding is free and a reshuffle permutes the
+    # same buffer in place.
+    # A shuffle procedure replaces the perfect shuffle with a model of what a
+    # dealer does, applied to the cards in the order they were dealt.
+    __slots__ = ('_cards', '_position', '_penetration', '_cut_card', '_shuffler')
+
+    def __init__(self, cards: Iterable[Card], penetration: float = 5 / 16, shuffler: Optional['Procedure'] = None):
+        if not 0 < penetration < 1:
+            raise ValueError(f"Penetration must be between 0 and 1, Value is {penetration}.")
+
+        self._cards: List[Card] = list(cards)
+        self._position = 0
+        self._penetration = penetration
+        self._shuffler = shuffler
+
+        # The cut card sits behind the last card that may be dealt before the
+        # shoe is due for a shuffle, matching Rules.cut_card.
+        self._cut_card = len(self._cards) - math.ceil(len(self._cards) * (1 - penetration))
+
+    @staticmethod
+    def standard(num_decks: int = 8, penetration: float = 5 / 16, shuffler: Optional['Procedure'] = None) -> 'Shoe':
+        return Shoe(Deck.create_standard_deck(num_decks), penetration, shuffler)
+
+    @property
+    def size(self) -> int:
+        return len(self._cards)
+
+    @property
+    def dealt(self) -> int:
+        return self._position
+
+    @property
+    def remaining(self) -> int:
+        return len(self._cards) - self._position
+
+    @property
+    def penetration(self) -> float:
+        return self._penetration
+
+    @property
+    def cut_card(self) -> int:
+        return self._cut_card
+
+    @property
+    def shuffler(self) -> Optional['Procedure']:
+        return self._shuffler
+
+    @shuffler.setter
+    def shuffler(self, shuffler: Optional['Procedure']):
+        self._shuffler = shuffler
+
+    @property
+    def needs_shuffle(self) -> bool:
+        return self._position > self._cut_card
+
+    @property
+    def cards(self) -> List[Card]:
+        return self._cards
+
+    def draw(self) -> Card:
+        position = self._position
+        if position >= len(self._cards):
+            raise IndexError("Shoe does not have any more cards to draw.")
+
+        self._position = position + 1
+        return self._cards[position]
+
+    def peek(self) -> Optional[Card]:
+        return self._cards[self._position] if self._position < len(self._cards) else None
+
+    def shuffle(self) -> 'Shoe':
+        if self._shuffler is None:
+            random.shuffle(self._cards)
+        else:
+            self._cards = self._shuffler.shuffle(self._cards)
+        self._position = 0
+        return self
+
+    def __len__(self) -> int:
+        return len(self._cards) - self._position
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self._cards[self._position:])
+
+    def __repr__(self):
+        return f"Shoe(size={len(self._cards)}, dealt={self._position}, cut_card={self._cut_card})"
+
+class ContinuousShuffler:
+    # A continuous shuffling machine. The cards inside are an unordered
+    # buffer with per-rank counts; a draw swaps a random card to the end and
+    # pops it, which is a draw weighted by the counts in O(1). collect puts
+    # the discards back in between rounds, except for the most recent
+    # held_out cards, which wait outside the machine until later rounds push
+    # them in. The machine never runs down, so it never needs a shuffle.
+    __slots__ = ('_machine', '_counts', '_discards', '_held', '_held_out', '_size')
+
+    def __init__(self, cards: Iterable[Card], held_out: int = 0):
+        self._machine: List[Card] = list(cards)
+        self._size = len(self._machine)
+        if not 0 <= held_out < self._size:
+            raise ValueError(f"Held out cards must be between 0 and the size of the machine, Value is {held_out}.")
+
+        self._counts = [0] * (max(symbol.rank for symbol in Symbol) + 1)
+        for card in self._machine:
+            self._counts[card.symbol.rank] += 1
+
+        self._discards: List[Card] = []
+        self._held: Deque[Card] = deque()
+        self._held_out = held_out
+
+    @staticmethod
+    def standard(num_decks: int = 8, held_out: int = 0) -> 'ContinuousShuffler':
+        return ContinuousShuffler(Deck.create_standard_deck(num_decks), held_out)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def dealt(self) -> int:
+        return len(self._discards)
+
+    @property
+    def remaining(self) -> int:
+        return len(self._machine)
+
+    @property
+    def held_out(self) -> int:
+        return self._held_out
+
+    @property
+    def held(self) -> int:
+        return len(self._held)
+
+    @property
+    def counts(self) -> Dict[Symbol, int]:
+        return {symbol: self._counts[symbol.rank] for symbol in Symbol if self._counts[symbol.rank]}
+
+    @property
+    def needs_shuffle(self) -> bool:
+        return False
+
+    def draw(self) -> Card:
+        machine = self._machine
+        if not machine:
+            raise IndexError("Shuffling machine does not have any more cards to draw.")
+
+        index = random.randrange(len(machine))
+        card = machine[index]
+        machine[index] = machine[-1]
+        machine.pop()
+
+        self._counts[card.symbol.rank] -= 1
+        self._discards.append(card)
+        return card
+
+    def _load(self, cards: Iterable[Card]):
+        for card in cards:
+            self._machine.append(card)
+            self._counts[card.symbol.rank] += 1
+
+    # Returns the cards that went back into the machine, so anyone counting
+    # knows which cards are no longer out of play.
+    def collect(self) -> List[Card]:
+        held = self._held
+        held.extend(self._discards)
+        self._discards.clear()
+
+        loaded = [held.popleft() for _ in range(max(len(held) - self._held_out, 0))]
+        self._load(loaded)
+        return loaded
+
+    # A full reload, held out cards included.
+    def shuffle(self) -> 'ContinuousShuffler':
+        self._load(self._held)
+        self._load(self._discards)
+        self._held.clear()
+        self._discards.clear()
+        return self
+
+    def __len__(self) -> int:
+        return len(self._machine)
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self._machine)
+
+    def __repr__(self):
+        return f"ContinuousShuffler(size={self._size}, in machine={len(self._machine)}, held={len(self._held)}, dealt={len(self._discards)})"
\ No newline at end of file
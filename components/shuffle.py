@@ -0,0 +1,191 @@
+import random
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+T = TypeVar('T')
+
+# Every step takes a (shoes, cards) array and returns the same cards in their
+# new order, one row per shoe, so thousands of shoes shuffle in one call.
+# Position 0 is the top of the shoe, the first card dealt.
+
+def _noisy_breaks(rng: np.random.Generator, lengths: np.ndarray, parts: int, spread: float) -> np.ndarray:
+    # Where a dealer splits a stack of each length into parts of roughly
+    # equal size; spread is the standard deviation as a fraction of a part.
+    lengths = np.asarray(lengths)
+    ideal = np.arange(1, parts) * lengths[:, None] / parts
+    noise = rng.normal(0, spread, (len(lengths), parts - 1)) * lengths[:, None] / parts
+    return np.sort(np.clip(np.rint(ideal + noise), 0, lengths[:, None]), axis=1).astype(np.int64)
+
+def _labels(offsets: np.ndarray, breaks: np.ndarray) -> np.ndarray:
+    return (offsets[:, :, None] >= breaks[:, None, :]).sum(axis=2)
+
+def _interleave(decks: np.ndarray, packets: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    # Packets 2k and 2k + 1 are riffled into pile k, and the piles are
+    # stacked in order. Each packet keeps its own order; the interleaving is
+    # uniform, which with a binomial cut is the Gilbert-Shannon-Reeds model.
+    order = np.argsort(packets, axis=1, kind='stable')
+    decks = np.take_along_axis(decks, order, axis=1)
+    packets = np.take_along_axis(packets, order, axis=1)
+
+    # Sorting packet + U within rows leaves every packet in place and hands
+    # it a sorted uniform sample, so merging on those keys is uniform.
+    keys = np.sort(packets + rng.random(packets.shape), axis=1) - packets
+    piles = packets // 2
+    order = np.argsort(piles + keys, axis=1)
+    return np.take_along_axis(decks, order, axis=1), np.take_along_axis(piles, order, axis=1)
+
+def _sizes(piles: np.ndarray, count: int) -> np.ndarray:
+    shoes = len(piles)
+    rows = np.repeat(np.arange(shoes), piles.shape[1])
+    return np.bincount(rows * count + piles.ravel(), minlength=shoes * count).reshape(shoes, count)
+
+class Uniform(NamedTuple):
+    def apply(self, decks: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        return rng.permuted(decks, axis=1)
+
+class Riffle(NamedTuple):
+    times: int = 1
+
+    def apply(self, decks: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        shoes, cards = decks.shape
+        positions = np.arange(cards)
+        for _ in range(self.times):
+            cuts = rng.binomial(cards, 0.5, shoes)
+            decks, _ = _interleave(decks, (positions >= cuts[:, None]).astype(np.int64), rng)
+        return decks
+
+class Strip(NamedTuple):
+    packets: int = 5
+    spread: float = 0.25
+
+    def apply(self, decks: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        # Packets come off the top one at a time, so their order reverses.
+        shoes, cards = decks.shape
+        positions = np.arange(cards)
+        breaks = _noisy_breaks(rng, np.full(shoes, cards), self.packets, self.spread)
+        packets = _labels(np.broadcast_to(positions, decks.shape), breaks)
+        order = np.argsort((self.packets - 1 - packets) * cards + positions, axis=1)
+        return np.take_along_axis(decks, order, axis=1)
+
+class Cut(NamedTuple):
+    spread: float = 0.1
+
+    def apply(self, decks: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        shoes, cards = decks.shape
+        cuts = np.clip(np.rint(rng.normal(cards / 2, self.spread * cards, shoes)), 1, cards - 1).astype(np.int64)
+        order = (np.arange(cards) + cuts[:, None]) % cards
+        return np.take_along_axis(decks, order, axis=1)
+
+class PickRiffle(NamedTuple):
+    grab: int = 52
+    spread: float = 0.25
+    riffles: int = 1
+
+    def apply(self, decks: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        # The multi-pile procedure used on big shoes: split the stack in two,
+        # take matching grabs from each half, riffle every pair of grabs a
+        # few times and stack the piles.
+        shoes, cards = decks.shape
+        positions = np.arange(cards)
+        grabs = max(1, round(cards / 2 / self.grab))
+
+        halves = _noisy_breaks(rng, np.full(shoes, cards), 2, self.spread / grabs)[:, 0]
+        side = positions >= halves[:, None]
+        offsets = positions - np.where(side, halves[:, None], 0)
+
+        left = _noisy_breaks(rng, halves, grabs, self.spread)
+        right = _noisy_breaks(rng, cards - halves, grabs, self.spread)
+        grab = np.where(side, _labels(offsets, right), _labels(offsets, left))
+        decks, piles = _interleave(decks, grab * 2 + side, rng)
+
+        for _ in range(self.riffles - 1):
+            sizes = _sizes(piles, grabs)
+            starts = np.cumsum(sizes, axis=1) - sizes
+            cuts = rng.binomial(sizes, 0.5)
+            offsets = positions - np.take_along_axis(starts, piles, axis=1)
+            decks, piles = _interleave(decks, piles * 2 + (offsets >= np.take_along_axis(cuts, piles, axis=1)), rng)
+        return decks
+
+class Procedure(NamedTuple):
+    # A shuffle procedure is plain data, so a Shoe holding one still pickles
+    # and every shuffle draws its generator from the random module.
+    steps: Tuple[NamedTuple, ...]
+    name: str = "custom"
+
+    def apply(self, decks: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        decks = np.asarray(decks)
+        rows = np.atleast_2d(decks)
+        for step in self.steps:
+            rows = step.apply(rows, rng)
+        return rows.reshape(decks.shape)
+
+    def shuffle(self, cards: Sequence[T]) -> List[T]:
+        rng = np.random.default_rng(random.getrandbits(64))
+        return [cards[index] for index in self.apply(np.arange(len(cards)), rng).tolist()]
+
+    def __str__(self):
+        return f"Procedure({self.name}: {', '.join(type(step).__name__ for step in self.steps)})"
+
+PROCEDURES: Dict[str, Procedure] = {
+    'uniform': Procedure((Uniform(),), "uniform"),
+    'riffle7': Procedure((Riffle(7),), "riffle7"),
+    'riffle3': Procedure((Riffle(3),), "riffle3"),
+    'strip_riffle': Procedure((Riffle(2), Strip(), Riffle(1), Cut()), "strip_riffle"),
+    'casino': Procedure((PickRiffle(52, 0.25, 2), Strip(), PickRiffle(52, 0.25, 1), Cut()), "casino"),
+    'quick': Procedure((PickRiffle(104, 0.25, 1), Cut()), "quick"),
+}
+
+class ShuffleStats(NamedTuple):
+    # Values a uniform shuffle of n cards is expected to give: rising
+    # sequences (n + 1) / 2, adjacency 2 / n, displacement about 1 / 3,
+    # correlation 0 and clumping 1.
+    procedure: str
+    shoes: int
+    cards: int
+    rising: float
+    adjacency: float
+    displacement: float
+    correlation: float
+    clumping: float
+
+    def __str__(self):
+        return f"{self.procedure:>14}: rising {self.rising:7.1f}, adjacency {self.adjacency:.4f}, displacement {self.displacement:.3f}, correlation {self.correlation:+.3f}, clumping {self.clumping:.2f}"
+
+def statistics(procedure: Procedure, num_decks: int = 8, shoes: int = 1000, seed: Optional[int] = None, batch_size: int = 1000) -> ShuffleStats:
+    # Shuffles shoes that start in new-deck order, the way a fresh shoe
+    # leaves the box, and measures how much of that order survives.
+    cards = num_decks * 52
+    rng = np.random.default_rng(seed)
+    positions = np.arange(cards)
+    tens = (positions % 13 >= 9)
+    windows = cards // 52
+    share = tens.mean()
+    expected = 52 * share * (1 - share) * (cards - 52) / (cards - 1)
+
+    rising = adjacency = displacement = correlation = clumping = 0.0
+    for start in range(0, shoes, batch_size):
+        count = min(batch_size, shoes - start)
+        decks = procedure.apply(np.tile(positions, (count, 1)), rng)
+
+        # where[c] is the position card c ended up in.
+        where = np.empty_like(decks)
+        np.put_along_axis(where, decks, np.broadcast_to(positions, decks.shape), axis=1)
+        steps = np.diff(where, axis=1)
+
+        rising += (1 + (steps < 0).sum(axis=1)).sum()
+        adjacency += (np.abs(steps) == 1).mean(axis=1).sum()
+        displacement += (np.abs(where - positions).mean(axis=1) / cards).sum()
+
+        centered = where - where.mean(axis=1, keepdims=True)
+        reference = positions - positions.mean()
+        correlation += ((centered * reference).sum(axis=1) / np.sqrt((centered ** 2).sum(axis=1) * (reference ** 2).sum())).sum()
+
+        clumps = tens[decks[:, :windows * 52]].reshape(count, windows, 52).sum(axis=2)
+        clumping += (clumps.var(axis=1) / expected).sum()
+
+    return ShuffleStats(procedure.name, shoes, cards, rising / shoes, adjacency / shoes, displacement / shoes, correlation / shoes, clumping / shoes)
+
+def compare(procedures: Optional[Dict[str, Procedure]] = None, **kwargs) -> List[ShuffleStats]:
+    return [statistics(procedure, **kwargs) for procedure in (procedures or PROCEDURES).values()]
\ No newline at end of file
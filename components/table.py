@@ -7,6 +7,8 @@ from .pot import Pot
 from .player import Player
 
 class Seat:
+    __slots__ = ('_player', '_bet')
+
     def __init__(self, player: Optional[Player] = None):
         self._player = player
         self._bet = Pot()
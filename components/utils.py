@@ -1,5 +1,5 @@
-from aenum import Enum, NoAlias
-from typing import Union
+from enum import Enum
+from typing import Optional, Union
 
 class Suit(Enum):
     HEARTS = "Hearts"
@@ -8,22 +8,36 @@ class Suit(Enum):
     CLUBS = "Clubs"
 
 class Symbol(Enum):
-    _settings_ = NoAlias
+    # Each symbol has a unique rank so the standard Enum keeps the face cards
+    # apart, while value still gives the blackjack points of the card.
+    ACE = 1, 1
+    TWO = 2, 2
+    THREE = 3, 3
+    FOUR = 4, 4
+    FIVE = 5, 5
+    SIX = 6, 6
+    SEVEN = 7, 7
+    EIGHT = 8, 8
+    NINE = 9, 9
+    TEN = 10, 10
+    JACK = 11, 10
+    QUEEN = 12, 10
+    KING = 13, 10
+    JOKER = 0, None
 
-    ACE = 1
-    TWO = 2
-    THREE = 3
-    FOUR = 4
-    FIVE = 5
-    SIX = 6
-    SEVEN = 7
-    EIGHT = 8
-    NINE = 9
-    TEN = 10
-    JACK = 10
-    QUEEN = 10
-    KING = 10
-    JOKER = None
+    def __new__(cls, rank: int, points: Optional[int]):
+        member = object.__new__(cls)
+        member._value_ = rank
+        member._points = points
+        return member
+
+    @property
+    def rank(self) -> int:
+        return self._value_
+
+    @property
+    def value(self) -> Optional[int]:
+        return self._points
 
 class Color(Enum):
     BLACK = "Black"
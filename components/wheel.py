@@ -3,6 +3,8 @@ from typing import List
 import random
 
 class Spoke:
+    __slots__ = ('label', 'number', 'color')
+
     def __init__(self, label: str):
         self.label = label
         self.number = int(label)
@@ -27,6 +29,8 @@ class Spoke:
         return f"Roulette Number(label={self.label}, color={self.color.value})"
 
 class Wheel:
+    __slots__ = ('wheel',)
+
     def __init__(self):
           self.wheel = tuple([Spoke(label) for label in self._wheelOrder()])
     
@@ -1,7 +1,19 @@
-from .blackjack.blackjack import BlackJack
-from .blackjack.player import AI
+from importlib import import_module
 
-__all__ = [
-    'BlackJack',
-    'AI'
-]
\ No newline at end of file
+_exports = {
+    'BlackJack': '.blackjack.blackjack',
+    'AI': '.blackjack.player',
+}
+
+__all__ = list(_exports)
+
+def __getattr__(name: str):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(_exports[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
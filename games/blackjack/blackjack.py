@@ -1,105 +1,208 @@
 import time
 
-from typing import List, Dict
-from components import Table, Player, Deck, Card, Symbol, Pot, Suit
-
-from .seat import BlackJackSeat
+from typing import List, Dict, Optional, Set, Tuple, Union
+from components import Table, Player, Deck, Card, Symbol, Pot, Suit, Chip, Shoe, ContinuousShuffler
+from components.events import EventBus
+from components.metrics import Registry
+
+from .events import ConsoleRenderer, Kind
+from .metrics import BlackJackMetrics
+from .seat import DEALER, BlackJackSeat
 from .player import AI
-from .utils import ace_total
+from .rules import Rules
+from .utils import Outcome, ace_total, is_soft
 
 class BlackJack(Table):
-    def __init__(self, min_bet: int, max_bet: int | None = None, num_decks: int = 8, limit: int = 6, narrate: bool = False, narrate_speed: int = 1):
+    def __init__(self, min_bet: int, max_bet: int | None = None, num_decks: int = 8, limit: int = 6, narrate: bool = False, narrate_speed: int = 1, rules: Optional[Rules] = None, deck: Optional[Deck] = None, sink: Optional['RoundSink'] = None, metrics: Optional[Registry] = None, events: Optional[EventBus] = None, shoe: Optional[Union[Shoe, ContinuousShuffler]] = None, ledger: Optional['TableLedger'] = None, shuffler: Optional['Procedure'] = None):
         super().__init__(min_bet, max_bet, limit)
-        self._seats: List[BlackJackSeat] = [BlackJackSeat() for _ in range(limit)]
+        self._seats: List[BlackJackSeat] = [BlackJackSeat(position=position) for position in range(limit)]
         self._insurance: Dict[Player, Pot] = {}
-
-        self._deck = Deck.create_standard_deck(num_decks).shuffle()
-        self._discard = Deck()
+        self._rules = rules or Rules()
+
+        if shoe is None:
+            shoe = Shoe(deck if deck is not None else Deck.create_standard_deck(num_decks), self._rules.penetration, shuffler)
+        elif shuffler is not None:
+            if isinstance(shoe, ContinuousShuffler):
+                raise ValueError("A continuous shuffler has no shuffle procedure, pass either a shoe or a shuffler.")
+            shoe.shuffler = shuffler
+        self._shoe = shoe.shuffle()
         self._num_decks = num_decks
-        self._cut_card = num_decks * 52 * (11/16)
 
-        self._dealer = BlackJackSeat(Player(0, "Dealer"))
+        self._dealer = BlackJackSeat(Player(0, "Dealer"), DEALER)
         self._narrate = narrate
         self._narrate_speed = narrate_speed if narrate else 0
-        self._splits = False
+        self._split_seats: Dict[BlackJackSeat, Symbol] = {}
+        self._doubled: Set[BlackJackSeat] = set()
+
+        self._sink = sink
+        self._ledger = ledger
+        self._round = 0
+        self._results: List[Tuple[int, int, int, float, int, int, int]] = []
+
+        self._events = events if events is not None else EventBus()
+        if narrate:
+            self._events.subscribe(ConsoleRenderer(self._narrate_speed))
+
+        self._metrics: Optional[BlackJackMetrics] = None
+        self.attach_metrics(metrics)
+
+    @property
+    def rules(self) -> Rules:
+        return self._rules
+
+    @property
+    def num_decks(self) -> int:
+        return self._num_decks
+
+    @property
+    def shoe(self) -> Union[Shoe, ContinuousShuffler]:
+        return self._shoe
+
+    @property
+    def round(self) -> int:
+        return self._round
+
+    @property
+    def dealer(self) -> BlackJackSeat:
+        return self._dealer
+
+    @property
+    def sink(self) -> Optional['RoundSink']:
+        return self._sink
+
+    @sink.setter
+    def sink(self, sink: Optional['RoundSink']):
+        self._sink = sink
+
+    @property
+    def ledger(self) -> Optional['TableLedger']:
+        return self._ledger
+
+    @ledger.setter
+    def ledger(self, ledger: Optional['TableLedger']):
+        self._ledger = ledger
+
+    @property
+    def events(self) -> EventBus:
+        return self._events
+
+    @property
+    def metrics(self) -> Optional[BlackJackMetrics]:
+        return self._metrics
+
+    def attach_metrics(self, registry: Optional[Registry]):
+        if self._metrics is not None:
+            self._events.unsubscribe(self._metrics)
+
+        self._metrics = self._events.subscribe(BlackJackMetrics(registry)) if registry is not None else None
     
     @property
     def seats_in_play(self) -> List[BlackJackSeat]:
         return [seat for seat in self.seats_with_players if seat.bet]
 
     def draw(self) -> Card:
-        return self._deck.draw()
+        return self._shoe.draw()
     
     def reshuffle(self):
-        self._deck.extend(self._discard)
-        self._discard.clear()
-        self._deck.shuffle()
+        self._shoe.shuffle()
+
+        if self._events:
+            self._emit(Kind.RESHUFFLE)
     
     def play(self):
-        if len(self._deck) < self._cut_card:
+        if self._shoe.needs_shuffle:
             self.reshuffle()
-            self.narrate("Reshuffling deck...")
 
             for player in self.players:
                 if isinstance(player, AI):
-                    self.narrate(f"AI {player} is forgetting current counts...")
+                    if self._events:
+                        self._emit(Kind.FORGET, player=player)
                     player.forget()
-
+        elif isinstance(self._shoe, ContinuousShuffler):
+            loaded = self._shoe.collect()
+            if loaded:
+                for player in self.players:
+                    if isinstance(player, AI):
+                        player.release(loaded)
+
+        self._round += 1
         self._take_bets()
 
         if not self.seats_in_play:
-            self.narrate("\nNo players, game over!")
+            if self._events:
+                self._emit(Kind.GAME_OVER)
+                self._events.flush()
             return False
 
-        self.narrate("\nLocking bets in...\n")
-        time.sleep(self._narrate_speed)
+        if self._ledger is not None:
+            self._ledger.open(self.players, sum(seat.bet.total for seat in self.seats_in_play))
+        if self._events:
+            self._emit(Kind.ROUND_START, hands=len(self.seats_in_play))
 
         self._deal()
-        time.sleep(self._narrate_speed)
 
         for seat in self.seats_in_play:
             self._player_turn(seat)
 
         self._dealer_turn()
-        time.sleep(self._narrate_speed)
 
-        for player in self.players:
+        # A player with split hands sits in several seats but sees the cards once.
+        for player in dict.fromkeys(self.players):
             if isinstance(player, AI):
                 player.remember(self._get_cards_in_play())
 
         self._pay_out()
-        
-        for seat in self.seats_with_players:
-            self.narrate(repr(seat.player))
 
-        self.narrate("\n")
-                
-        time.sleep(self._narrate_speed * 3)
+        if self._ledger is not None:
+            self._ledger.close(self._round)
+        if self._events:
+            for seat in self.seats_with_players:
+                self._emit(Kind.PLAYER, seat, cash=seat.player.cash, bankroll=seat.player.bankroll.total, chips=dict(seat.player.bankroll))
+            self._emit(Kind.ROUND_END)
+
+    def _emit(self, kind: str, seat: Optional[BlackJackSeat] = None, player: Optional[Player] = None, **data):
+        player = player or (seat.player if seat is not None else None)
+        if seat is None:
+            self._events.emit(kind, self._round, None, player.name if player is not None else None, **data)
+        else:
+            self._events.emit(kind, self._round, seat.position, player.name if player is not None else None, seat.hand, **data)
+
+    def join(self, player: Player, index: Optional[int] = None):
+        super().join(player, index)
+        if self._events:
+            self._emit(Kind.JOIN, self.find_player(player), cash=player.cash, bankroll=player.bankroll.total)
+
+    def _prompt(self, player: Player):
+        # People answer on the console, so buffered narration has to be on
+        # screen before they are asked anything.
+        if self._events and not isinstance(player, AI):
+            self._events.flush()
     
     def _take_bets(self) -> None:
         for seat in self.seats_with_players:
             tries = 0
             while True:
                 try:
+                    self._prompt(seat.player)
                     response = seat.player.question(f"Player({seat.player.name}), how much would you like to bet?\n$ ", max_bet = self._max_bet, min_bet = self._min_bet)
                     if not response:
-                        self.narrate(f"Player({seat.player.name}) is not playing this round.\n")
+                        if self._events:
+                            self._emit(Kind.SIT_OUT, seat)
                         break
 
                     if response == "l":
                         player = seat.player
                         seat.leave()
-                        self.narrate(f"\nPlayer({player.name}) has left the table.\n")
+                        if self._events:
+                            self._emit(Kind.LEAVE, seat, player=player)
                         break
 
                     amt = int(response)
 
-                    if isinstance(seat.player, AI):
-                        self.narrate(f"Player({seat.player.name}), how much would you like to bet?\n$ {response}")
-                        time.sleep(self._narrate_speed / 2)
-
                     if self.min_bet <= amt <= (self.max_bet if self.max_bet is not None else amt):
                         seat.make_bet(amt)
+                        if self._events:
+                            self._emit(Kind.BET, seat, amount=amt)
                         break
                     else:
                         raise ValueError(f"Bet must be between {self.min_bet} and {self.max_bet or 'unlimited'}.")
@@ -107,28 +210,30 @@ class BlackJack(Table):
                     if tries > 3:
                         raise Exception(f"Taking Bets Exception: {e}")
                     else:
-                        self.narrate(e)
+                        self.narrate(str(e))
                         tries += 1
 
     def _deal(self) -> None:
         for x in range(2):
             for seat in self.seats_in_play:
-                seat.cards.append(self.draw())
-                self.narrate(repr(seat))
-                time.sleep(self._narrate_speed/2)
+                card = self.draw()
+                seat.cards.append(card)
+                if self._events:
+                    self._emit(Kind.CARD, seat, card=card, hidden=False)
 
-            self._dealer.cards.append(self.draw())
-
-            if x > 0:
-                self.initial_dealer_show()
-            else:
-                self.narrate(f"{repr(self._dealer)}\n")
-
-            time.sleep(self._narrate_speed/2)
+            card = self.draw()
+            self._dealer.cards.append(card)
+            if self._events:
+                self._emit(Kind.CARD, self._dealer, card=card, hidden=x > 0)
 
         #self._dealer.cards.clear()
         #self._dealer.cards.append(Deck([Card(Symbol.ACE, Suit.CLUBS), Card(Symbol.TEN, Suit.CLUBS)]))
 
+        if self._events:
+            for seat in self.seats_in_play:
+                if self._black_jack(seat.cards):
+                    self._emit(Kind.NATURAL, seat)
+
         if self._dealer.cards[0].symbol is Symbol.ACE:
             self._take_insurance()
 
@@ -137,6 +242,7 @@ class BlackJack(Table):
             q_tries = 0
             while True:
                 try:
+                    self._prompt(seat.player)
                     response = seat.player.question(f"Would you like to take insurance? (Y/N)\n", "y", "n")
 
                     if response == "y":
@@ -153,6 +259,10 @@ class BlackJack(Table):
                                 insurance = int(insurance)
                                 if insurance <= seat.bet.total // 2:
                                     self._insurance[seat.player] = seat.player.bet(insurance)
+                                    if self._ledger is not None:
+                                        self._ledger.insure(insurance)
+                                    if self._events:
+                                        self._emit(Kind.INSURANCE, seat, amount=insurance)
                                     break
                                 else:
                                     raise ValueError("Insurance must be less than or equal to half your original bet!")
@@ -168,141 +278,235 @@ class BlackJack(Table):
 
     def _pay_insurance(self):
         for player, insurance in self._insurance.items():
-            player.pay(insurance.multiply(2))
+            payment = insurance.multiply(2)
+            if self._ledger is not None:
+                self._ledger.pay_insurance(payment.total)
+            if self._events:
+                self._emit(Kind.INSURANCE_PAID, player=player, amount=payment.total)
+            player.pay(payment)
 
         self._insurance.clear()
 
     def _player_turn(self, seat: BlackJackSeat):
         initial = True
         tries = 0
+        splits: List[BlackJackSeat] = []
+
+        if self._events:
+            self._emit(Kind.TURN, seat)
 
-        self.narrate(f"\n{repr(seat)}")
         while ace_total(seat.cards) < 21:
             try:
                 index = self.seats_in_play.index(seat)
-                
-                response = self._get_player_action(seat, initial, index)
 
-                if isinstance(seat.player, AI):
-                    self.narrate(f"AI Response: {response}")
-                    time.sleep(self._narrate_speed / 2)
+                if self._events:
+                    self._prompt(seat.player)
+                    start = time.perf_counter()
+                    response = self._get_player_action(seat, initial, index)
+                    self._emit(
+                        Kind.ACTION,
+                        seat,
+                        action=response,
+                        latency=time.perf_counter() - start,
+                        total=ace_total(seat.cards),
+                        soft=is_soft(seat.cards),
+                        cards=len(seat.cards),
+                        upcard=self._dealer.cards[0].symbol.value,
+                        true_count=seat.player.true_count if isinstance(seat.player, AI) else float('nan'),
+                    )
+                else:
+                    response = self._get_player_action(seat, initial, index)
 
-                self._handle_player_action(seat, response, index)
+                split = self._handle_player_action(seat, response, index)
 
                 if response in ['s', 'r', 'd']:
                     break
 
+                # A split leaves a fresh two card hand, which takes its first
+                # decision like any other.
+                if split is not None:
+                    splits.append(split)
+                    continue
+
                 initial = False
             except Exception as e:
                 if tries > 3:
-                    self.narrate(f"\nPlayer Turn Exception: {e} \nCurrent State:\nCards: {len(self._deck)}\nCurrent Seat: {repr(seat)}\nSeat Index:{index}\nSeats State:")
-
-                    for table_seats in self._seats:
-                        self.narrate(repr(table_seats))
+                    if self._events:
+                        seats = "\n".join(repr(table_seat) for table_seat in self._seats)
+                        self.narrate(f"\nPlayer Turn Exception: {e} \nCurrent State:\nCards: {len(self._shoe)}\nCurrent Seat: {repr(seat)}\nSeat Index:{index}\nSeats State:\n{seats}")
                     break
                 else:
                     self.narrate(f"Something went wrong. Please enter your option again.")
                     tries += 1
 
-        if ace_total(seat.cards) > 21:
-            self.narrate(f"\n{repr(seat)}\n{seat.player} busted!")
+        if ace_total(seat.cards) > 21 and self._events:
+            self._emit(Kind.BUST, seat)
+
+        for split in splits:
+            self._hit(split)
+            self._player_turn(split)
 
     def _get_player_action(self, seat: BlackJackSeat, initial: bool, index: int) -> str:
         options = {'h': "(H)it", 's': "(S)tand"}
 
-        if self._can_split(seat.cards):
+        if self._can_split(seat):
                 options["t"] = "Spli(t)"
 
         if initial:
-            options.update({'d': "(D)ouble Down", 'r': "Surrende(r)"})            
+            if seat not in self._split_seats or self._rules.double_after_split:
+                options['d'] = "(D)ouble Down"
+            if self._rules.surrender and seat not in self._split_seats:
+                options['r'] = "Surrende(r)"
         
         options_string = ", ".join(list(options.values())[:-1])
         question = f"{seat.player}, take action. {options_string}, or {list(options.values())[-1]}?\n"
 
         return seat.player.question(question, *list(options.keys()), cards=self._get_cards_in_play(True), index=index, num_decks=self._num_decks)
     
-    def _handle_player_action(self, seat: BlackJackSeat, response: str, index: int):
+    def _hit(self, seat: BlackJackSeat):
+        card = self.draw()
+        seat.cards.append(card)
+        if self._events:
+            self._emit(Kind.CARD, seat, card=card, hidden=False)
+
+    def _handle_player_action(self, seat: BlackJackSeat, response: str, index: int) -> Optional[BlackJackSeat]:
         match response:
             case "h":
-                seat.cards.append(self.draw())
-                self.narrate(f"\n{repr(seat)}")
+                self._hit(seat)
             case "r":
-                seat.pay(seat.bet.divide(2))
+                bet = seat.bet.total
+                refund = Chip.to_chip_int(bet // 2)
+                seat.pay(refund)
+
+                if self._ledger is not None:
+                    self._ledger.settle(bet, refund)
+
+                if self._sink is not None:
+                    self._record(seat.position, seat.player, bet, self._dealer.cards[0].symbol.value, Outcome.SURRENDER, refund - bet)
+                if self._events:
+                    self._emit(Kind.RESULT, seat, outcome=Outcome.SURRENDER, bet=bet, net=refund - bet)
             case "d":
                 seat.bet.append(seat.player.bet(seat.bet.total))
-                seat.cards.append(self.draw())
-                
-                self.narrate(f"\n{repr(seat)}")
+                self._doubled.add(seat)
+                self._hit(seat)
             case "t":
-                self._handle_split(seat, index)
-                
-                self.narrate(f"\n{repr(seat)}")
+                return self._handle_split(seat, index)
             case _:
                 if response != "s":
                     raise ValueError(f"Invalid action '{response}'. Please select one of the options mentioned previously.")
+        return None
                 
-    def _handle_split(self, seat: BlackJackSeat, index: int):
-        new_seat = BlackJackSeat(seat.player)
+    # Each half of a pair is dealt its second card before it is played: this
+    # hand now, the new one once this hand is finished.
+    def _handle_split(self, seat: BlackJackSeat, index: int) -> BlackJackSeat:
+        hands = sum(1 for other in self._seats if other.player is seat.player)
+        new_seat = BlackJackSeat(seat.player, seat.position, hands)
+        self._split_seats[seat] = self._split_seats[new_seat] = seat.cards[0].symbol
+
         new_seat.cards.append(seat.cards.pop())
         new_seat.make_bet(seat.bet.total)
 
-        self._seats.insert(index + 1, new_seat)
-        self._player_turn(new_seat)
-        self._splits = True
+        self._seats.insert(self._seats.index(seat) + 1, new_seat)
+        if self._events:
+            self._emit(Kind.SPLIT, seat, split=new_seat.hand)
 
-    def _dealer_turn(self):
-        self.narrate(f"\n{repr(self._dealer)}")
+        self._hit(seat)
+        return new_seat
 
-        while ace_total(self._dealer.cards) < 17:
-            time.sleep(self._narrate_speed)
-            self._dealer.cards.append(self.draw())
-            self.narrate(repr(self._dealer))
-
-        time.sleep(self._narrate_speed / 2)
+    def _dealer_turn(self):
+        if self._events:
+            self._emit(Kind.REVEAL, self._dealer, card=self._dealer.cards[-1])
+
+        while self._dealer_hits():
+            card = self.draw()
+            self._dealer.cards.append(card)
+            if self._events:
+                self._emit(Kind.CARD, self._dealer, card=card, hidden=False)
         
-        if ace_total(self._dealer.cards) > 21:
-            self.narrate("Dealer busted!")
+        if ace_total(self._dealer.cards) > 21 and self._events:
+            self._emit(Kind.DEALER_BUST, self._dealer)
 
-    def _pay_out(self):
+    def _dealer_hits(self) -> bool:
         total = ace_total(self._dealer.cards)
-        self.narrate("\n")
+        if total < 17:
+            return True
+        return self._rules.hit_soft_17 and total == 17 and is_soft(self._dealer.cards)
 
-        for seat in self.seats_with_players:
-            if seat in self.seats_in_play:
-                player_total = ace_total(seat.cards)
+    def _pay_out(self):
+        dealer_cards = self._dealer.cards
+        dealer_total = ace_total(dealer_cards)
+        dealer_natural = len(dealer_cards) == 2 and dealer_total == 21
+        upcard = dealer_cards[0].symbol.value
+        bonus_rate = self._rules.blackjack_bonus
+
+        # Settle every hand as plain integers and credit each player once, so
+        # split hands and pushes build a single Pot per player.
+        credits: Dict[Player, int] = {}
+
+        for seat in self._seats:
+            player = seat.player
+            if player is None:
+                continue
+
+            cards = seat.cards
+            if seat.bet:
+                bet = seat.bet.total
+                player_total = ace_total(cards)
+                natural = len(cards) == 2 and player_total == 21 and seat not in self._split_seats
                 amount = 0
 
-                if player_total > 21 or (total <= 21 and player_total < total):
-                    self.narrate(f"{seat.player}: Lost")
+                if player_total > 21:
+                    outcome = Outcome.BUST
+                elif dealer_total <= 21 and player_total < dealer_total:
+                    outcome = Outcome.LOSS
+                elif dealer_total > 21 or player_total > dealer_total:
+                    amount = bet * 2
+                    outcome = Outcome.WIN
+
+                    if natural:
+                        amount += Chip.to_chip_int(bonus_rate(bet))
+                        outcome = Outcome.BLACKJACK
+                else:
+                    amount = bet
+                    outcome = Outcome.PUSH
 
-                elif total > 21 or player_total > total:
-                    self.narrate(f"{seat.player}: Won")
-                    amount = seat.bet.multiply(2)
+                    if natural and not dealer_natural:
+                        amount += Chip.to_chip_int(bonus_rate(bet))
 
-                    if self._black_jack(seat.cards):
-                        amount.append(seat.bet.divide(2))
+                if self._ledger is not None:
+                    self._ledger.settle(bet, amount)
+                if self._sink is not None:
+                    self._record(seat.position, player, bet // 2 if seat in self._doubled else bet, upcard, outcome, amount - bet)
+                if self._events:
+                    self._emit(Kind.RESULT, seat, outcome=outcome, bet=bet, net=amount - bet)
 
-                elif player_total == total:
-                    self.narrate(f"{seat.player}: Push")
-                    amount = seat.bet
+                if amount:
+                    credits[player] = credits.get(player, 0) + amount
+                seat.bet.clear()
 
-                    if self._black_jack(seat.cards) and not self._black_jack(self._dealer.cards):
-                        amount.append(seat.bet.divide(2))
+            cards.clear()
 
-                seat.pay(amount)
-            
-            self._discard.extend(seat.cards)
-            seat.cards.clear()
+        for player, amount in credits.items():
+            player.pay(amount)
+        self._doubled.clear()
 
-        if self._splits:
+        if self._split_seats:
             self._remove_splits()
 
-        if self._black_jack(self._dealer.cards) and self._dealer.cards[0].symbol is Symbol.ACE:
+        if dealer_natural and dealer_cards[0].symbol is Symbol.ACE:
             self._pay_insurance()
 
-        self._discard.extend(self._dealer.cards)
-        self._dealer.cards.clear()
-        self.narrate("\n")
+        if self._results:
+            self._sink.extend(self._results)
+            self._results.clear()
+
+        dealer_cards.clear()
+
+    # Rows carry the wager the hand opened with, before any double, so a
+    # round's hands can be summed against the player's original bet.
+    def _record(self, index: int, player: Player, bet: int, upcard: int, outcome: Outcome, net: int):
+        true_count = player.true_count if isinstance(player, AI) else float('nan')
+        self._results.append((self._round, index, bet, true_count, upcard, int(outcome), net))
 
     def _black_jack(self, cards: Deck) -> bool:
         if len(cards) == 2 and ace_total(cards) == 21:
@@ -311,11 +515,16 @@ class BlackJack(Table):
 
     def _remove_splits(self):
         players = set()
-        for index, seat in enumerate(self._seats):
-            if seat.player in players:
-                del self._seats[index]
-            else:
-                players.add(seat.player)
+        seats = []
+        for seat in self._seats:
+            if seat.player is not None and seat.player in players:
+                continue
+
+            players.add(seat.player)
+            seats.append(seat)
+
+        self._seats = seats
+        self._split_seats.clear()
 
     def _get_cards_in_play(self, initial = False) -> List[Deck]:
         table_state = []
@@ -329,16 +538,42 @@ class BlackJack(Table):
 
         return table_state
     
-    @staticmethod
-    def _can_split(cards: Deck) -> bool:
-        if len(cards) == 2 and cards[0].symbol == cards[1].symbol:
-            return True
-        return False
+    def _can_split(self, seat: BlackJackSeat) -> bool:
+        cards = seat.cards
+        if len(cards) != 2:
+            return False
+
+        if self._rules.split_by_value:
+            pair = cards[0].symbol.value == cards[1].symbol.value
+        else:
+            pair = cards[0].symbol == cards[1].symbol
+
+        if not pair:
+            return False
+
+        if not self._rules.resplit_aces and self._split_seats.get(seat) is Symbol.ACE:
+            return False
+
+        if self._rules.max_splits is not None:
+            splits = sum(1 for other in self._seats if other.player is seat.player) - 1
+            if splits >= self._rules.max_splits:
+                return False
+
+        return True
     
-    def narrate(self, statement: str):
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_sink'] = None
+        state['_metrics'] = None
+        state['_events'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._events = EventBus()
         if self._narrate:
-            print(statement)
+            self._events.subscribe(ConsoleRenderer(self._narrate_speed))
 
-    def initial_dealer_show(self) -> None:
-        if self._narrate:
-            print(f"Seat(Player: Dealer, Cards: {self._dealer.cards[0].name}, ?)")
\ No newline at end of file
+    def narrate(self, statement: str):
+        if self._events:
+            self._emit(Kind.MESSAGE, text=statement)
\ No newline at end of file
@@ -0,0 +1,36 @@
+import hashlib
+import json
+import os
+
+from typing import Any, Optional
+
+CACHE_DIR = os.environ.get("CASINO_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "casinoroyal"))
+
+def cache_key(*parts: Any) -> str:
+    encoded = json.dumps(parts, sort_keys=True, default=repr, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode()).hexdigest()[:24]
+
+def cache_path(kind: str, key: str, cache_dir: Optional[str] = None) -> str:
+    return os.path.join(cache_dir or CACHE_DIR, kind, f"{key}.json")
+
+def load(kind: str, key: str, cache_dir: Optional[str] = None) -> Optional[Any]:
+    path = cache_path(kind, key, cache_dir)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def save(kind: str, key: str, value: Any, cache_dir: Optional[str] = None):
+    path = cache_path(kind, key, cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Write beside the target and rename so a crashed or concurrent writer
+    # never leaves a half-written entry behind.
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, 'w') as file:
+        json.dump(value, file)
+    os.replace(temp, path)
\ No newline at end of file
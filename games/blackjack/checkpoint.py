@@ -0,0 +1,125 @@
+import os
+import pickle
+import random
+import threading
+import zlib
+
+from typing import Any, List, NamedTuple, Optional
+
+from components import Player
+
+from .blackjack import BlackJack
+
+class Checkpoint(NamedTuple):
+    round: int
+    table: BlackJack
+    extra: Any
+
+class Checkpointer:
+    _prefix = "checkpoint-"
+    _suffix = ".pkl.z"
+
+    def __init__(self, directory: str, every: int = 1000, keep: int = 2, level: int = 6):
+        if every < 1 or keep < 1:
+            raise ValueError("Checkpoints need a positive interval and must keep at least one file.")
+
+        self._directory = directory
+        self._every = every
+        self._keep = keep
+        self._level = level
+        self._writer: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def every(self) -> int:
+        return self._every
+
+    def maybe_save(self, table: BlackJack, round: int, extra: Any = None) -> bool:
+        if round % self._every:
+            return False
+        self.save(table, round, extra)
+        return True
+
+    def save(self, table: BlackJack, round: int, extra: Any = None):
+        if table.sink is not None:
+            table.sink.flush()
+
+        state = {
+            'round': round,
+            'table': table,
+            'extra': extra,
+            'random': random.getstate(),
+            'player_count': Player._Player__player_count,
+            'sink_length': table.sink.length if table.sink is not None else None,
+        }
+
+        # Pickling happens here so the snapshot is consistent with this
+        # round; compressing and writing it is left to a background thread.
+        payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self.wait()
+        self._writer = threading.Thread(target=self._write, args=(round, payload), daemon=True)
+        self._writer.start()
+
+    def wait(self):
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _write(self, round: int, payload: bytes):
+        try:
+            path = os.path.join(self._directory, f"{self._prefix}{round:012d}{self._suffix}")
+            temp = f"{path}.tmp"
+
+            with open(temp, 'wb') as file:
+                file.write(zlib.compress(payload, self._level))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp, path)
+
+            for stale in self.checkpoints()[:-self._keep]:
+                os.remove(stale)
+        except BaseException as e:
+            self._error = e
+
+    def checkpoints(self) -> List[str]:
+        names = sorted(name for name in os.listdir(self._directory) if name.startswith(self._prefix) and name.endswith(self._suffix))
+        return [os.path.join(self._directory, name) for name in names]
+
+    def latest(self) -> Optional[str]:
+        checkpoints = self.checkpoints()
+        return checkpoints[-1] if checkpoints else None
+
+    def resume(self, sink=None) -> Optional[Checkpoint]:
+        self.wait()
+        path = self.latest()
+        return self.load(path, sink) if path is not None else None
+
+    @staticmethod
+    def load(path: str, sink=None) -> Checkpoint:
+        with open(path, 'rb') as file:
+            state = pickle.loads(zlib.decompress(file.read()))
+
+        random.setstate(state['random'])
+        Player._Player__player_count = state['player_count']
+
+        table: BlackJack = state['table']
+        if sink is not None:
+            if state['sink_length'] is not None:
+                sink.rewind(state['sink_length'])
+            table.sink = sink
+
+        return Checkpoint(state['round'], table, state['extra'])
+
+    def __repr__(self):
+        return f"Checkpointer(directory={self._directory}, every={self._every}, keep={self._keep})"
\ No newline at end of file
@@ -0,0 +1,355 @@
+import math
+
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import cache
+from .player import AI
+from .population import DOUBLE, HIT, STAND, SURRENDER, ACTIONS, strategy_table
+from .rules import Rules
+from .sweep import parallel_map
+
+# Card values run 1 (ace) to 10, so a composition is a row of 11 counts with
+# column 0 unused. Dealer upcards use the AI's convention of 11 for an ace.
+TAGS = np.array([0] + [1 if any(symbol.value == value for symbol in AI.low_cards) else -1 if any(symbol.value == value for symbol in AI.high_cards) else 0 for value in range(1, 11)], dtype=np.int64)
+LOWS, HIGHS, NEUTRALS = (np.flatnonzero(TAGS[1:] == tag) + 1 for tag in (1, -1, 0))
+STREAM = 20
+
+# Bumped whenever the way indices are measured changes, so stale caches miss.
+DEVIATIONS_VERSION = 2
+
+class Candidate(NamedTuple):
+    total: int
+    dealer: int
+    action: str
+    # Whether surrender is on offer, which changes the basic play to beat.
+    surrender: bool = False
+
+    @property
+    def label(self) -> str:
+        return f"{self.total}v{'A' if self.dealer == 11 else self.dealer}{'/LS' if self.surrender else ''}"
+
+# The Illustrious 18 and Fab 4 plays that are hard totals. Insurance and
+# splitting tens are left out: the AI never takes insurance and only splits
+# from its pair table.
+ILLUSTRIOUS = (
+    Candidate(16, 10, 's'),
+    Candidate(15, 10, 's'),
+    Candidate(10, 10, 'd'),
+    Candidate(12, 3, 's'),
+    Candidate(12, 2, 's'),
+    Candidate(11, 11, 'd'),
+    Candidate(9, 2, 'd'),
+    Candidate(10, 11, 'd'),
+    Candidate(9, 7, 'd'),
+    Candidate(16, 9, 's'),
+    Candidate(13, 2, 'h'),
+    Candidate(12, 4, 'h'),
+    Candidate(12, 5, 'h'),
+    Candidate(12, 6, 'h'),
+    Candidate(13, 3, 'h'),
+    Candidate(14, 10, 'r'),
+    Candidate(15, 9, 'r'),
+    Candidate(15, 11, 'r'),
+)
+
+class Deviation(NamedTuple):
+    total: int
+    dealer: int
+    surrender: bool
+    basic: str
+    action: str
+    index: float
+    # 1 to deviate at or above the index, -1 to deviate below it.
+    direction: int
+    samples: int
+
+    def applies(self, true_count: float) -> bool:
+        return true_count >= self.index if self.direction > 0 else true_count < self.index
+
+    def __str__(self):
+        when = "always" if math.isinf(self.index) else f"at true count {'>=' if self.direction > 0 else '<'} {self.index:+.1f}"
+        return f"{Candidate(self.total, self.dealer, self.action, self.surrender).label}: {self.action} instead of {self.basic} {when}"
+
+class DeviationTable:
+    __slots__ = ('_deviations',)
+
+    def __init__(self, deviations: Sequence[Deviation]):
+        self._deviations: Dict[Tuple[int, int, bool], Deviation] = {(deviation.total, deviation.dealer, deviation.surrender): deviation for deviation in deviations}
+
+    @property
+    def deviations(self) -> List[Deviation]:
+        return list(self._deviations.values())
+
+    # A hard total without an ace and the dealer's upcard, as AI sees them.
+    def action(self, options: Sequence[str], total: int, dealer: int, true_count: float) -> Optional[str]:
+        deviation = self._deviations.get((total, dealer, 'r' in options))
+        if deviation is None or deviation.action not in options or not deviation.applies(true_count):
+            return None
+        return deviation.action
+
+    def to_dict(self) -> dict:
+        return {'deviations': [list(deviation) for deviation in self._deviations.values()]}
+
+    @staticmethod
+    def from_dict(data: dict) -> 'DeviationTable':
+        return DeviationTable([Deviation(*values) for values in data['deviations']])
+
+    def __len__(self) -> int:
+        return len(self._deviations)
+
+    def __repr__(self):
+        return f"DeviationTable([{', '.join(f'{Candidate(deviation.total, deviation.dealer, deviation.action, deviation.surrender).label} {deviation.index:+.1f}' for deviation in self._deviations.values())}])"
+
+def _full(num_decks: int) -> np.ndarray:
+    return np.array([0] + [4 * num_decks] * 9 + [16 * num_decks], dtype=np.int64)
+
+def _hands(total: int) -> List[Tuple[int, int]]:
+    # Two card hard totals without aces or pairs; pairs go to the split table.
+    return [(first, total - first) for first in range(2, 11) if first < total - first <= 10]
+
+def _compositions(rng: np.random.Generator, num_decks: int, cut_card: int, cards: Tuple[int, ...], bucket: int, size: int) -> np.ndarray:
+    # Shoes that have dealt a random number of other cards and whose true
+    # count, as AI.calculate_true_count works it out with the cards in view,
+    # falls in [bucket, bucket + 1).
+    full = _full(num_decks)
+    for card in cards:
+        full[card] -= 1
+
+    seen = len(cards)
+    depth = rng.integers(0, num_decks * 52 - cut_card - seen + 1, size)
+    decks = np.maximum(num_decks - (depth + seen) // 52, 1)
+    running = bucket * decks + rng.integers(0, decks) - TAGS[list(cards)].sum()
+
+    neutral = rng.binomial(depth, full[NEUTRALS].sum() / full.sum())
+    neutral += (depth - neutral + running) % 2
+    low = (depth - neutral + running) // 2
+    high = depth - neutral - low
+
+    amounts = (low, high, neutral)
+    valid = (low >= 0) & (high >= 0) & (neutral <= depth)
+    for group, amount in zip((LOWS, HIGHS, NEUTRALS), amounts):
+        valid &= amount <= full[group].sum()
+
+    removed = np.zeros((int(valid.sum()), len(full)), dtype=np.int64)
+    for group, amount in zip((LOWS, HIGHS, NEUTRALS), amounts):
+        amount = amount[valid]
+        left = full[group].sum()
+        for value in group[:-1]:
+            left -= full[value]
+            take = rng.hypergeometric(full[value], left, amount) if left else amount
+            removed[:, value] = take
+            amount = amount - take
+        removed[:, group[-1]] = amount
+    return full - removed
+
+def _streams(rng: np.random.Generator, compositions: np.ndarray) -> np.ndarray:
+    compositions = compositions.copy()
+    rows = np.arange(len(compositions))
+    streams = np.empty((len(compositions), STREAM), dtype=np.int64)
+    for index in range(STREAM):
+        cumulative = np.cumsum(compositions, axis=1)
+        draws = rng.random(len(compositions)) * cumulative[:, -1]
+        picks = (cumulative <= draws[:, None]).sum(axis=1)
+        streams[:, index] = picks
+        compositions[rows, picks] -= 1
+    return streams
+
+def _totals(hard: np.ndarray, aces: np.ndarray) -> np.ndarray:
+    return np.where(aces & (hard + 10 <= 21), hard + 10, hard)
+
+def _settle(rules: Rules, strategy: np.ndarray, hard: int, dealer: int, streams: np.ndarray, action: int) -> np.ndarray:
+    # Plays one decision out the way the table does: no hole card peek,
+    # later decisions from basic strategy and the dealer drawing to 17.
+    size = len(streams)
+    if action == SURRENDER:
+        return np.full(size, -0.5)
+
+    rows = np.arange(size)
+    position = np.zeros(size, dtype=np.int64)
+
+    def draw(mask: np.ndarray) -> np.ndarray:
+        cards = streams[rows[mask], np.minimum(position[mask], STREAM - 1)]
+        position[mask] += 1
+        return cards
+
+    everyone = np.ones(size, dtype=bool)
+    player = np.full(size, hard, dtype=np.int64)
+    aces = np.zeros(size, dtype=bool)
+    bet = 2 if action == DOUBLE else 1
+
+    if action != STAND:
+        card = draw(everyone)
+        player += card
+        aces |= card == 1
+
+        while action == HIT:
+            total = _totals(player, aces)
+            active = (total < 21) & (strategy[0, 1, np.minimum(player, 21), aces.astype(np.int64), dealer] == HIT)
+            if not active.any():
+                break
+            card = draw(active)
+            player[active] += card
+            aces[active] |= card == 1
+
+    upcard = 1 if dealer == 11 else dealer
+    house = upcard + draw(everyone)
+    house_aces = (upcard == 1) | (streams[rows, position - 1] == 1)
+    while True:
+        total = _totals(house, house_aces)
+        active = (total < 17) | (rules.hit_soft_17 & (total == 17) & house_aces & (house + 10 == 17))
+        if not active.any():
+            break
+        card = draw(active)
+        house[active] += card
+        house_aces[active] |= card == 1
+
+    player_total, house_total = _totals(player, aces), _totals(house, house_aces)
+    outcome = np.where(player_total > 21, -1, np.where(house_total > 21, 1, np.sign(player_total - house_total)))
+    return (outcome * bet).astype(np.float64)
+
+def basic_action(candidate: Candidate) -> str:
+    options = ['h', 's', 'd'] + (['r'] if candidate.surrender else [])
+    return AI.basic_strategy(options, candidate.total, False, candidate.dealer)
+
+def _surrender_matters(candidate: Candidate) -> bool:
+    return candidate.action == 'r' or basic_action(candidate._replace(surrender=True)) == 'r'
+
+def candidates_for(rules: Rules, candidates: Sequence[Candidate] = ILLUSTRIOUS) -> List[Candidate]:
+    # Under surrender rules a hand whose comparison involves surrender is
+    # judged both on its first decision and later on, when surrender is gone.
+    # Every other play is measured once and holds with or without it. Plays
+    # basic already makes are dropped.
+    found = []
+    for candidate in candidates:
+        for surrender in ((True, False) if rules.surrender and _surrender_matters(candidate) else (False,)):
+            candidate = candidate._replace(surrender=surrender)
+            if (candidate.action != 'r' or surrender) and candidate.action != basic_action(candidate) and candidate not in found:
+                found.append(candidate)
+    return found
+
+def _measure(rules: Rules, num_decks: int, candidate: Candidate, buckets: Sequence[int], samples: Sequence[int], seed: Tuple[int, ...]) -> Dict[int, Tuple[int, float, float]]:
+    # The gain of the deviation over basic strategy, in units of the
+    # original bet, with both plays drawing from the same cards.
+    rng = np.random.default_rng(seed)
+    strategy = strategy_table(rules)
+    cut_card = rules.cut_card(num_decks)
+    basic = ACTIONS[basic_action(candidate)]
+    deviation = ACTIONS[candidate.action]
+
+    full = _full(num_decks)
+    hands = _hands(candidate.total)
+    weights = np.array([full[first] * full[second] for first, second in hands], dtype=np.float64)
+    upcard = 1 if candidate.dealer == 11 else candidate.dealer
+
+    sums: Dict[int, Tuple[int, float, float]] = {}
+    for bucket, size in zip(buckets, samples):
+        count, total, squares = 0, 0.0, 0.0
+        for hand, share in zip(hands, rng.multinomial(size, weights / weights.sum())):
+            if not share:
+                continue
+            compositions = _compositions(rng, num_decks, cut_card, hand + (upcard,), bucket, share)
+            streams = _streams(rng, compositions)
+            gain = _settle(rules, strategy, candidate.total, candidate.dealer, streams, deviation) - _settle(rules, strategy, candidate.total, candidate.dealer, streams, basic)
+            count += len(gain)
+            total += float(gain.sum())
+            squares += float((gain * gain).sum())
+        sums[bucket] = (count, total, squares)
+    return sums
+
+def _summary(sums: Dict[int, List[float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    buckets = np.array(sorted(sums))
+    count = np.array([sums[bucket][0] for bucket in buckets], dtype=np.float64)
+    mean = np.array([sums[bucket][1] for bucket in buckets]) / np.maximum(count, 1)
+    variance = np.array([sums[bucket][2] for bucket in buckets]) / np.maximum(count, 1) - mean ** 2
+    return buckets, mean, np.sqrt(np.maximum(variance, 1e-12) / np.maximum(count, 1))
+
+def _crossings(mean: np.ndarray) -> np.ndarray:
+    return np.flatnonzero(np.sign(mean[:-1]) != np.sign(mean[1:]))
+
+def _refine(sums: Dict[int, List[float]], z: float, budget: int) -> Dict[int, int]:
+    # Only buckets next to a sign change whose gain is still within z
+    # standard errors of zero get more samples, each round doubling them.
+    buckets, mean, error = _summary(sums)
+    spent = sum(values[0] for values in sums.values())
+    crossings = _crossings(mean)
+    if spent >= budget or not len(crossings):
+        return {}
+
+    near = set()
+    for crossing in crossings:
+        near.update(range(max(0, crossing - 1), min(len(buckets), crossing + 3)))
+    return {int(buckets[index]): int(sums[int(buckets[index])][0]) for index in sorted(near) if abs(mean[index]) < z * error[index]}
+
+def _index(sums: Dict[int, List[float]], window: int = 2) -> Optional[Tuple[float, int]]:
+    buckets, mean, error = _summary(sums)
+    crossings = _crossings(mean)
+    if not len(crossings):
+        # Beating basic at every count means basic is wrong for this table;
+        # the play then always applies. Never beating it means no index.
+        return (-math.inf, 1) if (mean > 0).all() else None
+
+    # With noise there can be several sign changes; the steepest, best
+    # measured one is the real break-even point. A weighted line through
+    # the buckets around it gives the index, at bucket centres.
+    strength = [abs(mean[crossing + 1] - mean[crossing]) / math.hypot(error[crossing], error[crossing + 1]) for crossing in crossings]
+    crossing = crossings[int(np.argmax(strength))]
+    span = slice(max(0, crossing - window + 1), min(len(buckets), crossing + window + 1))
+    x, y, weight = buckets[span] + 0.5, mean[span], 1 / error[span] ** 2
+
+    x_mean = (weight * x).sum() / weight.sum()
+    y_mean = (weight * y).sum() / weight.sum()
+    slope = (weight * (x - x_mean) * (y - y_mean)).sum() / (weight * (x - x_mean) ** 2).sum()
+    if slope == 0:
+        return None
+    return float(x_mean - y_mean / slope), 1 if slope > 0 else -1
+
+def generate_deviations(rules: Optional[Rules] = None, num_decks: int = 8, candidates: Sequence[Candidate] = ILLUSTRIOUS, count_range: int = 8, initial: int = 4000, budget: int = 1600000, z: float = 3.0, seed: int = 0, processes: Optional[int] = None) -> DeviationTable:
+    rules = rules or Rules()
+    candidates = candidates_for(rules, candidates)
+    buckets = list(range(-count_range, count_range))
+
+    sums: Dict[Candidate, Dict[int, List[float]]] = {candidate: {bucket: [0, 0.0, 0.0] for bucket in buckets} for candidate in candidates}
+    plans = {candidate: {bucket: initial for bucket in buckets} for candidate in candidates}
+
+    # Every round measures the planned buckets of all candidates in parallel,
+    # then each candidate plans its next round from what it has so far.
+    step = 0
+    while plans:
+        tasks = [(rules, num_decks, candidate, list(plan), list(plan.values()), (seed, index, step)) for index, (candidate, plan) in enumerate(plans.items())]
+        for (candidate, _), result in zip(plans.items(), parallel_map(_measure, tasks, processes)):
+            for bucket, values in result.items():
+                totals = sums[candidate][bucket]
+                for position, value in enumerate(values):
+                    totals[position] += value
+
+        plans = {candidate: plan for candidate in candidates if (plan := _refine(sums[candidate], z, budget))}
+        step += 1
+
+    deviations = []
+    for candidate in candidates:
+        found = _index(sums[candidate])
+        if found is None:
+            continue
+        index, direction = found
+        samples = sum(values[0] for values in sums[candidate].values())
+        deviation = Deviation(candidate.total, candidate.dealer, candidate.surrender, basic_action(candidate), candidate.action, index if math.isinf(index) else round(index, 2), direction, samples)
+        deviations.append(deviation)
+        if rules.surrender and not _surrender_matters(candidate):
+            deviations.append(deviation._replace(surrender=True))
+    return DeviationTable(deviations)
+
+@lru_cache(maxsize=None)
+def deviation_table(rules: Optional[Rules] = None, num_decks: int = 8, count_range: int = 8, budget: int = 1600000, seed: int = 0, processes: Optional[int] = None, cache_dir: Optional[str] = None) -> DeviationTable:
+    rules = rules or Rules()
+    key = cache.cache_key(DEVIATIONS_VERSION, rules, num_decks, count_range, budget, seed)
+
+    cached = cache.load("deviations", key, cache_dir)
+    if cached is not None:
+        return DeviationTable.from_dict(cached)
+
+    table = generate_deviations(rules, num_decks, count_range=count_range, budget=budget, seed=seed, processes=processes)
+    cache.save("deviations", key, table.to_dict(), cache_dir)
+    return table
\ No newline at end of file
@@ -0,0 +1,337 @@
+import math
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from components import Card, Shoe, Suit
+from components.events import Event, EventBus, Subscriber
+
+from .blackjack import BlackJack
+from .events import Kind
+from .player import AI
+from .population import ACTIONS, SYMBOLS, Population
+from .rules import Rules
+from .sweep import parallel_map
+
+# One card per symbol index. Suits never matter to either engine, so every
+# scripted shoe deals the same Card objects.
+CARDS = [Card(symbol, Suit.SPADES) for symbol in SYMBOLS]
+
+FIELDS = ('seated', 'bet', 'action', 'cards', 'net', 'cash', 'bankroll', 'running_count', 'true_count')
+
+# A player who has left keeps whatever count they had, so only their money
+# is compared after that.
+LEFT_FIELDS = ('seated', 'cash', 'bankroll')
+
+class Divergence(NamedTuple):
+    seed: int
+    table: int
+    round: int
+    seat: int
+    field: str
+    reference: float
+    candidate: float
+
+    def __str__(self):
+        return f"Divergence(seed={self.seed}, table={self.table}, round={self.round}, seat={self.seat}, {self.field}: reference={self.reference} candidate={self.candidate})"
+
+class Repro(NamedTuple):
+    # The shoes a table dealt, in order, and the number of rounds to play.
+    # A fresh repro starts the players on the first shoe with no history and
+    # never reshuffles; otherwise the shoes are dealt with the usual cut card.
+    shoes: List[np.ndarray]
+    seats: int
+    rounds: int
+    fresh: bool
+    divergence: Divergence
+
+    @property
+    def cards(self) -> int:
+        return sum(len(shoe) for shoe in self.shoes)
+
+    def __str__(self):
+        return f"Repro({len(self.shoes)} shoe(s), {self.cards} cards, {self.seats} seats, {self.rounds} rounds, fresh={self.fresh}): {self.divergence}"
+
+class DifferentialResult(NamedTuple):
+    tables: int
+    rounds: int
+    hands: int
+    divergences: List[Divergence]
+
+    @property
+    def ok(self) -> bool:
+        return not self.divergences
+
+    def merge(self, other: 'DifferentialResult') -> 'DifferentialResult':
+        return DifferentialResult(self.tables + other.tables, self.rounds + other.rounds, self.hands + other.hands, self.divergences + other.divergences)
+
+    def __str__(self):
+        status = "no divergences" if self.ok else f"{len(self.divergences)} divergence(s), first {self.divergences[0]}"
+        return f"DifferentialResult(tables={self.tables}, rounds={self.rounds}, hands={self.hands}, {status})"
+
+class ShoeScript:
+    # Shoe orders for one table, drawn from their own seeded stream so the
+    # k-th shuffle of table t is the same for every engine and every run.
+    def __init__(self, seed: int, table: int, num_decks: int = 8, shoes: Optional[Sequence[np.ndarray]] = None):
+        self._rng = np.random.default_rng([seed, table])
+        self._base = np.tile(np.arange(len(SYMBOLS), dtype=np.int8).repeat(4), num_decks)
+        self._shoes = list(shoes) if shoes is not None else None
+        self._dealt: List[np.ndarray] = []
+
+    @property
+    def shoes(self) -> Optional[List[np.ndarray]]:
+        return self._shoes
+
+    @property
+    def dealt(self) -> List[np.ndarray]:
+        return self._dealt
+
+    def next(self) -> np.ndarray:
+        if self._shoes is not None:
+            if len(self._dealt) == len(self._shoes):
+                raise IndexError("The script has no more shoes.")
+            order = self._shoes[len(self._dealt)]
+        else:
+            order = self._rng.permutation(self._base)
+
+        self._dealt.append(order)
+        return order
+
+class ScriptedShoe(Shoe):
+    __slots__ = ('_script', '_reshuffle')
+
+    def __init__(self, script: ShoeScript, num_decks: int = 8, penetration: float = 5 / 16, reshuffle: bool = True):
+        super().__init__([CARDS[0]] * (num_decks * 52), penetration)
+        self._script = script
+        self._reshuffle = reshuffle
+
+    @property
+    def needs_shuffle(self) -> bool:
+        return self._reshuffle and self._position > self._cut_card
+
+    def shuffle(self) -> 'ScriptedShoe':
+        self._cards = [CARDS[symbol] for symbol in self._script.next()]
+        self._position = 0
+        return self
+
+class ScriptedPopulation(Population):
+    def __init__(self, scripts: Sequence[ShoeScript], reshuffle: bool = True, **kwargs):
+        super().__init__(trace=True, **kwargs)
+        self._scripts = scripts
+
+        shoes = [script.next() for script in scripts]
+        self._shoes = np.array(shoes, dtype=np.int8)
+        if not reshuffle:
+            self._cut_card = 0
+
+    def _shuffle(self, tables: np.ndarray):
+        for table in tables:
+            self._shoes[table] = self._scripts[table].next()
+
+class _Recorder(Subscriber):
+    kinds = frozenset((Kind.BET, Kind.ACTION, Kind.CARD, Kind.RESULT))
+
+    def __init__(self, seats: Dict[int, int], size: int):
+        self._seats = seats
+        self._size = size
+        self.reset()
+
+    def reset(self):
+        self.bets = [0] * self._size
+        self.actions = [-1] * self._size
+        self.cards = [0] * self._size
+        self.net = [0] * self._size
+
+    def handle(self, event: Event):
+        seat = self._seats.get(event.seat)
+        if seat is None:
+            return
+
+        kind = event.kind
+        if kind == Kind.CARD:
+            self.cards[seat] += 1
+        elif kind == Kind.ACTION:
+            if self.actions[seat] == -1:
+                self.actions[seat] = ACTIONS[event.data['action']]
+        elif kind == Kind.BET:
+            self.bets[seat] = event.data['amount']
+        else:
+            self.net[seat] = event.data['net']
+
+class _Table:
+    # The reference engine for one table: BlackJack and its AIs, with a
+    # recorder on the event bus keyed by seat index.
+    def __init__(self, script: ShoeScript, seats: int, min_bet: int, cash: int, num_decks: int, rules: Rules, max_bet: Optional[int], reshuffle: bool):
+        bus = EventBus()
+        shoe = ScriptedShoe(script, num_decks, rules.penetration, reshuffle)
+        self.table = BlackJack(min_bet, max_bet, num_decks=num_decks, limit=seats, rules=rules, events=bus, shoe=shoe)
+        self.players = [AI(cash, name=f"Seat{index}") for index in range(seats)]
+        for player in self.players:
+            self.table.join(player)
+
+        self.recorder = _Recorder({seat.position: index for index, seat in enumerate(self.table.seats)}, seats)
+        bus.subscribe(self.recorder)
+
+    def play(self) -> bool:
+        self.recorder.reset()
+        return self.table.play() is not False
+
+def _compare(seed: int, table: int, round: int, reference: _Table, population: Population, row: int, seats: int) -> Optional[Divergence]:
+    trace = population.trace
+    recorder = reference.recorder
+    seated = reference.table.players
+    rows = []
+    for seat in range(seats):
+        player = reference.players[seat]
+        index = row * seats + seat
+        expected = {
+            'seated': player in seated,
+            'bet': recorder.bets[seat],
+            'action': recorder.actions[seat],
+            'cards': recorder.cards[seat] if recorder.bets[seat] else 0,
+            'net': recorder.net[seat],
+            'cash': player.cash,
+            'bankroll': player.bankroll.total,
+            'running_count': player.running_count,
+            'true_count': player.true_count,
+        }
+        actual = {
+            'seated': bool(population._active[index]),
+            'bet': int(trace.bets[row, seat]),
+            'action': int(trace.actions[row, seat]),
+            'cards': int(trace.cards[row, seat]),
+            'net': int(trace.net[row, seat]),
+            'cash': int(population._cash[index]),
+            'bankroll': int(population._bankroll[index]),
+            'running_count': int(population._running_count[index]),
+            'true_count': float(population._true_count[index]),
+        }
+        rows.append((expected, actual))
+
+    # Fields are checked across all seats before the next field, so a wrong
+    # action is reported ahead of the payouts it goes on to disturb.
+    for field in FIELDS:
+        for seat, (expected, actual) in enumerate(rows):
+            if field not in (FIELDS if expected['seated'] else LEFT_FIELDS):
+                continue
+            left, right = expected[field], actual[field]
+            same = math.isclose(left, right, rel_tol=1e-9, abs_tol=1e-9) if field == 'true_count' else left == right
+            if not same:
+                return Divergence(seed, table, round, seat, field, left, right)
+    return None
+
+def _run(scripts: List[ShoeScript], seed: int, first: int, rounds: int, seats: int, min_bet: int, cash: int, num_decks: int, rules: Rules, max_bet: Optional[int], reshuffle: bool = True) -> Tuple[DifferentialResult, List[Tuple[int, int]]]:
+    # Plays every table of both engines round by round and stops a table at
+    # its first divergence. Returns the result and, per table, the round it
+    # stopped at and the shoe position either engine had reached.
+    tables = [_Table(script, seats, min_bet, cash, num_decks, rules, max_bet, reshuffle) for script in scripts]
+    # The candidate gets its own copy of every script, so neither engine can
+    # see how far the other has dealt.
+    copies = [ShoeScript(seed, first + index, num_decks, script.shoes) for index, script in enumerate(scripts)]
+    population = ScriptedPopulation(copies, reshuffle, size=len(scripts) * seats, min_bet=min_bet, cash=cash, num_decks=num_decks, seats=seats, rules=rules, max_bet=max_bet)
+
+    live = list(range(len(tables)))
+    divergences: List[Divergence] = []
+    stops = [(0, 0)] * len(tables)
+    played = hands = 0
+
+    for round in range(1, rounds + 1):
+        if not live:
+            break
+        try:
+            candidate = population.play()
+        except IndexError:
+            break
+
+        for row in list(live):
+            reference = tables[row]
+            try:
+                reference_played = reference.play()
+            except IndexError:
+                live.remove(row)
+                continue
+
+            candidate_played = bool(candidate and population.trace.bets[row].any())
+            if reference_played != candidate_played:
+                divergence = Divergence(seed, first + row, round, -1, 'playing', reference_played, candidate_played)
+            else:
+                divergence = _compare(seed, first + row, round, reference, population, row, seats) if reference_played else None
+
+            stops[row] = (round, max(reference.table.shoe.dealt, int(population._position[row])))
+            hands += sum(1 for bet in reference.recorder.bets if bet)
+            played += reference_played
+            if divergence is not None:
+                divergences.append(divergence)
+                live.remove(row)
+            elif not reference_played:
+                live.remove(row)
+
+    return DifferentialResult(len(tables), played, hands, divergences), stops
+
+def _check(seed: int, first: int, tables: int, rounds: int, seats: int, min_bet: int, cash: int, num_decks: int, rules: Rules, max_bet: Optional[int]) -> DifferentialResult:
+    scripts = [ShoeScript(seed, first + index, num_decks) for index in range(tables)]
+    result, _ = _run(scripts, seed, first, rounds, seats, min_bet, cash, num_decks, rules, max_bet)
+    return result
+
+def replay(repro: Repro, min_bet: int = 25, cash: int = 1000, num_decks: int = 8, rules: Optional[Rules] = None, max_bet: Optional[int] = None) -> Optional[Divergence]:
+    rules = rules or Rules(max_splits=0)
+    divergence = repro.divergence
+    script = ShoeScript(divergence.seed, divergence.table, num_decks, repro.shoes)
+
+    try:
+        result, _ = _run([script], divergence.seed, divergence.table, repro.rounds, repro.seats, min_bet, cash, num_decks, rules, max_bet, reshuffle=not repro.fresh)
+    except IndexError:
+        return None
+    return result.divergences[0] if result.divergences else None
+
+def shrink(divergence: Divergence, seats: int = 6, min_bet: int = 25, cash: int = 1000, num_decks: int = 8, rules: Optional[Rules] = None, max_bet: Optional[int] = None) -> Repro:
+    rules = rules or Rules(max_splits=0)
+    kwargs = dict(min_bet=min_bet, cash=cash, num_decks=num_decks, rules=rules, max_bet=max_bet)
+
+    # Replay the diverging table alone to learn which shoes it dealt and
+    # where each round of the last shoe started.
+    script = ShoeScript(divergence.seed, divergence.table, num_decks)
+    table = _Table(script, seats, min_bet, cash, num_decks, rules, max_bet, True)
+    starts = []
+    for _ in range(divergence.round):
+        shoe = len(script.dealt)
+        position = table.table.shoe.dealt
+        table.play()
+        starts = starts + [position] if len(script.dealt) == shoe else [0]
+
+    result, stops = _run([ShoeScript(divergence.seed, divergence.table, num_decks)], divergence.seed, divergence.table, divergence.round, seats, **kwargs)
+    found = result.divergences[0] if result.divergences else divergence
+    shoes = script.dealt
+    end = stops[0][1]
+    last = shoes[-1]
+
+    # The smallest repro deals a slice of the last shoe to fresh players,
+    # starting as late as possible and ending where the divergence showed.
+    for rounds, start in zip(range(1, len(starts) + 1), reversed(starts)):
+        candidate = Repro([last[start:end]], seats, rounds, True, found._replace(round=rounds))
+        divergence = replay(candidate, **kwargs)
+        if divergence is not None:
+            return candidate._replace(divergence=divergence)
+
+    return Repro(shoes, seats, found.round, False, found)
+
+def differential(tables: int = 64, rounds: int = 1000, seed: int = 0, seats: int = 6, min_bet: int = 25, cash: int = 1000, num_decks: int = 8, rules: Optional[Rules] = None, max_bet: Optional[int] = None, chunks: int = 1, processes: Optional[int] = None) -> DifferentialResult:
+    # Population does not split, so the reference plays the same rules with
+    # splitting turned off.
+    rules = rules or Rules(max_splits=0)
+    if rules.max_splits != 0:
+        raise ValueError(f"Both engines must play without splits, rules must set max_splits=0. Value is {rules.max_splits}.")
+    if chunks < 1:
+        raise ValueError("A differential run needs at least one chunk.")
+
+    per_chunk = -(-tables // chunks)
+    tasks = [
+        (seed, first, min(per_chunk, tables - first), rounds, seats, min_bet, cash, num_decks, rules, max_bet)
+        for first in range(0, tables, per_chunk)
+    ]
+
+    result = DifferentialResult(0, 0, 0, [])
+    for part in parallel_map(_check, tasks, processes):
+        result = result.merge(part)
+    return result
\ No newline at end of file
@@ -0,0 +1,134 @@
+import time
+
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from components import Pot
+from components.events import Event, StreamWriter
+
+from .utils import Outcome
+
+class Kind:
+    JOIN = "join"
+    RESHUFFLE = "reshuffle"
+    FORGET = "forget"
+    BET = "bet"
+    SIT_OUT = "sit_out"
+    LEAVE = "leave"
+    GAME_OVER = "game_over"
+    ROUND_START = "round_start"
+    CARD = "card"
+    NATURAL = "natural"
+    INSURANCE = "insurance"
+    TURN = "turn"
+    ACTION = "action"
+    SPLIT = "split"
+    BUST = "bust"
+    REVEAL = "reveal"
+    DEALER_BUST = "dealer_bust"
+    RESULT = "result"
+    INSURANCE_PAID = "insurance_paid"
+    PLAYER = "player"
+    MESSAGE = "message"
+    ROUND_END = "round_end"
+
+class ConsoleRenderer(StreamWriter):
+    actions = {'h': "Hit", 's': "Stand", 'd': "Double Down", 't': "Split", 'r': "Surrender"}
+    results = {
+        Outcome.LOSS: "Lost",
+        Outcome.BUST: "Lost",
+        Outcome.WIN: "Won",
+        Outcome.BLACKJACK: "Won",
+        Outcome.PUSH: "Push",
+        Outcome.SURRENDER: "Surrendered",
+    }
+
+    # Pauses between events, in multiples of the narration speed.
+    pauses = {
+        Kind.BET: 0.5,
+        Kind.ROUND_START: 1,
+        Kind.CARD: 0.5,
+        Kind.ACTION: 0.5,
+        Kind.REVEAL: 0.5,
+        Kind.ROUND_END: 3,
+    }
+
+    def __init__(self, speed: float = 0, stream: Optional[TextIO] = None, batch_size: int = 256):
+        super().__init__(stream, batch_size)
+        self._speed = speed
+        self._hands: Dict[Tuple[int, int], List[str]] = {}
+        self._names: Dict[Tuple[int, int], str] = {}
+        self._hidden: Dict[Tuple[int, int], int] = {}
+
+    def handle(self, event: Event):
+        super().handle(event)
+
+        # Paced narration is meant to be watched, so it can't sit in a buffer.
+        if self._speed > 0 or event.kind == Kind.ROUND_END:
+            self.flush()
+            time.sleep(self._speed * self.pauses.get(event.kind, 0))
+
+    def _hand(self, seat: Tuple[int, int]) -> str:
+        return f"Seat(Player: {self._names[seat]}, Cards: {', '.join(self._hands[seat])})"
+
+    def format(self, event: Event) -> Optional[str]:
+        kind, data, player = event.kind, event.data, event.player
+        seat = (event.seat, event.hand)
+
+        if kind == Kind.CARD:
+            hand = self._hands.setdefault(seat, [])
+            self._names[seat] = player
+            if data['hidden']:
+                self._hidden[seat] = len(hand)
+                hand.append("?")
+            else:
+                hand.append(data['card'].name)
+            return self._hand(seat)
+        if kind == Kind.ACTION:
+            return f"Player({player}): {self.actions.get(data['action'], data['action'])}"
+        if kind == Kind.TURN:
+            self._names[seat] = player
+            self._hands.setdefault(seat, [])
+            return f"\n{self._hand(seat)}"
+        if kind == Kind.RESULT:
+            return f"Player({player}): {self.results[data['outcome']]}"
+        if kind == Kind.PLAYER:
+            return f"Player(name={player}, cash=${data['cash']}.00, bankroll={repr(Pot(data['chips']))})"
+        if kind == Kind.SPLIT:
+            split = (event.seat, data['split'])
+            self._names[split] = player
+            self._hands[split] = [self._hands[seat].pop()]
+            return f"Player({player}) splits"
+        if kind == Kind.BUST:
+            return f"\n{self._hand(seat)}\nPlayer({player}) busted!"
+        if kind == Kind.REVEAL:
+            if seat in self._hidden:
+                self._hands[seat][self._hidden.pop(seat)] = data['card'].name
+            return f"\n{self._hand(seat)}"
+        if kind == Kind.BET:
+            return f"Player({player}) bets ${data['amount']}"
+        if kind == Kind.ROUND_START:
+            return "\nLocking bets in...\n"
+        if kind == Kind.ROUND_END:
+            self._hands.clear()
+            self._names.clear()
+            self._hidden.clear()
+            return ""
+        if kind == Kind.RESHUFFLE:
+            return "Reshuffling deck..."
+        if kind == Kind.FORGET:
+            return f"AI Player({player}) is forgetting current counts..."
+        if kind == Kind.SIT_OUT:
+            return f"Player({player}) is not playing this round.\n"
+        if kind == Kind.LEAVE:
+            return f"\nPlayer({player}) has left the table.\n"
+        if kind == Kind.GAME_OVER:
+            return "\nNo players, game over!"
+        if kind == Kind.INSURANCE:
+            return f"Player({player}) takes ${data['amount']} insurance"
+        if kind == Kind.INSURANCE_PAID:
+            return f"Player({player}) is paid ${data['amount']} insurance"
+        if kind == Kind.DEALER_BUST:
+            return "Dealer busted!"
+        if kind == Kind.MESSAGE:
+            return data['text']
+        return None
\ No newline at end of file
@@ -0,0 +1,301 @@
+import math
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from components.events import Event, Subscriber
+
+from .events import Kind
+from .utils import Outcome
+
+ACTIONS = "hsdtr"
+
+Filter = Union[int, float, str, bool, Tuple[Optional[float], Optional[float]], Iterable]
+
+class HandSummary(NamedTuple):
+    decisions: int
+    ev: float
+    stderr: float
+    win: float
+    push: float
+    loss: float
+
+    def __str__(self):
+        return f"HandSummary(decisions={self.decisions}, ev={self.ev:+.4f} ± {self.stderr:.4f}, win={self.win:.2%}, push={self.push:.2%}, loss={self.loss:.2%})"
+
+class _Split:
+    # Decisions made on a hand up to and including its split, waiting on the
+    # results of every hand that came out of it.
+    __slots__ = ('rows', 'hands', 'net')
+
+    def __init__(self, rows: List[tuple], hands: Set[Tuple[int, int]]):
+        self.rows = rows
+        self.hands = hands
+        self.net = 0
+
+class HandHistory(Subscriber):
+    # One row per player decision, joined to the result of the hand it was
+    # made on. Decisions are held per hand until that hand's RESULT event
+    # arrives. Decisions up to a split are joined to the combined net of
+    # every hand the split produced, so a 't' row carries the whole split.
+    kinds = frozenset((Kind.BET, Kind.ACTION, Kind.SPLIT, Kind.RESULT, Kind.ROUND_END))
+
+    columns: Dict[str, str] = {
+        'round': 'int64',
+        'player': 'int32',
+        'action': 'int8',
+        'first': 'bool',
+        'total': 'int8',
+        'soft': 'bool',
+        'cards': 'int8',
+        'upcard': 'int8',
+        'true_count': 'float32',
+        'outcome': 'int8',
+        'bet': 'int32',
+        'net': 'int32',
+    }
+    _row_dtype = np.dtype(list(columns.items()))
+
+    # Low cardinality columns get one bitmap per value, the rest a sorted
+    # permutation for range queries. Upcards are card points, so an ace is 1.
+    bitmap_columns = ('player', 'action', 'first', 'total', 'soft', 'cards', 'upcard', 'outcome')
+    sorted_columns = ('round', 'true_count', 'bet', 'net')
+
+    def __init__(self, capacity: int = 1 << 16, batch_size: int = 4096):
+        if capacity < 1 or batch_size < 1:
+            raise ValueError("History capacity and batch size must be positive.")
+
+        self._capacity = capacity
+        self._batch_size = batch_size
+        self._length = 0
+        self._data = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self.columns.items()}
+        self._rows: List[tuple] = []
+
+        self._pending: Dict[Tuple[int, int], List[tuple]] = {}
+        self._splits: Dict[Tuple[int, int], List[_Split]] = {}
+        self._wagers: Dict[int, int] = {}
+        self._played: Set[Tuple[int, int]] = set()
+        self._players: Dict[str, int] = {}
+
+        self._bitmaps: Dict[str, Dict[int, np.ndarray]] = {}
+        self._sorted: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._indexed = 0
+
+    @property
+    def length(self) -> int:
+        return self._length + len(self._rows)
+
+    @property
+    def players(self) -> List[str]:
+        return list(self._players)
+
+    def column(self, name: str) -> np.ndarray:
+        self.flush()
+        return self._data[name][:self._length]
+
+    def handle(self, event: Event):
+        kind, data = event.kind, event.data
+        hand = (event.seat, event.hand)
+        if kind == Kind.ACTION:
+            first = hand not in self._played
+            self._played.add(hand)
+            self._pending.setdefault(hand, []).append((event.round, self._player(event.player), ACTIONS.index(data['action']), first, data['total'], data['soft'], data['cards'], data['upcard'], data['true_count']))
+        elif kind == Kind.SPLIT:
+            # The new hand also owes its result to every split above this one.
+            new = (event.seat, data['split'])
+            split = _Split(self._pending.pop(hand, []), {hand, new})
+            owners = self._splits.setdefault(hand, [])
+            for parent in owners:
+                parent.hands.add(new)
+            owners.append(split)
+            self._splits[new] = list(owners)
+        elif kind == Kind.RESULT:
+            # Every row's EV is in units of the wager the hand opened with,
+            # before any double.
+            bet = self._wagers.get(event.seat, data['bet'])
+            decisions = self._pending.pop(hand, None)
+            if decisions:
+                self._emit(decisions, int(data['outcome']), bet, data['net'])
+
+            for split in self._splits.pop(hand, ()):
+                split.net += data['net']
+                split.hands.discard(hand)
+                if not split.hands and split.rows:
+                    outcome = Outcome.WIN if split.net > 0 else Outcome.PUSH if split.net == 0 else Outcome.LOSS
+                    self._emit(split.rows, int(outcome), bet, split.net)
+        elif kind == Kind.BET:
+            self._wagers[event.seat] = data['amount']
+        elif kind == Kind.ROUND_END:
+            self._pending.clear()
+            self._splits.clear()
+            self._wagers.clear()
+            self._played.clear()
+
+    def _emit(self, decisions: List[tuple], outcome: int, bet: int, net: int):
+        self._rows.extend(row + (outcome, bet, net) for row in decisions)
+        if len(self._rows) >= self._batch_size:
+            self.flush()
+
+    def _player(self, name: Optional[str]) -> int:
+        code = self._players.get(name)
+        if code is None:
+            code = self._players[name] = len(self._players)
+        return code
+
+    def flush(self):
+        if not self._rows:
+            return
+
+        batch = np.array(self._rows, dtype=self._row_dtype)
+        self._rows.clear()
+        self.extend({name: batch[name] for name in self.columns})
+
+    def extend(self, columns: Dict[str, np.ndarray]):
+        # Bulk load, for decisions that were recorded elsewhere.
+        lengths = {len(values) for values in columns.values()}
+        if set(columns) != set(self.columns) or len(lengths) != 1:
+            raise ValueError(f"Columns must be {list(self.columns)} with equal lengths.")
+
+        end = self._length + lengths.pop()
+        if end > self._capacity:
+            capacity = self._capacity
+            while capacity < end:
+                capacity *= 2
+            for name, dtype in self.columns.items():
+                column = np.zeros(capacity, dtype=dtype)
+                column[:self._length] = self._data[name][:self._length]
+                self._data[name] = column
+            self._capacity = capacity
+
+        for name, values in columns.items():
+            self._data[name][self._length:end] = values
+        self._length = end
+
+    def _refresh(self):
+        # Indexes are built on first use and dropped whenever rows arrive.
+        if self._indexed != self._length:
+            self._bitmaps.clear()
+            self._sorted.clear()
+            self._indexed = self._length
+
+    def _bitmaps_for(self, name: str) -> Dict[int, np.ndarray]:
+        self._refresh()
+
+        bitmaps = self._bitmaps.get(name)
+        if bitmaps is None:
+            column = self._data[name][:self._length]
+            bitmaps = self._bitmaps[name] = {int(key): np.packbits(column == key) for key in np.unique(column)}
+        return bitmaps
+
+    def _bitmap(self, name: str, value: int) -> np.ndarray:
+        bitmap = self._bitmaps_for(name).get(value)
+        return bitmap if bitmap is not None else np.zeros((self._length + 7) // 8, dtype=np.uint8)
+
+    def _range(self, name: str, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        self._refresh()
+
+        index = self._sorted.get(name)
+        if index is None:
+            column = self._data[name][:self._length]
+            order = np.argsort(column, kind='stable')
+            index = self._sorted[name] = (order, column[order])
+
+        order, values = index
+        start = 0 if low is None else np.searchsorted(values, low, 'left')
+        end = np.searchsorted(values, np.inf if high is None else high, 'right')
+        return order[start:end]
+
+    def _code(self, name: str, value) -> int:
+        if name == 'action':
+            return ACTIONS.index(value)
+        if name == 'player':
+            return self._players.get(value, -1)
+        return int(value)
+
+    @staticmethod
+    def _bounds(name: str, value: Filter) -> Tuple[Optional[float], Optional[float]]:
+        if isinstance(value, tuple):
+            if len(value) != 2:
+                raise ValueError(f"A range on {name} must be a (low, high) pair, Value is {value}.")
+            return value
+        if isinstance(value, (int, float, np.number)):
+            return value, value
+        raise ValueError(f"{name} takes a number or a (low, high) range, Value is {value!r}.")
+
+    def _codes(self, name: str, value: Filter) -> List[int]:
+        if not isinstance(value, tuple):
+            values = value if isinstance(value, (list, set, frozenset)) else [value]
+            return [self._code(name, item) for item in values]
+
+        if name in ('action', 'player'):
+            raise ValueError(f"{name} has no order to take a range over, use a list for membership.")
+        low, high = self._bounds(name, value)
+        return [code for code in self._bitmaps_for(name) if (low is None or code >= low) and (high is None or code <= high)]
+
+    def select(self, **filters: Filter) -> np.ndarray:
+        # Every filter is ANDed. A scalar is equality, a list or set is
+        # membership and a (low, high) tuple is an inclusive range with either
+        # end None. Bitmap columns OR the packed bits of each matching value.
+        self.flush()
+        unknown = set(filters) - set(self.bitmap_columns) - set(self.sorted_columns)
+        if unknown:
+            raise ValueError(f"Cannot filter on {sorted(unknown)}. Indexed columns are {list(self.bitmap_columns + self.sorted_columns)}.")
+
+        mask = None
+        for name in self.bitmap_columns:
+            if name not in filters:
+                continue
+
+            bits = np.zeros((self._length + 7) // 8, dtype=np.uint8)
+            for code in self._codes(name, filters[name]):
+                bits |= self._bitmap(name, code)
+            mask = bits if mask is None else mask & bits
+
+        ranges = {name: self._bounds(name, filters[name]) for name in self.sorted_columns if name in filters}
+        if mask is not None:
+            rows = self._unpack(mask)
+        elif ranges:
+            # Without a bitmap to start from, the narrowest sorted range is
+            # the candidate set.
+            candidates = sorted((self._range(name, *bounds) for name, bounds in ranges.items()), key=len)
+            rows = np.sort(candidates[0])
+        else:
+            return np.arange(self._length)
+
+        for name, (low, high) in ranges.items():
+            values = self._data[name][rows]
+            keep = ~np.isnan(values) if values.dtype.kind == 'f' else np.ones(len(rows), dtype=bool)
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values <= high
+            rows = rows[keep]
+        return rows
+
+    def _unpack(self, mask: np.ndarray) -> np.ndarray:
+        # Only bytes with a bit set are unpacked, so a selective mask costs a
+        # scan of N / 8 bytes.
+        nonzero = np.flatnonzero(mask)
+        bits = np.unpackbits(mask[nonzero, None], axis=1)
+        rows = (nonzero[:, None] * 8 + np.arange(8))[bits == 1]
+        return rows[rows < self._length]
+
+    def summary(self, **filters: Filter) -> HandSummary:
+        rows = self.select(**filters)
+        if not len(rows):
+            return HandSummary(0, math.nan, math.nan, math.nan, math.nan, math.nan)
+
+        returns = self._data['net'][rows] / np.maximum(self._data['bet'][rows], 1)
+        outcome = self._data['outcome'][rows]
+        won = np.isin(outcome, (Outcome.WIN, Outcome.BLACKJACK)).mean()
+        push = (outcome == Outcome.PUSH).mean()
+        stderr = returns.std(ddof=1) / math.sqrt(len(rows)) if len(rows) > 1 else math.nan
+
+        return HandSummary(len(rows), float(returns.mean()), float(stderr), float(won), float(push), float(1 - won - push))
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self):
+        return f"HandHistory(decisions={self.length}, players={len(self._players)})"
\ No newline at end of file
@@ -0,0 +1,122 @@
+import math
+import random
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from . import cache
+from .blackjack import BlackJack
+from .rules import Rules
+from .stats import RunningMoments
+from .sweep import FlatBettor, parallel_map
+
+# Bumped whenever the way edges are measured changes, so stale caches miss.
+EDGES_VERSION = 2
+
+class CountEdgeTable:
+    __slots__ = ('_count_range', '_edges', '_variances')
+
+    def __init__(self, edges: Dict[int, Tuple[float, float]], count_range: int = 10):
+        self._count_range = count_range
+        self._edges: List[float] = []
+        self._variances: List[float] = []
+
+        for bucket in range(-count_range, count_range + 1):
+            if bucket not in edges:
+                raise ValueError(f"Edge table is missing true count {bucket}.")
+            edge, variance = edges[bucket]
+            self._edges.append(edge)
+            self._variances.append(variance)
+
+    @property
+    def count_range(self) -> int:
+        return self._count_range
+
+    def lookup(self, true_count: float) -> Tuple[float, float]:
+        index = max(-self._count_range, min(self._count_range, math.floor(true_count))) + self._count_range
+        return self._edges[index], self._variances[index]
+
+    def kelly_fraction(self, true_count: float) -> float:
+        edge, variance = self.lookup(true_count)
+        return edge / variance if edge > 0 and variance > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'count_range': self._count_range,
+            'edges': {str(bucket): [edge, variance] for bucket, edge, variance in zip(range(-self._count_range, self._count_range + 1), self._edges, self._variances)},
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> 'CountEdgeTable':
+        return CountEdgeTable({int(bucket): tuple(values) for bucket, values in data['edges'].items()}, data['count_range'])
+
+    @staticmethod
+    def from_moments(moments: Dict[int, RunningMoments], count_range: int = 10, min_samples: int = 500) -> 'CountEdgeTable':
+        usable = {bucket: stats for bucket, stats in moments.items() if stats.count >= min_samples}
+        if not usable:
+            raise ValueError(f"No true count has the {min_samples} samples needed to build an edge table.")
+
+        # Thin buckets at the extremes borrow from a weighted linear fit of
+        # edge against count and the pooled variance of the usable buckets.
+        weight = sum(stats.count for stats in usable.values())
+        mean_count = sum(bucket * stats.count for bucket, stats in usable.items()) / weight
+        mean_edge = sum(stats.mean * stats.count for stats in usable.values()) / weight
+        spread = sum(stats.count * (bucket - mean_count) ** 2 for bucket, stats in usable.items())
+        slope = sum(stats.count * (bucket - mean_count) * (stats.mean - mean_edge) for bucket, stats in usable.items()) / spread if spread else 0.0
+        pooled = sum(stats.variance * stats.count for stats in usable.values()) / weight
+
+        edges = {}
+        for bucket in range(-count_range, count_range + 1):
+            if bucket in usable:
+                edges[bucket] = (usable[bucket].mean, usable[bucket].variance)
+            else:
+                edges[bucket] = (mean_edge + slope * (bucket - mean_count), pooled)
+        return CountEdgeTable(edges, count_range)
+
+    def __repr__(self):
+        return f"CountEdgeTable(count_range={self._count_range}, edges=[{', '.join(f'{edge:+.4f}' for edge in self._edges)}])"
+
+def _collect_edges(rules: Rules, num_decks: int, rounds: int, seed: int, seats: int, count_range: int) -> Dict[int, RunningMoments]:
+    random.seed(seed)
+
+    min_bet = 10
+    table = BlackJack(min_bet, num_decks=num_decks, limit=seats, rules=rules)
+    bettors = [FlatBettor(name=f"Seat{index}") for index in range(seats)]
+    for bettor in bettors:
+        table.join(bettor)
+
+    moments: Dict[int, RunningMoments] = {}
+    for _ in range(rounds):
+        before = [bettor.net for bettor in bettors]
+        table.play()
+
+        for bettor, net in zip(bettors, before):
+            bucket = max(-count_range, min(count_range, math.floor(bettor.bet_count)))
+            moments.setdefault(bucket, RunningMoments()).push((bettor.net - net) / min_bet)
+
+    return moments
+
+def generate_edge_table(rules: Optional[Rules] = None, num_decks: int = 8, rounds: int = 200000, seed: int = 0, seats: int = 5, count_range: int = 10, chunks: int = 8, processes: Optional[int] = None) -> CountEdgeTable:
+    rules = rules or Rules()
+    per_chunk = -(-rounds // chunks)
+    tasks = [(rules, num_decks, per_chunk, seed + chunk, seats, count_range) for chunk in range(chunks)]
+
+    moments: Dict[int, RunningMoments] = {}
+    for partial in parallel_map(_collect_edges, tasks, processes):
+        for bucket, stats in partial.items():
+            moments.setdefault(bucket, RunningMoments()).merge(stats)
+
+    return CountEdgeTable.from_moments(moments, count_range)
+
+@lru_cache(maxsize=None)
+def edge_table(rules: Optional[Rules] = None, num_decks: int = 8, rounds: int = 200000, seed: int = 0, count_range: int = 10, processes: Optional[int] = None, cache_dir: Optional[str] = None) -> CountEdgeTable:
+    rules = rules or Rules()
+    key = cache.cache_key(EDGES_VERSION, rules, num_decks, rounds, seed, count_range)
+
+    cached = cache.load("edges", key, cache_dir)
+    if cached is not None:
+        return CountEdgeTable.from_dict(cached)
+
+    table = generate_edge_table(rules, num_decks, rounds, seed, count_range=count_range, processes=processes)
+    cache.save("edges", key, table.to_dict(), cache_dir)
+    return table
\ No newline at end of file
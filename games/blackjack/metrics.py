@@ -0,0 +1,40 @@
+import time
+
+from components.events import Event, Subscriber
+from components.metrics import Registry
+
+from .events import Kind
+
+class BlackJackMetrics(Subscriber):
+    kinds = frozenset((Kind.ROUND_START, Kind.SPLIT, Kind.BUST, Kind.NATURAL, Kind.RESHUFFLE, Kind.ACTION))
+
+    def __init__(self, registry: Registry):
+        self.rounds = registry.counter("blackjack_rounds_total", "Rounds dealt with at least one bet.")
+        self.hands = registry.counter("blackjack_hands_total", "Player hands dealt, including split hands.")
+        self.busts = registry.counter("blackjack_busts_total", "Player hands that went over 21.")
+        self.blackjacks = registry.counter("blackjack_naturals_total", "Player hands dealt a natural blackjack.")
+        self.reshuffles = registry.counter("blackjack_reshuffles_total", "Shoe reshuffles.")
+        self.decisions = registry.histogram("blackjack_decision_seconds", "Time taken by a player to choose an action.")
+
+        self._start = time.monotonic()
+        registry.gauge("blackjack_hands_per_second", "Hands dealt per second since the table opened.", function=self.hands_per_second)
+
+    def hands_per_second(self) -> float:
+        elapsed = time.monotonic() - self._start
+        return self.hands.value / elapsed if elapsed > 0 else 0.0
+
+    def handle(self, event: Event):
+        kind = event.kind
+        if kind == Kind.ACTION:
+            self.decisions.observe(event.data['latency'])
+        elif kind == Kind.ROUND_START:
+            self.rounds.inc()
+            self.hands.inc(event.data['hands'])
+        elif kind == Kind.SPLIT:
+            self.hands.inc()
+        elif kind == Kind.BUST:
+            self.busts.inc()
+        elif kind == Kind.NATURAL:
+            self.blackjacks.inc()
+        elif kind == Kind.RESHUFFLE:
+            self.reshuffles.inc()
\ No newline at end of file
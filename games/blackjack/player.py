@@ -1,23 +1,63 @@
 import math
 
-from typing import Optional, List, Tuple
+from typing import Optional, Iterable, List, Tuple, TYPE_CHECKING
 from components import Symbol, Deck, Player, Card, Chip
 
 from .utils import ace_total
 
+if TYPE_CHECKING:
+    from .deviations import DeviationTable
+    from .kelly import CountEdgeTable
+
 class AI(Player):
     high_cards = [Symbol.TEN, Symbol.JACK, Symbol.QUEEN, Symbol.KING, Symbol.ACE]
     low_cards = [Symbol.TWO, Symbol.THREE, Symbol.FOUR, Symbol.FIVE, Symbol.SIX]
 
-    def __init__(self, cash: int, name: Optional[str] = None):
-        super().__init__(cash, name)
+    __slots__ = (
+        '_card_memory',
+        '_running_count',
+        '_true_count',
+        '_bet_count',
+        '_num_decks',
+        '_high_cards',
+        '_low_cards',
+        '_safe_bankroll',
+        '_risk_cap',
+        '_table_min_bet',
+        '_current_bet',
+        '_edge_table',
+        '_kelly_fraction',
+        '_deviations',
+    )
+
+    def __init__(self, cash: int, name: Optional[str] = None, edge_table: Optional['CountEdgeTable'] = None, kelly_fraction: float = 0.5, safe_bankroll: int = 400, risk_cap: float = 0.25, high_cards: Optional[Iterable[Symbol]] = None, low_cards: Optional[Iterable[Symbol]] = None, journal: bool = False, deviations: Optional['DeviationTable'] = None):
+        super().__init__(cash, name, journal)
         
         self._card_memory: Deck = []
         self._running_count: int = 0
         self._true_count: float = 0
+        self._bet_count: float = 0
+        self._num_decks: Optional[int] = None
+        self._high_cards = list(high_cards) if high_cards is not None else self.high_cards
+        self._low_cards = list(low_cards) if low_cards is not None else self.low_cards
         self._safe_bankroll = 400
+        self._risk_cap = 0.25
         self._table_min_bet: Optional[int] = None
         self._current_bet: Optional[int] = None
+        self._edge_table = edge_table
+        self._kelly_fraction = kelly_fraction
+        self._deviations = deviations
+
+        self.safe_bankroll = safe_bankroll
+        self.risk_cap = risk_cap
+
+    @property
+    def deviations(self) -> Optional['DeviationTable']:
+        return self._deviations
+
+    @deviations.setter
+    def deviations(self, deviations: Optional['DeviationTable']):
+        self._deviations = deviations
 
     @property
     def safe_bankroll(self) -> int:
@@ -30,9 +70,60 @@ class AI(Player):
 
         self._safe_bankroll = val
 
+    @property
+    def risk_cap(self) -> float:
+        return self._risk_cap
+
+    @risk_cap.setter
+    def risk_cap(self, val: float):
+        if not 0 < val <= 1:
+            raise ValueError("Risk cap must be a fraction of the bankroll between 0 and 1!")
+
+        self._risk_cap = val
+
+    @property
+    def running_count(self) -> int:
+        return self._running_count
+
+    @property
+    def true_count(self) -> float:
+        return self._true_count
+
+    # The true count the last bet was sized at. After a round, true_count has
+    # moved on, and after a reshuffle it belongs to a different shoe.
+    @property
+    def bet_count(self) -> float:
+        return self._bet_count
+
+    @property
+    def edge_table(self) -> Optional['CountEdgeTable']:
+        return self._edge_table
+
+    @edge_table.setter
+    def edge_table(self, table: Optional['CountEdgeTable']):
+        self._edge_table = table
+
     def remember(self, cards: List[Deck]):
         all_cards = [card for deck in cards for card in deck]
         self._card_memory.extend(all_cards)
+        self._running_count += self._count_cards(all_cards)
+
+        if self._num_decks is not None:
+            self._true_count = self._calculate_true_count(self._num_decks, len(self._card_memory), self._running_count)
+
+    # Cards a continuous shuffler took back are no longer out of play. Only
+    # cards this player remembered are dropped from the count.
+    def release(self, cards: List[Card]):
+        returned = {id(card) for card in cards}
+        kept, released = [], []
+        for card in self._card_memory:
+            (released if id(card) in returned else kept).append(card)
+
+        self._card_memory[:] = kept
+        self._running_count -= self._count_cards(released)
+
+        if self._num_decks is not None:
+            self._true_count = self._calculate_true_count(self._num_decks, len(self._card_memory), self._running_count)
 
     def forget(self):
         self._card_memory.clear()
@@ -47,8 +138,9 @@ class AI(Player):
         if question.find("bet") >= 0:
             min_bet = kwargs['min_bet']
             max_bet = kwargs['max_bet']
-            
-            return self._make_bet(min_bet)
+
+            self._bet_count = self._true_count
+            return self._make_bet(min_bet, max_bet)
         elif question.find("action") >= 0:
             try:
                 cards = kwargs['cards']
@@ -59,7 +151,7 @@ class AI(Player):
             except Exception as e:
                 raise Exception(f"Player Take Action Exception: {e}")
             
-    def _make_bet(self, min_bet: int) -> str:
+    def _make_bet(self, min_bet: int, max_bet: Optional[int] = None) -> str:
         self._table_min_bet = min_bet
         self._manage_bankroll()
 
@@ -67,6 +159,9 @@ class AI(Player):
             self.cash_out()
             return "l"
 
+        if self._edge_table is not None:
+            return self._make_kelly_bet(min_bet, max_bet)
+
         risk = self._bankroll.total // min_bet
         favor = self._true_count
 
@@ -75,7 +170,7 @@ class AI(Player):
             return str(min_bet)
         
         favor_bet = (favor - 1) * 2 * min_bet
-        risk_bet = (min_bet * math.ceil(risk * 0.25))
+        risk_bet = (min_bet * math.ceil(risk * self._risk_cap))
 
         favor_bet = Chip.to_chip_int(favor_bet)
         risk_bet = Chip.to_chip_int(risk_bet)
@@ -84,12 +179,23 @@ class AI(Player):
         self._current_bet = int(bet)
 
         return bet
+
+    def _make_kelly_bet(self, min_bet: int, max_bet: Optional[int] = None) -> str:
+        fraction = self._edge_table.kelly_fraction(self._true_count) * self._kelly_fraction
+        bet = Chip.to_chip_int(self._bankroll.total * fraction)
+
+        if max_bet is not None:
+            bet = min(bet, max_bet)
+        bet = max(min_bet, min(bet, self._bankroll.total))
+
+        self._current_bet = bet
+        return str(bet)
         
     def _manage_bankroll(self):
         cash_out = 0
         clear = self._initial >= self._safe_bankroll
 
-        if self.bankroll.count > 50:
+        if self.journal is None and self.bankroll.count > 50:
             self.bankroll.optimize()
 
         # Cash Out Logic
@@ -117,26 +223,41 @@ class AI(Player):
 
         player_hand = cards[index]
 
-        player_total = ace_total(cards[index])
         dealer_total = ace_total(cards[-1])
 
-        all_cards = [card for deck in cards for card in deck]
-        all_cards.extend(self._card_memory)
-
-        for card in all_cards:
-            self._update_count(card)
+        table_cards = [card for deck in cards for card in deck]
+        all_cards = table_cards + self._card_memory
 
-        self._calculate_true_count(total_decks, len(all_cards))
+        self._num_decks = total_decks
+        self._true_count = self._calculate_true_count(total_decks, len(all_cards), self._running_count + self._count_cards(table_cards))
         (high, low) = self._calculate_probabilities(all_cards, original_deck_count)
 
-        if self._current_bet <= self._bankroll.total:
-            if "t" in options:
-                response = self._decide_split(player_hand[0].symbol.value, dealer_total)
+        pair = player_hand[0].symbol.value if "t" in options else None
+        ace = Symbol.ACE in [card.symbol for card in player_hand]
+        affordable = self._current_bet <= self._bankroll.total
+
+        # Index plays cover hard totals only; pairs keep to the split table.
+        if self._deviations is not None and pair is None and not ace:
+            response = self._deviations.action(options, player_hand.total, dealer_total, self._true_count)
+            if response is not None and (response != "d" or affordable):
+                return response
+
+        return self.basic_strategy(options, player_hand.total, ace, dealer_total, affordable, pair)
+
+    # The playing decision on its own, from the hard total of the hand, whether
+    # it holds an ace and the dealer's upcard, so it can be tabulated.
+    @staticmethod
+    def basic_strategy(options: List[str], hand: int, ace: bool, dealer_total: int, affordable: bool = True, pair: Optional[int] = None) -> str:
+        player_total = hand + 10 if ace and hand + 10 <= 21 else hand
+
+        if affordable:
+            if pair is not None and "t" in options:
+                response = AI._decide_split(pair, dealer_total)
                 if response:
                     return response
             
             if "d" in options:
-                response = self._decide_double_down(player_hand, dealer_total)
+                response = AI._decide_double_down(hand, ace, dealer_total)
                 if response:
                     return response
 
@@ -163,7 +284,8 @@ class AI(Player):
             case 11 | 10 | 9:
                 return "h"
         
-    def _decide_split(self, pair: int, dealer: int) -> Optional[str]:
+    @staticmethod
+    def _decide_split(pair: int, dealer: int) -> Optional[str]:
         match pair:
             case 1 | 8:
                 return "t"
@@ -180,10 +302,8 @@ class AI(Player):
             case _:
                 return None
 
-    def _decide_double_down(self, player: Deck, dealer: int) -> Optional[str]:
-        ace = True if Symbol.ACE in [card.symbol for card in player] else False
-        hand = player.total
-
+    @staticmethod
+    def _decide_double_down(hand: int, ace: bool, dealer: int) -> Optional[str]:
         match hand:
             case 11:
                 return "s" if ace else "d"
@@ -204,24 +324,29 @@ class AI(Player):
                     return "d" if dealer in [5, 6] else "h"
         return None
                 
-    def _calculate_true_count(self, total_decks: int, cards_played: int):
+    @staticmethod
+    def _calculate_true_count(total_decks: int, cards_played: int, running_count: int) -> float:
         decks_remaining = total_decks - (cards_played // 52)
-        self._true_count = (self._running_count / decks_remaining) if decks_remaining > 0 else 0
+        return (running_count / decks_remaining) if decks_remaining > 0 else 0
     
-    def _update_count(self, card: Card):
-        if card.symbol in self.low_cards:
-            self._running_count += 1
-        elif card.symbol in self.high_cards:
-            self._running_count -= 1
+    def _card_count(self, card: Card) -> int:
+        if card.symbol in self._low_cards:
+            return 1
+        elif card.symbol in self._high_cards:
+            return -1
+        return 0
+
+    def _count_cards(self, cards: List[Card]) -> int:
+        return sum(self._card_count(card) for card in cards)
 
     def _calculate_probabilities(self, all_cards: Deck, original_deck_count: int) -> Tuple[float]:
         cards_played = len(all_cards)
         
-        high_card_count = sum(1 for card in all_cards if card.symbol in self.high_cards)
-        low_card_count = sum(1 for card in all_cards if card.symbol in self.low_cards)
+        high_card_count = sum(1 for card in all_cards if card.symbol in self._high_cards)
+        low_card_count = sum(1 for card in all_cards if card.symbol in self._low_cards)
 
-        total_high_cards = 4 * len(self.high_cards) * (original_deck_count // 52)
-        total_low_cards = 4 * len(self.low_cards) * (original_deck_count // 52)
+        total_high_cards = 4 * len(self._high_cards) * (original_deck_count // 52)
+        total_low_cards = 4 * len(self._low_cards) * (original_deck_count // 52)
 
         remaining_cards = original_deck_count - cards_played
 
@@ -0,0 +1,52 @@
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from components import Chip
+
+class BankrollPolicy(NamedTuple):
+    initial: int
+    min_bet: int
+    safe_bankroll: int = 400
+    risk_cap: float = 0.25
+    max_bet: Optional[int] = None
+
+def to_chip_int(values: np.ndarray) -> np.ndarray:
+    unit = Chip.min_value()
+    return (np.floor_divide(values, unit) * unit).astype(np.int64)
+
+def manage_bankroll(cash: np.ndarray, bankroll: np.ndarray, initial, safe_bankroll, min_bet) -> Tuple[np.ndarray, np.ndarray]:
+    # Vectorised AI._manage_bankroll: the same cash-out and rebuy thresholds,
+    # applied to every path at once. Inputs may be scalars or arrays.
+    clear = np.asarray(initial >= safe_bankroll)
+    above = cash >= initial
+    units = cash // initial
+
+    cash_out = np.zeros_like(bankroll)
+    cash_out = np.where(above & clear & (bankroll >= units * initial), to_chip_int(bankroll // 2), cash_out)
+    cash_out = np.where(above & ~clear & (bankroll >= (units + 1) * initial), initial, cash_out)
+    cash_out = np.where(~above & ((clear & (bankroll >= initial * 1.5)) | (bankroll >= initial * 3)), initial, cash_out)
+    cash_out = to_chip_int(cash_out)
+
+    cash = cash + cash_out
+    bankroll = bankroll - cash_out
+
+    rebuy = (cash <= initial) & (bankroll < min_bet)
+    amount = np.where(cash >= safe_bankroll, cash // 2, cash)
+    amount = np.where(amount == 0, cash, to_chip_int(amount))
+    amount = np.where(rebuy, amount, 0)
+
+    return cash - amount, bankroll + amount
+
+def make_bet(bankroll: np.ndarray, true_count: np.ndarray, min_bet, risk_cap=0.25, max_bet: Optional[int] = None) -> np.ndarray:
+    # Vectorised AI._make_bet for players that are still at the table.
+    risk = bankroll // min_bet
+    favor_bet = to_chip_int((true_count - 1) * 2 * min_bet)
+    risk_bet = to_chip_int(min_bet * np.ceil(risk * risk_cap))
+
+    spread = np.maximum(min_bet, np.minimum(favor_bet, risk_bet))
+    bet = np.where((risk <= 4) | (true_count <= 1), min_bet, spread).astype(np.int64)
+
+    if max_bet is not None:
+        bet = np.minimum(bet, max_bet)
+    return bet
\ No newline at end of file
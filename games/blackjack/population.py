@@ -0,0 +1,331 @@
+import math
+
+from typing import Iterable, NamedTuple, Optional, Sequence, Union, TYPE_CHECKING
+
+import numpy as np
+
+from components import Symbol
+
+from .player import AI
+from .policy import make_bet, manage_bankroll, to_chip_int
+from .rules import Rules
+
+if TYPE_CHECKING:
+    from components.shuffle import Procedure
+
+    from .tuning import AIConfig
+
+SYMBOLS = [symbol for symbol in Symbol if symbol is not Symbol.JOKER]
+VALUES = np.array([symbol.value for symbol in SYMBOLS], dtype=np.int16)
+ACE = SYMBOLS.index(Symbol.ACE)
+
+HIT, STAND, DOUBLE, SURRENDER = 0, 1, 2, 3
+ACTIONS = {'h': HIT, 's': STAND, 'd': DOUBLE, 'r': SURRENDER}
+
+def count_tags(high_cards: Iterable[Symbol] = AI.high_cards, low_cards: Iterable[Symbol] = AI.low_cards) -> np.ndarray:
+    high_cards, low_cards = list(high_cards), list(low_cards)
+    return np.array([1 if symbol in low_cards else -1 if symbol in high_cards else 0 for symbol in SYMBOLS], dtype=np.int8)
+
+def strategy_table(rules: Rules) -> np.ndarray:
+    # AI.basic_strategy tabulated by [initial, affordable, hard total, ace, dealer upcard].
+    table = np.zeros((2, 2, 22, 2, 12), dtype=np.int8)
+    for initial in (0, 1):
+        options = ['h', 's'] + (['d'] + (['r'] if rules.surrender else []) if initial else [])
+        for affordable in (0, 1):
+            for hand in range(22):
+                for ace in (0, 1):
+                    for dealer in range(2, 12):
+                        table[initial, affordable, hand, ace, dealer] = ACTIONS[AI.basic_strategy(options, hand, bool(ace), dealer, bool(affordable))]
+    return table
+
+class RoundTrace(NamedTuple):
+    # Columns of [table, seat]. Actions are the first decision on a hand, or
+    # -1 when the hand was never played, and net includes surrender refunds.
+    bets: np.ndarray
+    actions: np.ndarray
+    cards: np.ndarray
+    net: np.ndarray
+
+def _totals(hard: np.ndarray, aces: np.ndarray) -> np.ndarray:
+    return np.where(aces & (hard + 10 <= 21), hard + 10, hard)
+
+class Population:
+    def __init__(self, size: int, min_bet: int = 25, cash: Union[int, Sequence[int]] = 1000, safe_bankroll: Union[int, Sequence[int]] = 400, risk_cap: Union[float, Sequence[float]] = 0.25, tags: Optional[np.ndarray] = None, num_decks: int = 8, seats: int = 6, rules: Optional[Rules] = None, max_bet: Optional[int] = None, seed: Optional[int] = None, trace: bool = False, shuffler: Optional['Procedure'] = None):
+        rules = rules or Rules(max_splits=0)
+        if rules.max_splits != 0:
+            raise ValueError(f"The population engine does not split hands, rules must set max_splits=0. Value is {rules.max_splits}.")
+        if size < 1 or seats < 1:
+            raise ValueError(f"A population needs at least one player and one seat per table. Values are {size} and {seats}.")
+
+        self._size = size
+        self._seats = seats
+        self._tables = math.ceil(size / seats)
+        self._min_bet = min_bet
+        self._max_bet = max_bet
+        self._num_decks = num_decks
+        self._rules = rules
+        self._cut_card = rules.cut_card(num_decks)
+        self._strategy = strategy_table(rules)
+
+        # Players are laid out table by table, so player i sits at table
+        # i // seats. The last table is padded with seats that never play.
+        padded = self._tables * seats
+        self._cash = self._column(cash, np.int64)
+        self._initial = self._cash.copy()
+        self._bankroll = np.zeros(padded, dtype=np.int64)
+        self._safe_bankroll = self._column(safe_bankroll, np.int64)
+        self._risk_cap = self._column(risk_cap, np.float64)
+        self._tags = np.zeros((padded, len(SYMBOLS)), dtype=np.int8)
+        self._tags[:size] = count_tags() if tags is None else tags
+        self._running_count = np.zeros(padded, dtype=np.int64)
+        self._true_count = np.zeros(padded, dtype=np.float64)
+        self._decided = np.zeros(padded, dtype=bool)
+        self._active = np.zeros(padded, dtype=bool)
+        self._active[:size] = True
+        self._rounds = np.zeros(padded, dtype=np.int64)
+
+        self._rng = np.random.default_rng(seed)
+        self._shuffler = shuffler
+        shoe = np.tile(np.arange(len(SYMBOLS), dtype=np.int8).repeat(4), num_decks)
+        self._shoes = self._rng.permuted(np.tile(shoe, (self._tables, 1)), axis=1)
+        self._position = np.zeros(self._tables, dtype=np.int64)
+        self._seen = np.zeros(self._tables, dtype=np.int64)
+
+        self._round = 0
+        self._hands = 0
+
+        # With tracing on, play() keeps each round's per hand columns so
+        # another engine can be checked against it hand by hand.
+        self._tracing = trace
+        self._trace: Optional[RoundTrace] = None
+
+    @staticmethod
+    def from_configs(configs: Sequence['AIConfig'], **kwargs) -> 'Population':
+        tags = np.array([count_tags([Symbol[card] for card in config.high_cards], [Symbol[card] for card in config.low_cards]) for config in configs])
+        return Population(
+            len(configs),
+            cash=[config.cash for config in configs],
+            safe_bankroll=[config.safe_bankroll for config in configs],
+            risk_cap=[config.risk_cap for config in configs],
+            tags=tags,
+            **kwargs,
+        )
+
+    def _column(self, value, dtype) -> np.ndarray:
+        column = np.zeros(self._tables * self._seats, dtype=dtype)
+        column[:self._size] = value
+        return column
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def tables(self) -> int:
+        return self._tables
+
+    @property
+    def round(self) -> int:
+        return self._round
+
+    @property
+    def hands(self) -> int:
+        return self._hands
+
+    @property
+    def cash(self) -> np.ndarray:
+        return self._cash[:self._size]
+
+    @property
+    def bankroll(self) -> np.ndarray:
+        return self._bankroll[:self._size]
+
+    @property
+    def wealth(self) -> np.ndarray:
+        return self.cash + self.bankroll
+
+    @property
+    def initial(self) -> np.ndarray:
+        return self._initial[:self._size]
+
+    @property
+    def active(self) -> np.ndarray:
+        return self._active[:self._size]
+
+    @property
+    def rounds(self) -> np.ndarray:
+        return self._rounds[:self._size]
+
+    @property
+    def trace(self) -> Optional['RoundTrace']:
+        return self._trace
+
+    @property
+    def running_count(self) -> np.ndarray:
+        return self._running_count[:self._size]
+
+    @property
+    def true_count(self) -> np.ndarray:
+        return self._true_count[:self._size]
+
+    def _shuffle(self, tables: np.ndarray):
+        # A shuffle procedure works on the shoes as dealt, all tables at once.
+        if self._shuffler is not None:
+            self._shoes[tables] = self._shuffler.apply(self._shoes[tables], self._rng)
+        else:
+            self._shoes[tables] = self._rng.permuted(self._shoes[tables], axis=1)
+
+    def _draw(self, tables: np.ndarray) -> np.ndarray:
+        symbols = self._shoes[tables, self._position[tables]]
+        self._position[tables] += 1
+        return symbols
+
+    def _hit(self, hands: tuple, tables: np.ndarray, seat: int) -> np.ndarray:
+        hard, aces, cards, counts = hands
+        symbols = self._draw(tables)
+        hard[tables, seat] += VALUES[symbols]
+        aces[tables, seat] |= symbols == ACE
+        cards[tables, seat] += 1
+        counts[tables, seat, symbols] += 1
+        return symbols
+
+    def play(self) -> bool:
+        tables, seats = self._tables, self._seats
+
+        # Every AI at a reshuffled table forgets its count, as AI.forget does.
+        reshuffle = self._shoes.shape[1] - self._position < self._cut_card
+        if reshuffle.any():
+            rows = np.flatnonzero(reshuffle)
+            self._shuffle(rows)
+            self._position[rows] = 0
+            self._seen[rows] = 0
+            forget = np.repeat(reshuffle, seats)
+            self._running_count[forget] = 0
+            self._true_count[forget] = 0
+
+        players = np.flatnonzero(self._active)
+        if not players.size:
+            return False
+
+        cash, bankroll = manage_bankroll(self._cash[players], self._bankroll[players], self._initial[players], self._safe_bankroll[players], self._min_bet)
+        leaving = bankroll < self._min_bet
+        bet = np.where(leaving, 0, make_bet(bankroll, self._true_count[players], self._min_bet, self._risk_cap[players], self._max_bet))
+
+        self._cash[players] = np.where(leaving, cash + bankroll, cash)
+        self._bankroll[players] = np.where(leaving, 0, bankroll - bet)
+        self._active[players[leaving]] = False
+
+        bets = np.zeros(tables * seats, dtype=np.int64)
+        bets[players] = bet
+        bets = bets.reshape(tables, seats)
+        bankroll = self._bankroll.reshape(tables, seats)
+
+        playing = bets > 0
+        open_tables = playing.any(axis=1)
+        if not open_tables.any():
+            return False
+
+        # Hands are columns of [table, seat]; the dealer sits in the last column.
+        hard = np.zeros((tables, seats + 1), dtype=np.int16)
+        aces = np.zeros((tables, seats + 1), dtype=bool)
+        cards = np.zeros((tables, seats + 1), dtype=np.int8)
+        counts = np.zeros((tables, seats + 1, len(SYMBOLS)), dtype=np.int16)
+        hands = (hard, aces, cards, counts)
+
+        dealer_rows = np.flatnonzero(open_tables)
+        seat_rows = [np.flatnonzero(playing[:, seat]) for seat in range(seats)]
+
+        upcard = np.zeros(tables, dtype=np.int16)
+        for x in range(2):
+            for seat in range(seats):
+                self._hit(hands, seat_rows[seat], seat)
+            symbols = self._hit(hands, dealer_rows, seats)
+            if x == 0:
+                upcard[dealer_rows] = np.where(symbols == ACE, 11, VALUES[symbols])
+
+        surrendered = np.zeros((tables, seats), dtype=bool)
+        refunds = np.zeros((tables, seats), dtype=np.int64)
+        first = np.full((tables, seats), -1, dtype=np.int8) if self._tracing else None
+        opening = bets.copy() if self._tracing else None
+        for seat in range(seats):
+            rows = seat_rows[seat]
+            initial = 1
+            while rows.size:
+                rows = rows[_totals(hard[rows, seat], aces[rows, seat]) < 21]
+                if not rows.size:
+                    break
+
+                self._decided[rows * seats + seat] = True
+                affordable = bets[rows, seat] <= bankroll[rows, seat]
+                action = self._strategy[initial, affordable.astype(np.intp), hard[rows, seat], aces[rows, seat].astype(np.intp), upcard[rows]]
+                if initial and first is not None:
+                    first[rows, seat] = action
+
+                doubled = rows[action == DOUBLE]
+                bankroll[doubled, seat] -= bets[doubled, seat]
+                bets[doubled, seat] *= 2
+
+                surrender = rows[action == SURRENDER]
+                refunds[surrender, seat] = to_chip_int(bets[surrender, seat] // 2)
+                bankroll[surrender, seat] += refunds[surrender, seat]
+                surrendered[surrender, seat] = True
+
+                self._hit(hands, rows[(action == HIT) | (action == DOUBLE)], seat)
+                rows = rows[action == HIT]
+                initial = 0
+
+        rows = dealer_rows
+        while rows.size:
+            total = _totals(hard[rows, seats], aces[rows, seats])
+            soft = aces[rows, seats] & (hard[rows, seats] + 10 <= 21)
+            rows = rows[(total < 17) | (self._rules.hit_soft_17 & (total == 17) & soft)]
+            self._hit(hands, rows, seats)
+
+        # Surrendered hands leave the table before the AIs remember the cards
+        # in play, so their cards are never counted.
+        settled = playing & ~surrendered
+        seen = (counts[:, :seats] * settled[..., None]).sum(axis=1) + counts[:, seats]
+        self._seen += seen.sum(axis=1)
+
+        counting = self._active.reshape(tables, seats)
+        delta = np.einsum('tsk,tk->ts', self._tags.reshape(tables, seats, -1).astype(np.int64), seen.astype(np.int64))
+        self._running_count += np.where(counting, delta, 0).ravel()
+
+        decks_remaining = np.repeat(self._num_decks - self._seen // 52, seats)
+        remembered = self._active & self._decided
+        self._true_count = np.where(remembered & (decks_remaining > 0), self._running_count / np.maximum(decks_remaining, 1), np.where(remembered, 0.0, self._true_count))
+
+        totals = _totals(hard, aces)
+        naturals = (cards == 2) & (totals == 21)
+        dealer = totals[:, seats:]
+        player = totals[:, :seats]
+
+        lost = (player > 21) | ((dealer <= 21) & (player < dealer))
+        won = ~lost & ((dealer > 21) | (player > dealer))
+        push = ~lost & ~won
+
+        numerator, denominator = self._rules.blackjack_payout
+        bonus = to_chip_int(bets * (numerator - denominator) // denominator)
+        natural = naturals[:, :seats]
+
+        payout = np.where(won, 2 * bets + np.where(natural, bonus, 0), 0)
+        payout += np.where(push, bets + np.where(natural & ~naturals[:, seats:], bonus, 0), 0)
+        bankroll += np.where(settled, payout, 0)
+
+        if self._tracing:
+            net = np.where(settled, payout, refunds) - bets
+            self._trace = RoundTrace(opening, first, cards[:, :seats].copy(), np.where(playing, net, 0))
+
+        self._rounds += playing.ravel()
+        self._hands += int(playing.sum())
+        self._round += 1
+        return True
+
+    def run(self, rounds: int) -> int:
+        played = 0
+        while played < rounds and self.play():
+            played += 1
+        return played
+
+    def __repr__(self):
+        return f"Population(size={self._size}, tables={self._tables}, round={self._round}, active={int(self.active.sum())})"
\ No newline at end of file
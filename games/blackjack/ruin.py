@@ -0,0 +1,146 @@
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from components import Chip
+
+from .policy import BankrollPolicy, make_bet, manage_bankroll
+
+class OutcomeDistribution:
+    def __init__(self, multipliers: np.ndarray, probabilities: Optional[np.ndarray] = None, true_counts: Optional[np.ndarray] = None, normal: Optional[Tuple[float, float]] = None):
+        self._multipliers = np.asarray(multipliers, dtype=np.float64)
+        self._probabilities = None if probabilities is None else np.asarray(probabilities, dtype=np.float64)
+        self._true_counts = None if true_counts is None else np.asarray(true_counts, dtype=np.float64)
+        self._normal = normal
+
+        if self._true_counts is not None and len(self._true_counts) != len(self._multipliers):
+            raise ValueError("True counts must pair one to one with outcome multipliers.")
+
+    @property
+    def mean(self) -> float:
+        if self._normal is not None:
+            return self._normal[0]
+        return float(np.average(self._multipliers, weights=self._probabilities))
+
+    @property
+    def variance(self) -> float:
+        if self._normal is not None:
+            return self._normal[1]
+        return float(np.average((self._multipliers - self.mean) ** 2, weights=self._probabilities))
+
+    def sample(self, rng: np.random.Generator, size: Tuple[int, ...]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        if self._normal is not None:
+            mean, variance = self._normal
+            return rng.normal(mean, np.sqrt(variance), size), None
+
+        index = rng.choice(len(self._multipliers), size=size, p=self._probabilities)
+        return self._multipliers[index], None if self._true_counts is None else self._true_counts[index]
+
+    @staticmethod
+    def empirical(nets: Iterable[float], bets: Iterable[float], true_counts: Optional[Iterable[float]] = None) -> 'OutcomeDistribution':
+        multipliers = np.asarray(nets, dtype=np.float64) / np.asarray(bets, dtype=np.float64)
+        if true_counts is not None:
+            return OutcomeDistribution(multipliers, true_counts=np.nan_to_num(np.asarray(true_counts, dtype=np.float64)))
+
+        values, counts = np.unique(multipliers, return_counts=True)
+        return OutcomeDistribution(values, counts / counts.sum())
+
+    @staticmethod
+    def fitted(mean: float, variance: float) -> 'OutcomeDistribution':
+        if variance < 0:
+            raise ValueError("Outcome variance cannot be negative.")
+        return OutcomeDistribution(np.array([mean]), normal=(mean, variance))
+
+    @staticmethod
+    def from_columns(columns: Dict[str, np.ndarray], with_counts: bool = True) -> 'OutcomeDistribution':
+        # Sink rows are hands. A round's outcome for a player is the net of
+        # every hand they played, doubles and splits included, over the
+        # wager they opened with.
+        played = columns['bet'] > 0
+        rounds, seats = columns['round'][played], columns['seat'][played]
+        keys, first, group = np.unique(np.stack((rounds, seats.astype(rounds.dtype))), axis=1, return_index=True, return_inverse=True)
+
+        nets = np.bincount(group.ravel(), weights=columns['net'][played], minlength=keys.shape[1])
+        bets = columns['bet'][played][first]
+        counts = columns['true_count'][played][first] if with_counts else None
+        return OutcomeDistribution.empirical(nets, bets, counts)
+
+class RuinEstimate(NamedTuple):
+    paths: int
+    rounds: int
+    ruined: np.ndarray
+    left: np.ndarray
+    times: np.ndarray
+    wealth: np.ndarray
+
+    @property
+    def probability(self) -> float:
+        return float(self.ruined.mean())
+
+    @property
+    def left_probability(self) -> float:
+        return float(self.left.mean())
+
+    def time_percentiles(self, qs: Iterable[float] = (0.05, 0.25, 0.5, 0.75, 0.95)) -> Dict[float, float]:
+        times = self.times[self.ruined]
+        if not len(times):
+            return {}
+        return {q: float(np.quantile(times, q)) for q in qs}
+
+    def __str__(self):
+        percentiles = ", ".join(f"p{int(q * 100)}={value:.0f}" for q, value in self.time_percentiles().items())
+        return f"RuinEstimate(paths={self.paths}, rounds={self.rounds}, ruin={self.probability:.2%}, left={self.left_probability:.2%}{', ' + percentiles if percentiles else ''})"
+
+def estimate_ruin(policy: BankrollPolicy, outcomes: OutcomeDistribution, paths: int = 10000, rounds: int = 100000, seed: Optional[int] = None, block: int = 256) -> RuinEstimate:
+    rng = np.random.default_rng(seed)
+    unit = Chip.min_value()
+
+    cash = np.full(paths, policy.initial, dtype=np.int64)
+    bankroll = np.zeros(paths, dtype=np.int64)
+    ruined = np.zeros(paths, dtype=bool)
+    left = np.zeros(paths, dtype=bool)
+    times = np.full(paths, rounds, dtype=np.int64)
+
+    # Only paths still at the table are simulated; finished paths are
+    # compacted out so late rounds cost as little as the survivors.
+    active = np.arange(paths)
+    a_cash, a_bank = cash.copy(), bankroll.copy()
+    played = 0
+
+    while played < rounds and len(active):
+        steps = min(block, rounds - played)
+        multipliers, counts = outcomes.sample(rng, (steps, len(active)))
+
+        for step in range(steps):
+            a_cash, a_bank = manage_bankroll(a_cash, a_bank, policy.initial, policy.safe_bankroll, policy.min_bet)
+
+            leaving = a_bank < policy.min_bet
+            if leaving.any():
+                gone = active[leaving]
+                cash[gone] = a_cash[leaving] + a_bank[leaving]
+                times[gone] = played + step
+                ruined[gone] = cash[gone] < policy.min_bet
+                left[gone] = ~ruined[gone]
+
+                staying = ~leaving
+                active, a_cash, a_bank = active[staying], a_cash[staying], a_bank[staying]
+                multipliers = multipliers[:, staying]
+                counts = None if counts is None else counts[:, staying]
+
+                if not len(active):
+                    break
+
+            true_count = counts[step] if counts is not None else 0
+            bet = make_bet(a_bank, true_count, policy.min_bet, policy.risk_cap, policy.max_bet)
+
+            # Stochastic rounding to the chip unit keeps each payout unbiased,
+            # where flooring would cost half a unit a round on fitted outcomes.
+            net = np.floor(bet * multipliers[step] / unit + rng.random(len(active))).astype(np.int64) * unit
+            a_bank = a_bank + np.maximum(net, -a_bank)
+
+        played += steps
+
+    cash[active] = a_cash
+    bankroll[active] = a_bank
+
+    return RuinEstimate(paths, played, ruined, left, times, cash + bankroll)
\ No newline at end of file
@@ -0,0 +1,44 @@
+import math
+
+from typing import NamedTuple, Optional, Tuple
+
+class Rules(NamedTuple):
+    hit_soft_17: bool = False
+    blackjack_payout: Tuple[int, int] = (3, 2)
+    surrender: bool = True
+    double_after_split: bool = True
+    resplit_aces: bool = True
+    split_by_value: bool = False
+    max_splits: Optional[int] = None
+    penetration: float = 5 / 16
+
+    def cut_card(self, num_decks: int) -> int:
+        if not 0 < self.penetration < 1:
+            raise ValueError(f"Penetration must be between 0 and 1, Value is {self.penetration}.")
+        return math.ceil(num_decks * 52 * (1 - self.penetration))
+
+    def blackjack_bonus(self, bet: int) -> int:
+        numerator, denominator = self.blackjack_payout
+        return bet * (numerator - denominator) // denominator
+
+    @property
+    def label(self) -> str:
+        numerator, denominator = self.blackjack_payout
+        parts = [
+            "H17" if self.hit_soft_17 else "S17",
+            f"{numerator}:{denominator}",
+            "LS" if self.surrender else "NS",
+            "DAS" if self.double_after_split else "NDAS",
+            "RSA" if self.resplit_aces else "NRSA",
+        ]
+
+        if self.split_by_value:
+            parts.append("SPV")
+        if self.max_splits is not None:
+            parts.append(f"SP{self.max_splits}")
+
+        parts.append(f"PEN{self.penetration:.2f}")
+        return " ".join(parts)
+
+    def __str__(self):
+        return f"Rules({self.label})"
\ No newline at end of file
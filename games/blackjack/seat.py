@@ -1,15 +1,32 @@
 from typing import Optional
 from components import Seat, Player, Deck, Pot
 
+# The dealer's position in event and result seat fields.
+DEALER = -1
+
 class BlackJackSeat(Seat):
-    def __init__(self, player: Optional[Player] = None):
+    __slots__ = ('_cards', '_position', '_hand')
+
+    # Position is the seat's place at the table, and hand counts the hands
+    # split off it this round, so (position, hand) names a hand across runs.
+    def __init__(self, player: Optional[Player] = None, position: int = 0, hand: int = 0):
         super().__init__(player)
         self._cards = Deck()
+        self._position = position
+        self._hand = hand
 
     @property
     def cards(self):
         return self._cards
 
+    @property
+    def position(self) -> int:
+        return self._position
+
+    @property
+    def hand(self) -> int:
+        return self._hand
+
     def leave(self) -> bool:
         if len(self._cards) > 0:
             raise Exception(f"Player({self._player.name}) still has cards. Please discard them before leaving.")
@@ -0,0 +1,157 @@
+import json
+import os
+
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+Row = Tuple[int, int, int, float, int, int, int]
+
+class RoundSink:
+    columns: Dict[str, str] = {
+        'round': 'int64',
+        'seat': 'int16',
+        'bet': 'int32',
+        'true_count': 'float32',
+        'dealer_upcard': 'int8',
+        'outcome': 'int8',
+        'net': 'int32',
+    }
+    _row_dtype = np.dtype(list(columns.items()))
+
+    def __init__(self, directory: str, capacity: int = 1 << 20, batch_size: int = 4096):
+        if capacity < 1 or batch_size < 1:
+            raise ValueError("Sink capacity and batch size must be positive.")
+
+        self._directory = directory
+        self._batch_size = batch_size
+        self._rows: List[Row] = []
+        self._length = 0
+
+        os.makedirs(directory, exist_ok=True)
+        meta = self._meta_path(directory)
+        if os.path.exists(meta):
+            with open(meta) as file:
+                self._length = json.load(file)['length']
+
+        self._capacity = max(capacity, self._length)
+        self._maps = {name: self._map(name, dtype, self._capacity) for name, dtype in self.columns.items()}
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def length(self) -> int:
+        return self._length + len(self._rows)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def append(self, row: Row):
+        self._rows.append(row)
+        if len(self._rows) >= self._batch_size:
+            self.flush()
+
+    def extend(self, rows: Iterable[Row]):
+        self._rows.extend(rows)
+        if len(self._rows) >= self._batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+
+        batch = np.array(self._rows, dtype=self._row_dtype)
+        self._rows.clear()
+
+        end = self._length + len(batch)
+        if end > self._capacity:
+            self._grow(end)
+
+        for name, column in self._maps.items():
+            column[self._length:end] = batch[name]
+
+        self._length = end
+        self._write_meta()
+
+    def rewind(self, length: int):
+        if length > self.length:
+            raise ValueError(f"Cannot rewind a sink of {self.length} rows forward to {length}.")
+
+        self.flush()
+        self._length = length
+        self._write_meta()
+
+    def close(self):
+        self.flush()
+        for column in self._maps.values():
+            column.flush()
+        self._maps.clear()
+
+        # Trim the preallocated tail so the files on disk are exactly the
+        # rows written; reopening the sink grows them again.
+        for name, dtype in self.columns.items():
+            with open(self._column_path(self._directory, name), 'r+b') as file:
+                file.truncate(self._length * np.dtype(dtype).itemsize)
+        self._capacity = self._length
+
+    def _grow(self, needed: int):
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+
+        for column in self._maps.values():
+            column.flush()
+        self._maps.clear()
+
+        self._maps = {name: self._map(name, dtype, capacity) for name, dtype in self.columns.items()}
+        self._capacity = capacity
+
+    def _map(self, name: str, dtype: str, capacity: int) -> np.memmap:
+        path = self._column_path(self._directory, name)
+        size = capacity * np.dtype(dtype).itemsize
+
+        with open(path, 'ab') as file:
+            if file.tell() < size:
+                file.truncate(size)
+
+        return np.memmap(path, dtype=dtype, mode='r+', shape=(capacity,))
+
+    def _write_meta(self):
+        meta = self._meta_path(self._directory)
+        with open(f"{meta}.tmp", 'w') as file:
+            json.dump({'length': self._length, 'columns': self.columns}, file)
+        os.replace(f"{meta}.tmp", meta)
+
+    @staticmethod
+    def _column_path(directory: str, name: str) -> str:
+        return os.path.join(directory, f"{name}.bin")
+
+    @staticmethod
+    def _meta_path(directory: str) -> str:
+        return os.path.join(directory, "meta.json")
+
+    @staticmethod
+    def open(directory: str) -> Dict[str, np.ndarray]:
+        with open(RoundSink._meta_path(directory)) as file:
+            meta = json.load(file)
+
+        length = meta['length']
+        if not length:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in meta['columns'].items()}
+
+        return {
+            name: np.memmap(RoundSink._column_path(directory, name), dtype=dtype, mode='r', shape=(length,))
+            for name, dtype in meta['columns'].items()
+        }
+
+    def __enter__(self) -> 'RoundSink':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"RoundSink(directory={self._directory}, rows={self.length}, capacity={self._capacity})"
\ No newline at end of file
@@ -0,0 +1,385 @@
+import math
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from components import Player
+
+from .player import AI
+
+class RunningMoments:
+    __slots__ = ('_count', '_mean', '_m2', '_min', '_max')
+
+    def __init__(self):
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self._count - 1) if self._count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def min(self) -> float:
+        return self._min
+
+    @property
+    def max(self) -> float:
+        return self._max
+
+    def push(self, value: float):
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+
+        if value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+
+    def merge(self, other: 'RunningMoments') -> 'RunningMoments':
+        if not other._count:
+            return self
+        if not self._count:
+            self._count, self._mean, self._m2, self._min, self._max = other._count, other._mean, other._m2, other._min, other._max
+            return self
+
+        count = self._count + other._count
+        delta = other._mean - self._mean
+        self._mean += delta * other._count / count
+        self._m2 += other._m2 + delta * delta * self._count * other._count / count
+        self._count = count
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        return self
+
+    def __repr__(self):
+        return f"RunningMoments(count={self._count}, mean={self._mean:.4f}, std={self.std:.4f})"
+
+class QuantileSketch:
+    __slots__ = ('_accuracy', '_gamma', '_log_gamma', '_max_bins', '_positive', '_negative', '_zero', '_count')
+
+    def __init__(self, accuracy: float = 0.01, max_bins: int = 2048):
+        if not 0 < accuracy < 1:
+            raise ValueError(f"Sketch accuracy must be between 0 and 1, Value is {accuracy}.")
+
+        self._accuracy = accuracy
+        self._gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._max_bins = max_bins
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {}
+        self._zero = 0
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def add(self, value: float, weight: int = 1):
+        self._count += weight
+
+        if value > 0:
+            store = self._positive
+        elif value < 0:
+            store = self._negative
+            value = -value
+        else:
+            self._zero += weight
+            return
+
+        key = math.ceil(math.log(value) / self._log_gamma)
+        store[key] = store.get(key, 0) + weight
+
+        if len(self._positive) + len(self._negative) > self._max_bins:
+            self._collapse()
+
+    def _collapse(self):
+        # Fold the smallest magnitudes together; their relative error grows
+        # first, which keeps the tails of the distribution exact.
+        store = self._positive if len(self._positive) >= len(self._negative) else self._negative
+        lowest, second = sorted(store)[:2]
+        store[second] += store.pop(lowest)
+
+    def _value(self, key: int) -> float:
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile must be between 0 and 1, Value is {q}.")
+        if not self._count:
+            return None
+
+        rank = q * (self._count - 1)
+        seen = 0
+
+        for key in sorted(self._negative, reverse=True):
+            seen += self._negative[key]
+            if seen > rank:
+                return -self._value(key)
+
+        seen += self._zero
+        if seen > rank:
+            return 0.0
+
+        for key in sorted(self._positive):
+            seen += self._positive[key]
+            if seen > rank:
+                return self._value(key)
+
+        return self._value(max(self._positive)) if self._positive else 0.0
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        if other._gamma != self._gamma:
+            raise ValueError("Cannot merge sketches with different accuracies.")
+
+        for key, count in other._positive.items():
+            self._positive[key] = self._positive.get(key, 0) + count
+        for key, count in other._negative.items():
+            self._negative[key] = self._negative.get(key, 0) + count
+
+        self._zero += other._zero
+        self._count += other._count
+
+        while len(self._positive) + len(self._negative) > self._max_bins:
+            self._collapse()
+        return self
+
+    def __repr__(self):
+        return f"QuantileSketch(count={self._count}, bins={len(self._positive) + len(self._negative)}, accuracy={self._accuracy})"
+
+class Trajectory:
+    __slots__ = ('_epoch', '_max_epochs', '_accuracy', '_sketches', '_rounds')
+
+    def __init__(self, epoch: int = 1000, max_epochs: int = 64, accuracy: float = 0.01):
+        if epoch < 1 or max_epochs < 2:
+            raise ValueError("A trajectory needs an epoch of at least one round and at least two epochs.")
+
+        self._epoch = epoch
+        self._max_epochs = max_epochs
+        self._accuracy = accuracy
+        self._sketches: List[QuantileSketch] = []
+        self._rounds = 0
+
+    @property
+    def epoch(self) -> int:
+        return self._epoch
+
+    @property
+    def rounds(self) -> int:
+        return self._rounds
+
+    def add(self, value: float):
+        index = self._rounds // self._epoch
+        if index >= self._max_epochs:
+            self._coarsen()
+            index = self._rounds // self._epoch
+
+        while len(self._sketches) <= index:
+            self._sketches.append(QuantileSketch(self._accuracy))
+
+        self._sketches[index].add(value)
+        self._rounds += 1
+
+    def _coarsen(self):
+        self._sketches = self._pairwise(self._sketches)
+        self._epoch *= 2
+
+    @staticmethod
+    def _pairwise(sketches: List[QuantileSketch]) -> List[QuantileSketch]:
+        merged = []
+        for index in range(0, len(sketches), 2):
+            sketch = sketches[index]
+            if index + 1 < len(sketches):
+                sketch.merge(sketches[index + 1])
+            merged.append(sketch)
+        return merged
+
+    def percentiles(self, qs: Iterable[float] = (0.05, 0.5, 0.95)) -> List[Tuple[int, List[Optional[float]]]]:
+        qs = list(qs)
+        return [(index * self._epoch, [sketch.quantile(q) for q in qs]) for index, sketch in enumerate(self._sketches)]
+
+    def merge(self, other: 'Trajectory') -> 'Trajectory':
+        other_sketches = [QuantileSketch(self._accuracy).merge(sketch) for sketch in other._sketches]
+        other_epoch = other._epoch
+
+        while self._epoch < other_epoch:
+            self._coarsen()
+        while other_epoch < self._epoch:
+            other_sketches = self._pairwise(other_sketches)
+            other_epoch *= 2
+
+        if self._epoch != other_epoch:
+            raise ValueError(f"Cannot align trajectories with epochs {self._epoch} and {other._epoch}.")
+
+        while len(self._sketches) < len(other_sketches):
+            self._sketches.append(QuantileSketch(self._accuracy))
+        for sketch, incoming in zip(self._sketches, other_sketches):
+            sketch.merge(incoming)
+
+        self._rounds = max(self._rounds, other._rounds)
+        while len(self._sketches) > self._max_epochs:
+            self._coarsen()
+        return self
+
+class BankrollStats:
+    def __init__(self, name: str, count_range: int = 10, epoch: int = 1000, max_epochs: int = 64, accuracy: float = 0.01):
+        self._name = name
+        self._count_range = count_range
+        self._accuracy = accuracy
+
+        self.net = RunningMoments()
+        self.net_sketch = QuantileSketch(accuracy)
+        self.wealth = RunningMoments()
+        self.trajectory = Trajectory(epoch, max_epochs, accuracy)
+        self.by_count: Dict[int, RunningMoments] = {}
+        self.by_count_sketch: Dict[int, QuantileSketch] = {}
+
+        self._rounds = 0
+        self._peak: Optional[int] = None
+        self._max_drawdown = 0
+        self._ruined_at: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def rounds(self) -> int:
+        return self._rounds
+
+    @property
+    def max_drawdown(self) -> int:
+        return self._max_drawdown
+
+    @property
+    def ruined_at(self) -> Optional[int]:
+        return self._ruined_at
+
+    def count_bucket(self, true_count: float) -> int:
+        return max(-self._count_range, min(self._count_range, math.floor(true_count)))
+
+    def record(self, wealth: int, net: int, true_count: Optional[float] = None, ruined: bool = False):
+        self._rounds += 1
+
+        self.net.push(net)
+        self.net_sketch.add(net)
+        self.wealth.push(wealth)
+        self.trajectory.add(wealth)
+
+        if true_count is not None:
+            bucket = self.count_bucket(true_count)
+            if bucket not in self.by_count:
+                self.by_count[bucket] = RunningMoments()
+                self.by_count_sketch[bucket] = QuantileSketch(self._accuracy)
+            self.by_count[bucket].push(net)
+            self.by_count_sketch[bucket].add(net)
+
+        if self._peak is None or wealth > self._peak:
+            self._peak = wealth
+        self._max_drawdown = max(self._max_drawdown, self._peak - wealth)
+
+        if ruined and self._ruined_at is None:
+            self._ruined_at = self._rounds
+
+    def merge(self, other: 'BankrollStats') -> 'BankrollStats':
+        self.net.merge(other.net)
+        self.net_sketch.merge(other.net_sketch)
+        self.wealth.merge(other.wealth)
+        self.trajectory.merge(other.trajectory)
+
+        for bucket, moments in other.by_count.items():
+            self.by_count.setdefault(bucket, RunningMoments()).merge(moments)
+            self.by_count_sketch.setdefault(bucket, QuantileSketch(self._accuracy)).merge(other.by_count_sketch[bucket])
+
+        self._rounds += other._rounds
+        self._max_drawdown = max(self._max_drawdown, other._max_drawdown)
+        if other._peak is not None:
+            self._peak = other._peak if self._peak is None else max(self._peak, other._peak)
+
+        ruins = [ruin for ruin in (self._ruined_at, other._ruined_at) if ruin is not None]
+        self._ruined_at = min(ruins) if ruins else None
+        return self
+
+    def __str__(self):
+        low, median, high = (self.trajectory.percentiles((0.05, 0.5, 0.95))[-1][1] if self._rounds else [None] * 3)
+        ruin = f"round {self._ruined_at}" if self._ruined_at is not None else "never"
+        return (
+            f"{self._name}: rounds={self._rounds}, net/round={self.net.mean:.2f} (sd {self.net.std:.2f}), "
+            f"max drawdown=${self._max_drawdown}, ruined={ruin}, "
+            f"recent bankroll p5/p50/p95=${low or 0:.0f}/${median or 0:.0f}/${high or 0:.0f}"
+        )
+
+class BankrollAggregator:
+    def __init__(self, count_range: int = 10, epoch: int = 1000, max_epochs: int = 64, accuracy: float = 0.01):
+        self._options = (count_range, epoch, max_epochs, accuracy)
+        self._stats: Dict[str, BankrollStats] = {}
+        self._wealth: Dict[str, int] = {}
+        self._ruin_times = QuantileSketch(accuracy)
+
+    @property
+    def players(self) -> Dict[str, BankrollStats]:
+        return self._stats
+
+    @property
+    def ruin_times(self) -> QuantileSketch:
+        return self._ruin_times
+
+    def stats(self, name: str) -> BankrollStats:
+        if name not in self._stats:
+            self._stats[name] = BankrollStats(name, *self._options)
+        return self._stats[name]
+
+    def record(self, name: str, wealth: int, true_count: Optional[float] = None, ruin_below: int = 0):
+        stats = self.stats(name)
+        net = wealth - self._wealth.get(name, wealth)
+        self._wealth[name] = wealth
+
+        ruined = stats.ruined_at is None and wealth < ruin_below
+        stats.record(wealth, net, true_count, ruined)
+        if ruined:
+            self._ruin_times.add(stats.ruined_at)
+
+    def observe(self, table, players: Optional[Iterable[Player]] = None):
+        # Each round's net is filed under the count the AI placed its bet
+        # at, which a reshuffle between rounds does not disturb.
+        for player in (players if players is not None else table.players):
+            wealth = player.cash + player.bankroll.total
+
+            if player.name not in self._wealth:
+                self._wealth[player.name] = wealth
+                continue
+
+            if self.stats(player.name).ruined_at is not None:
+                continue
+
+            self.record(player.name, wealth, player.bet_count if isinstance(player, AI) else None, table.min_bet)
+
+    def merge(self, other: 'BankrollAggregator') -> 'BankrollAggregator':
+        for name, stats in other._stats.items():
+            if name in self._stats:
+                self._stats[name].merge(stats)
+            else:
+                self._stats[name] = stats
+        self._ruin_times.merge(other._ruin_times)
+        return self
+
+    def report(self) -> str:
+        lines = [str(stats) for stats in self._stats.values()]
+        if self._ruin_times.count:
+            lines.append(f"Time to ruin p5/p50/p95: {self._ruin_times.quantile(0.05):.0f}/{self._ruin_times.quantile(0.5):.0f}/{self._ruin_times.quantile(0.95):.0f} rounds")
+        return "\n".join(lines)
\ No newline at end of file
@@ -0,0 +1,400 @@
+import json
+import struct
+
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from components import Card, Suit, Symbol
+from components.events import Event, Subscriber
+from components.poker import decode as decode_card, encode as encode_card
+
+from .events import Kind
+
+Message = Union[bytes, str]
+Observer = Callable[[Message], Any]
+Op = Tuple[int, int, int, Union[int, str]]
+
+DELTA, KEYFRAME = 0, 1
+DEALER = 0
+HIDDEN = 255
+
+# Every change to a table is one (op, slot, hand, value) tuple. Slot 0 is the
+# dealer and a player's slot is their table position plus one.
+ROUND = 0
+JOIN = 1
+LEAVE = 2
+CASH = 3
+BANKROLL = 4
+BET = 5
+CARD = 6
+REVEAL = 7
+SPLIT = 8
+INSURANCE = 9
+PAYOUT = 10
+CLEAR = 11
+
+_header = struct.Struct('<BHIIH')
+_op = struct.Struct('<BBBi')
+_codes = {(symbol, suit): encode_card(Card(symbol, suit)) for suit in Suit for symbol in Symbol if symbol is not Symbol.JOKER}
+
+class Frame(NamedTuple):
+    kind: int
+    table: int
+    seq: int
+    round: int
+    ops: List[Op]
+
+class Hand:
+    __slots__ = ('bet', 'cards', 'net')
+
+    def __init__(self, bet: int = 0):
+        self.bet = bet
+        self.cards: List[int] = []
+        self.net: Optional[int] = None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Hand):
+            return NotImplemented
+        return (self.bet, self.cards, self.net) == (other.bet, other.cards, other.net)
+
+    def __repr__(self):
+        return f"Hand(bet=${self.bet}.00, cards={[decode_card(code).name if code != HIDDEN else '?' for code in self.cards]}, net={self.net})"
+
+class TableState:
+    # The state both ends of a stream agree on: the publisher applies each op
+    # as it sends it, a spectator applies it as it arrives.
+    def __init__(self):
+        self.round = 0
+        self.names: Dict[int, str] = {}
+        self.cash: Dict[int, int] = {}
+        self.bankroll: Dict[int, int] = {}
+        self.insurance: Dict[int, int] = {}
+        self.hands: Dict[int, List[Hand]] = {}
+
+    def apply(self, op: int, slot: int, hand: int, value: Union[int, str]):
+        if op == CARD:
+            self.hands.setdefault(slot, [Hand()])[hand].cards.append(value)
+        elif op == BET:
+            hands = self.hands.setdefault(slot, [])
+            while len(hands) <= hand:
+                hands.append(Hand())
+            hands[hand].bet = value
+        elif op == PAYOUT:
+            self.hands[slot][hand].net = value
+        elif op == SPLIT:
+            hands = self.hands[slot]
+            source = hands[value]
+            hands.insert(hand, Hand(source.bet))
+            hands[hand].cards.append(source.cards.pop())
+        elif op == REVEAL:
+            self.hands[slot][0].cards[hand] = value
+        elif op == INSURANCE:
+            self.insurance[slot] = value
+        elif op == CASH:
+            self.cash[slot] = value
+        elif op == BANKROLL:
+            self.bankroll[slot] = value
+        elif op == ROUND:
+            self.round = value
+        elif op == CLEAR:
+            self.hands.clear()
+            self.insurance.clear()
+        elif op == JOIN:
+            self.names[slot] = value
+        elif op == LEAVE:
+            for table in (self.names, self.cash, self.bankroll, self.insurance, self.hands):
+                table.pop(slot, None)
+        else:
+            raise ValueError(f"Unknown stream op {op}.")
+
+    def ops(self) -> List[Op]:
+        ops: List[Op] = [(ROUND, 0, 0, self.round)]
+        for slot, name in self.names.items():
+            ops.append((JOIN, slot, 0, name))
+            ops.append((CASH, slot, 0, self.cash.get(slot, 0)))
+            ops.append((BANKROLL, slot, 0, self.bankroll.get(slot, 0)))
+        for slot, amount in self.insurance.items():
+            ops.append((INSURANCE, slot, 0, amount))
+        for slot, hands in self.hands.items():
+            for index, hand in enumerate(hands):
+                ops.append((BET, slot, index, hand.bet))
+                ops.extend((CARD, slot, index, code) for code in hand.cards)
+                if hand.net is not None:
+                    ops.append((PAYOUT, slot, index, hand.net))
+        return ops
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TableState):
+            return NotImplemented
+        return (self.round, self.names, self.cash, self.bankroll, self.insurance, self.hands) == (other.round, other.names, other.cash, other.bankroll, other.insurance, other.hands)
+
+    def __repr__(self):
+        return f"TableState(round={self.round}, players={list(self.names.values())}, hands={self.hands})"
+
+def encode(frame: Frame, binary: bool = True) -> Message:
+    if not binary:
+        return json.dumps(list(frame), separators=(',', ':'))
+
+    parts = [_header.pack(frame.kind, frame.table, frame.seq, frame.round, len(frame.ops))]
+    for op, slot, hand, value in frame.ops:
+        if op == JOIN:
+            name = value.encode()
+            parts.append(_op.pack(op, slot, hand, len(name)))
+            parts.append(name)
+        else:
+            parts.append(_op.pack(op, slot, hand, value))
+    return b"".join(parts)
+
+def decode(message: Message) -> Frame:
+    if isinstance(message, str):
+        kind, table, seq, round, ops = json.loads(message)
+        return Frame(kind, table, seq, round, [tuple(op) for op in ops])
+
+    kind, table, seq, round, count = _header.unpack_from(message)
+    offset = _header.size
+    ops: List[Op] = []
+    for _ in range(count):
+        op, slot, hand, value = _op.unpack_from(message, offset)
+        offset += _op.size
+        if op == JOIN:
+            value, offset = bytes(message[offset:offset + value]).decode(), offset + value
+        ops.append((op, slot, hand, value))
+    return Frame(kind, table, seq, round, ops)
+
+class StateStream(Subscriber):
+    kinds = frozenset((
+        Kind.JOIN, Kind.LEAVE, Kind.ROUND_START, Kind.BET, Kind.CARD, Kind.INSURANCE, Kind.ACTION,
+        Kind.SPLIT, Kind.REVEAL, Kind.RESULT, Kind.PLAYER, Kind.ROUND_END,
+    ))
+
+    # Turns one table's events into delta frames. Ops are batched until the
+    # round ends or the bus is flushed, and every keyframe_every rounds a
+    # keyframe carrying the whole table state is sent after the delta.
+    def __init__(self, hub: 'StreamHub', table: int, dealer: int, keyframe_every: int = 32, round: int = 0):
+        if keyframe_every < 1:
+            raise ValueError(f"Keyframes must be sent at least every round, Value is {keyframe_every}.")
+
+        self._hub = hub
+        self._table = table
+        self._dealer = dealer
+        self._keyframe_every = keyframe_every
+
+        self._state = TableState()
+        self._state.round = round
+        self._hands: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        self._ops: List[Op] = []
+        self._seq = 0
+        self._rounds = 0
+
+    @property
+    def table(self) -> int:
+        return self._table
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    @property
+    def state(self) -> TableState:
+        return self._state
+
+    def _push(self, op: int, slot: int, hand: int, value: Union[int, str]):
+        self._state.apply(op, slot, hand, value)
+        self._ops.append((op, slot, hand, value))
+
+    def _slot(self, position: int, name: str) -> int:
+        slot = position + 1
+        if not 0 < slot < HIDDEN:
+            raise ValueError(f"A stream can follow table positions 0 to {HIDDEN - 2}, Value is {position}.")
+        if self._state.names.get(slot) != name:
+            if slot in self._state.names:
+                self._push(LEAVE, slot, 0, 0)
+            self._push(JOIN, slot, 0, name)
+        return slot
+
+    def join(self, position: int, name: str, cash: int, bankroll: int):
+        slot = self._slot(position, name)
+        if self._state.cash.get(slot) != cash:
+            self._push(CASH, slot, 0, cash)
+        if self._state.bankroll.get(slot) != bankroll:
+            self._push(BANKROLL, slot, 0, bankroll)
+
+    def handle(self, event: Event):
+        kind, data = event.kind, event.data
+        seat = (event.seat, event.hand)
+
+        if kind == Kind.CARD:
+            if event.seat == self._dealer:
+                self._push(CARD, DEALER, 0, HIDDEN if data['hidden'] else _codes[data['card'].symbol, data['card'].suit])
+            else:
+                slot, hand = self._hands[seat]
+                self._push(CARD, slot, hand, _codes[data['card'].symbol, data['card'].suit])
+        elif kind == Kind.ACTION:
+            if data['action'] == 'd':
+                slot, hand = self._hands[seat]
+                self._push(BET, slot, hand, self._state.hands[slot][hand].bet * 2)
+        elif kind == Kind.BET:
+            slot = self._slot(event.seat, event.player)
+            self._hands[seat] = (slot, 0)
+            self._push(BET, slot, 0, data['amount'])
+        elif kind == Kind.RESULT:
+            slot, hand = self._hands[seat]
+            self._push(PAYOUT, slot, hand, data['net'])
+        elif kind == Kind.SPLIT:
+            slot, hand = self._hands[seat]
+            # The engine plays the new hand straight after the one it came from.
+            split = (event.seat, data['split'])
+            for key, (other, index) in self._hands.items():
+                if other == slot and index > hand:
+                    self._hands[key] = (other, index + 1)
+            self._hands[split] = (slot, hand + 1)
+            self._push(SPLIT, slot, hand + 1, hand)
+        elif kind == Kind.REVEAL:
+            self._push(REVEAL, DEALER, self._state.hands[DEALER][0].cards.index(HIDDEN), _codes[data['card'].symbol, data['card'].suit])
+        elif kind == Kind.INSURANCE:
+            self._push(INSURANCE, self._slot(event.seat, event.player), 0, data['amount'])
+        elif kind == Kind.PLAYER:
+            self.join(event.seat, event.player, data['cash'], data['bankroll'])
+        elif kind == Kind.ROUND_START:
+            self._push(ROUND, 0, 0, event.round)
+        elif kind == Kind.ROUND_END:
+            self._push(CLEAR, 0, 0, 0)
+            self._hands.clear()
+            self.flush()
+            self._rounds += 1
+            if self._rounds % self._keyframe_every == 0:
+                self.keyframe()
+        elif kind == Kind.JOIN:
+            self.join(event.seat, event.player, data['cash'], data['bankroll'])
+        elif kind == Kind.LEAVE:
+            if event.seat + 1 in self._state.names:
+                self._push(LEAVE, event.seat + 1, 0, 0)
+
+    def _send(self, kind: int, ops: List[Op]):
+        self._seq += 1
+        self._hub.publish(Frame(kind, self._table, self._seq, self._state.round, ops))
+
+    def flush(self):
+        if self._ops:
+            ops, self._ops = self._ops, []
+            self._send(DELTA, ops)
+
+    def keyframe(self):
+        self.flush()
+        self._send(KEYFRAME, self._state.ops())
+
+class StreamHub:
+    # Frames are encoded once and the same message is handed to every
+    # observer of the table. The hub keeps each table's latest keyframe and
+    # the deltas since, so a late or lagging observer can catch up.
+    def __init__(self, binary: bool = True, keyframe_every: int = 32):
+        self._binary = binary
+        self._keyframe_every = keyframe_every
+        self._streams: Dict[int, StateStream] = {}
+        self._backlog: Dict[int, List[Message]] = {}
+        self._observers: Dict[Optional[int], List[Observer]] = {None: []}
+        self._frames = 0
+        self._bytes = 0
+
+    @property
+    def streams(self) -> Dict[int, StateStream]:
+        return self._streams
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def attach(self, game: 'BlackJack', table: Optional[int] = None) -> StateStream:
+        table = table if table is not None else len(self._streams)
+        if table in self._streams:
+            raise ValueError(f"The hub already streams table {table}.")
+        if not 0 <= table <= 0xFFFF:
+            raise ValueError(f"Table numbers must fit in 16 bits, Value is {table}.")
+
+        stream = self._streams[table] = StateStream(self, table, game.dealer.position, self._keyframe_every, game.round)
+        self._backlog[table] = []
+        for seat in game.seats_with_players:
+            stream.join(seat.position, seat.player.name, seat.player.cash, seat.player.bankroll.total)
+        stream.keyframe()
+
+        game.events.subscribe(stream)
+        return stream
+
+    def detach(self, game: 'BlackJack', table: int):
+        stream = self._streams.pop(table)
+        stream.flush()
+        game.events.unsubscribe(stream)
+        del self._backlog[table]
+
+    def subscribe(self, observer: Observer, tables: Optional[Iterable[int]] = None) -> Observer:
+        tables = list(tables) if tables is not None else [None]
+        for table in tables:
+            if table is not None and table not in self._streams:
+                raise ValueError(f"The hub is not streaming table {table}.")
+            self._observers.setdefault(table, []).append(observer)
+            self.replay(observer, table)
+        return observer
+
+    def unsubscribe(self, observer: Observer):
+        for observers in self._observers.values():
+            if observer in observers:
+                observers.remove(observer)
+
+    def replay(self, observer: Observer, table: Optional[int] = None):
+        for number in ([table] if table is not None else list(self._backlog)):
+            for message in self._backlog[number]:
+                observer(message)
+
+    def publish(self, frame: Frame):
+        message = encode(frame, self._binary)
+        backlog = self._backlog[frame.table]
+        if frame.kind == KEYFRAME:
+            backlog.clear()
+        backlog.append(message)
+
+        self._frames += 1
+        self._bytes += len(message)
+        for observer in self._observers[None]:
+            observer(message)
+        for observer in self._observers.get(frame.table, ()):
+            observer(message)
+
+    def __repr__(self):
+        return f"StreamHub(tables={len(self._streams)}, frames={self._frames}, bytes={self._bytes})"
+
+class Spectator:
+    # Rebuilds table state from a hub's messages. A gap in the sequence
+    # numbers drops the table until its next keyframe arrives.
+    def __init__(self):
+        self._tables: Dict[int, TableState] = {}
+        self._seqs: Dict[int, int] = {}
+        self._gaps = 0
+
+    @property
+    def tables(self) -> Dict[int, TableState]:
+        return self._tables
+
+    @property
+    def gaps(self) -> int:
+        return self._gaps
+
+    def __call__(self, message: Message):
+        frame = decode(message)
+
+        if frame.kind == KEYFRAME:
+            state = self._tables[frame.table] = TableState()
+        else:
+            state = self._tables.get(frame.table)
+            if state is None:
+                return
+            if frame.seq != self._seqs[frame.table] + 1:
+                self._gaps += 1
+                del self._tables[frame.table]
+                return
+
+        for op in frame.ops:
+            state.apply(*op)
+        self._seqs[frame.table] = frame.seq
\ No newline at end of file
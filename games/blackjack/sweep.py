@@ -0,0 +1,154 @@
+import random
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import product
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from components import Deck
+
+from .blackjack import BlackJack
+from .player import AI
+from .rules import Rules
+
+class Variant(NamedTuple):
+    rules: Rules
+    num_decks: int
+
+    def __str__(self):
+        return f"Variant({self.num_decks}D {self.rules.label})"
+
+class SweepResult(NamedTuple):
+    variant: Variant
+    rounds: int
+    hands: int
+    wagered: int
+    net: int
+
+    @property
+    def house_edge(self) -> float:
+        return -self.net / self.wagered if self.wagered else 0.0
+
+    def merge(self, other: 'SweepResult') -> 'SweepResult':
+        if other.variant != self.variant:
+            raise ValueError(f"Cannot merge results of {other.variant} into {self.variant}.")
+
+        return SweepResult(
+            self.variant,
+            self.rounds + other.rounds,
+            self.hands + other.hands,
+            self.wagered + other.wagered,
+            self.net + other.net,
+        )
+
+    def __str__(self):
+        return f"{self.variant}: house edge {self.house_edge:.3%} over {self.hands} hands"
+
+class FlatBettor(AI):
+    __slots__ = ('_reserve', '_funded', '_hands', '_wagered')
+
+    def __init__(self, reserve: int = 20, name: Optional[str] = None):
+        super().__init__(0, name or "Flat Bettor")
+        self._reserve = reserve
+        self._funded = 0
+        self._hands = 0
+        self._wagered = 0
+
+    @property
+    def hands(self) -> int:
+        return self._hands
+
+    @property
+    def wagered(self) -> int:
+        return self._wagered
+
+    @property
+    def net(self) -> int:
+        return self._bankroll.total - self._funded
+
+    def _make_bet(self, min_bet: int, max_bet: Optional[int] = None) -> str:
+        self._table_min_bet = min_bet
+
+        top_up = self._reserve * min_bet - self._bankroll.total
+        if top_up > 0:
+            self.pay(top_up)
+            self._funded += top_up
+
+        self._current_bet = min_bet
+        self._hands += 1
+        self._wagered += min_bet
+        return str(min_bet)
+
+@lru_cache(maxsize=None)
+def _standard_shoe(num_decks: int) -> Deck:
+    return Deck.create_standard_deck(num_decks)
+
+def _play_variant(variant: Variant, rounds: int, seed: int, min_bet: int, seats: int) -> SweepResult:
+    random.seed(seed)
+
+    table = BlackJack(min_bet, num_decks=variant.num_decks, limit=seats, rules=variant.rules, deck=_standard_shoe(variant.num_decks))
+    bettors = [FlatBettor(name=f"Seat{index}") for index in range(seats)]
+    for bettor in bettors:
+        table.join(bettor)
+
+    for _ in range(rounds):
+        table.play()
+
+    return SweepResult(
+        variant,
+        rounds,
+        sum(bettor.hands for bettor in bettors),
+        sum(bettor.wagered for bettor in bettors),
+        sum(bettor.net for bettor in bettors),
+    )
+
+def _run_task(task: tuple) -> Any:
+    fn, args = task
+    return fn(*args)
+
+def parallel_imap(fn: Callable, tasks: Sequence[tuple], processes: Optional[int] = None, chunksize: Optional[int] = None) -> Iterator[Any]:
+    if processes == 1 or len(tasks) <= 1:
+        for args in tasks:
+            yield fn(*args)
+        return
+
+    chunksize = chunksize or max(1, len(tasks) // (4 * (processes or 4)))
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        yield from pool.map(_run_task, [(fn, args) for args in tasks], chunksize=chunksize)
+
+def parallel_map(fn: Callable, tasks: Sequence[tuple], processes: Optional[int] = None) -> List[Any]:
+    return list(parallel_imap(fn, tasks, processes))
+
+def variant_grid(num_decks: Iterable[int] = (8,), base: Optional[Rules] = None, **axes: Iterable[Any]) -> List[Variant]:
+    base = base or Rules()
+    unknown = set(axes) - set(Rules._fields)
+    if unknown:
+        raise ValueError(f"Unknown rule axes: {', '.join(sorted(unknown))}. Valid axes are {list(Rules._fields)}")
+
+    names = list(axes)
+    variants = []
+    for decks in num_decks:
+        for values in product(*(axes[name] for name in names)):
+            variants.append(Variant(base._replace(**dict(zip(names, values))), decks))
+    return variants
+
+def sweep(variants: Iterable[Variant], rounds: int, seed: int = 0, min_bet: int = 25, seats: int = 1, chunks: int = 1, processes: Optional[int] = None) -> List[SweepResult]:
+    variants = list(variants)
+    if chunks < 1:
+        raise ValueError("A sweep needs at least one chunk per variant.")
+
+    # Every variant plays the same seeded shoes so rule differences are
+    # measured on common random numbers instead of independent noise.
+    per_chunk = -(-rounds // chunks)
+    tasks = [
+        (variant, min(per_chunk, rounds - chunk * per_chunk), seed + chunk, min_bet, seats)
+        for variant in variants
+        for chunk in range(chunks)
+        if rounds - chunk * per_chunk > 0
+    ]
+
+    results = {}
+    for result in parallel_map(_play_variant, tasks, processes):
+        results[result.variant] = results[result.variant].merge(result) if result.variant in results else result
+
+    return [results[variant] for variant in variants if variant in results]
\ No newline at end of file
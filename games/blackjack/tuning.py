@@ -0,0 +1,152 @@
+import random
+
+from itertools import product
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from components import Symbol
+
+from . import cache
+from .blackjack import BlackJack
+from .player import AI
+from .rules import Rules
+from .sweep import parallel_imap
+
+class AIConfig(NamedTuple):
+    cash: int = 1000
+    safe_bankroll: int = 400
+    risk_cap: float = 0.25
+    high_cards: Tuple[str, ...] = tuple(symbol.name for symbol in AI.high_cards)
+    low_cards: Tuple[str, ...] = tuple(symbol.name for symbol in AI.low_cards)
+
+    def build(self, name: Optional[str] = None) -> AI:
+        return AI(
+            self.cash,
+            name,
+            safe_bankroll=self.safe_bankroll,
+            risk_cap=self.risk_cap,
+            high_cards=[Symbol[card] for card in self.high_cards],
+            low_cards=[Symbol[card] for card in self.low_cards],
+        )
+
+class TuningResult(NamedTuple):
+    config: AIConfig
+    seed: int
+    rounds: int
+    wealth: int
+    peak: int
+    max_drawdown: int
+    ruined: bool
+
+    @property
+    def net(self) -> int:
+        return self.wealth - self.config.cash
+
+    def to_dict(self) -> dict:
+        return {**self._asdict(), 'config': self.config._asdict()}
+
+    @staticmethod
+    def from_dict(data: dict) -> 'TuningResult':
+        config = data['config']
+        config = AIConfig(**{**config, 'high_cards': tuple(config['high_cards']), 'low_cards': tuple(config['low_cards'])})
+        return TuningResult(**{**data, 'config': config})
+
+class TuningSummary(NamedTuple):
+    config: AIConfig
+    runs: int
+    mean_net: float
+    mean_rounds: float
+    ruin_rate: float
+
+    def __str__(self):
+        return f"{self.config}: net={self.mean_net:+.2f}, rounds={self.mean_rounds:.0f}, ruin={self.ruin_rate:.1%} over {self.runs} seeds"
+
+def _evaluate(config: AIConfig, seed: int, rounds: int, min_bet: int, rules: Rules, num_decks: int) -> TuningResult:
+    random.seed(seed)
+
+    table = BlackJack(min_bet, num_decks=num_decks, rules=rules)
+    player = config.build("Tuned")
+    table.join(player)
+
+    peak = wealth = config.cash
+    max_drawdown = 0
+    played = 0
+
+    for played in range(1, rounds + 1):
+        if table.play() == False:
+            break
+
+        wealth = player.cash + player.bankroll.total
+        peak = max(peak, wealth)
+        max_drawdown = max(max_drawdown, peak - wealth)
+
+    wealth = player.cash + player.bankroll.total
+    return TuningResult(config, seed, played, wealth, peak, max_drawdown, wealth < min_bet)
+
+def grid(base: Optional[AIConfig] = None, **axes: Iterable[Any]) -> List[AIConfig]:
+    base = base or AIConfig()
+    unknown = set(axes) - set(AIConfig._fields)
+    if unknown:
+        raise ValueError(f"Unknown AI parameters: {', '.join(sorted(unknown))}. Valid parameters are {list(AIConfig._fields)}")
+
+    names = list(axes)
+    return [base._replace(**dict(zip(names, values))) for values in product(*(axes[name] for name in names))]
+
+def random_search(samples: int, seed: int = 0, base: Optional[AIConfig] = None, **space: Any) -> List[AIConfig]:
+    base = base or AIConfig()
+    unknown = set(space) - set(AIConfig._fields)
+    if unknown:
+        raise ValueError(f"Unknown AI parameters: {', '.join(sorted(unknown))}. Valid parameters are {list(AIConfig._fields)}")
+
+    # A (low, high) tuple of numbers is a continuous range; anything else is
+    # a list of discrete choices.
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(samples):
+        values = {}
+        for name, domain in space.items():
+            if isinstance(domain, tuple) and len(domain) == 2 and all(isinstance(bound, (int, float)) for bound in domain):
+                low, high = domain
+                values[name] = rng.randint(low, high) if isinstance(low, int) and isinstance(high, int) else rng.uniform(low, high)
+            else:
+                values[name] = rng.choice(list(domain))
+        configs.append(base._replace(**values))
+    return configs
+
+def tune(configs: Iterable[AIConfig], rounds: int, seeds: Sequence[int] = (0,), min_bet: int = 25, rules: Optional[Rules] = None, num_decks: int = 8, processes: Optional[int] = None, cache_dir: Optional[str] = None) -> List[TuningResult]:
+    rules = rules or Rules()
+    cells = [(config, seed) for config in dict.fromkeys(configs) for seed in seeds]
+    keys = {cell: cache.cache_key(cell[0], cell[1], rounds, min_bet, rules, num_decks) for cell in cells}
+
+    results: Dict[Tuple[AIConfig, int], TuningResult] = {}
+    for cell in cells:
+        cached = cache.load("tuning", keys[cell], cache_dir)
+        if cached is not None:
+            results[cell] = TuningResult.from_dict(cached)
+
+    # Each finished cell is written as soon as it arrives, so an interrupted
+    # sweep resumes with only the missing cells.
+    missing = [cell for cell in cells if cell not in results]
+    tasks = [(config, seed, rounds, min_bet, rules, num_decks) for config, seed in missing]
+    for result in parallel_imap(_evaluate, tasks, processes, chunksize=1):
+        cell = (result.config, result.seed)
+        cache.save("tuning", keys[cell], result.to_dict(), cache_dir)
+        results[cell] = result
+
+    return [results[cell] for cell in cells]
+
+def summarize(results: Iterable[TuningResult]) -> List[TuningSummary]:
+    grouped: Dict[AIConfig, List[TuningResult]] = {}
+    for result in results:
+        grouped.setdefault(result.config, []).append(result)
+
+    summaries = [
+        TuningSummary(
+            config,
+            len(runs),
+            sum(run.net for run in runs) / len(runs),
+            sum(run.rounds for run in runs) / len(runs),
+            sum(run.ruined for run in runs) / len(runs),
+        )
+        for config, runs in grouped.items()
+    ]
+    return sorted(summaries, key=lambda summary: summary.mean_net, reverse=True)
\ No newline at end of file
@@ -1,8 +1,21 @@
+from enum import IntEnum
+
 from components import Symbol, Deck
 
+class Outcome(IntEnum):
+    LOSS = 0
+    WIN = 1
+    PUSH = 2
+    BLACKJACK = 3
+    SURRENDER = 4
+    BUST = 5
+
 def ace_total(cards: Deck) -> int:
     total = cards.total
     if sum(1 for card in cards if card.symbol is Symbol.ACE) > 0:
         alt_total = total + 10
         return alt_total if alt_total <= 21 else total
-    return total
\ No newline at end of file
+    return total
+
+def is_soft(cards: Deck) -> bool:
+    return cards.total + 10 <= 21 and any(card.symbol is Symbol.ACE for card in cards)
\ No newline at end of file
@@ -0,0 +1,281 @@
+from typing import Dict, Iterable, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from components import Chip, Color, Wheel
+
+# Progressions are written as state machines over arrays with one row per
+# session. units() gives each session's next stake in base units and
+# settle() advances the state from the outcome of that stake.
+class Progression:
+    name = "Flat"
+
+    def start(self, size: int):
+        self._size = size
+
+    def units(self) -> np.ndarray:
+        return np.ones(self._size, dtype=np.int64)
+
+    def settle(self, won: np.ndarray):
+        pass
+
+    def select(self, rows: np.ndarray):
+        self._size = len(rows)
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+class Martingale(Progression):
+    name = "Martingale"
+
+    # Doubling past 2^40 units is far beyond any table limit.
+    MAX_LEVEL = 40
+
+    def start(self, size: int):
+        self._level = np.zeros(size, dtype=np.int64)
+
+    def units(self) -> np.ndarray:
+        return np.left_shift(1, self._level)
+
+    def settle(self, won: np.ndarray):
+        self._level = np.where(won, 0, np.minimum(self._level + 1, self.MAX_LEVEL))
+
+    def select(self, rows: np.ndarray):
+        self._level = self._level[rows]
+
+def _fibonacci(count: int) -> list:
+    numbers = [1, 1]
+    while len(numbers) < count:
+        numbers.append(numbers[-1] + numbers[-2])
+    return numbers
+
+class Fibonacci(Progression):
+    name = "Fibonacci"
+
+    SEQUENCE = np.array(_fibonacci(60), dtype=np.int64)
+
+    def start(self, size: int):
+        self._index = np.zeros(size, dtype=np.int64)
+
+    def units(self) -> np.ndarray:
+        return self.SEQUENCE[self._index]
+
+    def settle(self, won: np.ndarray):
+        self._index = np.where(won, np.maximum(self._index - 2, 0), np.minimum(self._index + 1, len(self.SEQUENCE) - 1))
+
+    def select(self, rows: np.ndarray):
+        self._index = self._index[rows]
+
+class DAlembert(Progression):
+    name = "D'Alembert"
+
+    def start(self, size: int):
+        self._units = np.ones(size, dtype=np.int64)
+
+    def units(self) -> np.ndarray:
+        return self._units
+
+    def settle(self, won: np.ndarray):
+        self._units = np.where(won, np.maximum(self._units - 1, 1), self._units + 1)
+
+    def select(self, rows: np.ndarray):
+        self._units = self._units[rows]
+
+class Labouchere(Progression):
+    name = "Labouchère"
+
+    def __init__(self, line: Sequence[int] = (1, 2, 3, 4), width: int = 64):
+        if not line or min(line) < 1:
+            raise ValueError(f"A Labouchère line needs at least one positive number, Value is {list(line)}.")
+        if width < len(line) + 1:
+            raise ValueError(f"Line width must leave room to grow past the starting line, Value is {width}.")
+
+        self._line = np.array(line, dtype=np.int64)
+        self._width = width
+
+    # Each session's line lives in a fixed width row between _head and
+    # _tail. Wins move both ends inward, losses append at the tail, and a
+    # row is compacted only when its tail reaches the edge.
+    def start(self, size: int):
+        self._numbers = np.zeros((size, self._width), dtype=np.int64)
+        self._head = np.zeros(size, dtype=np.int64)
+        self._tail = np.zeros(size, dtype=np.int64)
+        self._abandoned = np.zeros(size, dtype=np.int64)
+        self._restart(np.arange(size))
+
+    def _restart(self, rows: np.ndarray):
+        self._numbers[rows, :len(self._line)] = self._line
+        self._head[rows] = 0
+        self._tail[rows] = len(self._line)
+
+    @property
+    def abandoned(self) -> np.ndarray:
+        return self._abandoned
+
+    def units(self) -> np.ndarray:
+        rows = np.arange(len(self._head))
+        first = self._numbers[rows, self._head]
+        last = self._numbers[rows, self._tail - 1]
+        return np.where(self._tail - self._head == 1, first, first + last)
+
+    def settle(self, won: np.ndarray):
+        stake = self.units()
+        single = self._tail - self._head == 1
+
+        self._head += won
+        self._tail -= won & ~single
+        finished = np.flatnonzero(self._head >= self._tail)
+        if finished.size:
+            self._restart(finished)
+
+        lost = np.flatnonzero(~won)
+        full = lost[self._tail[lost] == self._width]
+        if full.size:
+            columns = (np.arange(self._width) + self._head[full, None]) % self._width
+            self._numbers[full] = np.take_along_axis(self._numbers[full], columns, axis=1)
+            self._tail[full] -= self._head[full]
+            self._head[full] = 0
+
+            # A line that fills its row without any crossed off numbers is
+            # given up and started over.
+            stuck = full[self._tail[full] == self._width]
+            self._abandoned[stuck] += 1
+            self._restart(stuck)
+
+        self._numbers[lost, self._tail[lost]] = stake[lost]
+        self._tail[lost] += 1
+
+    def select(self, rows: np.ndarray):
+        self._numbers = self._numbers[rows]
+        self._head = self._head[rows]
+        self._tail = self._tail[rows]
+        self._abandoned = self._abandoned[rows]
+
+    def __repr__(self):
+        return f"Labouchere(line={self._line.tolist()}, width={self._width})"
+
+PROGRESSIONS = {
+    'flat': Progression,
+    'martingale': Martingale,
+    'fibonacci': Fibonacci,
+    'dalembert': DAlembert,
+    'labouchere': Labouchere,
+}
+
+class SessionStats(NamedTuple):
+    progression: str
+    sessions: int
+    spins: int
+    bankroll: int
+    busted: np.ndarray
+    reached: np.ndarray
+    capped: np.ndarray
+    lengths: np.ndarray
+    wealth: np.ndarray
+
+    @property
+    def bust_rate(self) -> float:
+        return float(self.busted.mean())
+
+    @property
+    def target_rate(self) -> float:
+        return float(self.reached.mean())
+
+    @property
+    def capped_rate(self) -> float:
+        return float(self.capped.mean())
+
+    @property
+    def mean_net(self) -> float:
+        return float(self.wealth.mean() - self.bankroll)
+
+    def length_percentiles(self, qs: Iterable[float] = (0.05, 0.25, 0.5, 0.75, 0.95)) -> Dict[float, float]:
+        return {q: float(np.quantile(self.lengths, q)) for q in qs}
+
+    def length_histogram(self, bins: int = 20) -> Dict[str, np.ndarray]:
+        counts, edges = np.histogram(self.lengths, bins=bins, range=(0, self.spins))
+        return {'counts': counts, 'edges': edges}
+
+    def __str__(self):
+        percentiles = ", ".join(f"p{int(q * 100)}={value:.0f}" for q, value in self.length_percentiles().items())
+        return f"SessionStats({self.progression}, sessions={self.sessions}, bust={self.bust_rate:.2%}, target={self.target_rate:.2%}, capped={self.capped_rate:.2%}, net={self.mean_net:+.2f}, {percentiles})"
+
+def winning_pockets(color: Color = Color.RED, wheel: Optional[Wheel] = None) -> np.ndarray:
+    wheel = wheel or Wheel()
+    if color not in (Color.RED, Color.BLACK):
+        raise ValueError(f"Even money bets are placed on red or black, Value is {color}.")
+    return np.array([spoke.color is color for spoke in wheel.wheel])
+
+def simulate(progression: Progression, sessions: int = 100000, bankroll: int = 1000, base_bet: Optional[int] = None, min_bet: int = 5, max_bet: Optional[int] = 500, target: Optional[int] = None, spins: int = 1000, color: Color = Color.RED, seed: Optional[int] = None, block: int = 256) -> SessionStats:
+    unit = Chip.min_value()
+    base_bet = base_bet or min_bet
+    if base_bet < min_bet or base_bet % unit:
+        raise ValueError(f"The base bet must be a multiple of {unit} and at least the table minimum {min_bet}. Value is {base_bet}.")
+    if max_bet is not None and max_bet < min_bet:
+        raise ValueError(f"The table maximum cannot be below the minimum. Values are {min_bet} and {max_bet}.")
+
+    rng = np.random.default_rng(seed)
+    wins = winning_pockets(color)
+
+    wealth = np.full(sessions, bankroll, dtype=np.int64)
+    busted = np.zeros(sessions, dtype=bool)
+    reached = np.zeros(sessions, dtype=bool)
+    capped = np.zeros(sessions, dtype=bool)
+    lengths = np.full(sessions, spins, dtype=np.int64)
+
+    # Finished sessions are compacted out as in estimate_ruin, so the cost of
+    # a block follows the sessions still at the table.
+    active = np.arange(sessions)
+    a_wealth, a_capped = wealth.copy(), capped.copy()
+
+    # Every stake is a whole number of chips, so wealth keeps the same
+    # remainder and only the table maximum needs rounding down to a chip.
+    limit = None if max_bet is None else max_bet - max_bet % unit
+    spare = bankroll % unit
+    progression.start(sessions)
+    played = 0
+
+    while played < spins and len(active):
+        steps = min(block, spins - played)
+        # Spins are drawn for every session, finished or not, so session i
+        # sees the same wheel whichever progression is being played.
+        outcomes = np.take(wins[rng.integers(len(wins), size=(steps, sessions), dtype=np.uint8)], active, axis=1)
+
+        for step in range(steps):
+            wanted = progression.units() * base_bet
+            bet = wanted if limit is None else np.minimum(wanted, limit)
+            a_capped |= bet < wanted
+            bet = np.minimum(bet, a_wealth - spare)
+
+            broke = bet < min_bet
+            done = broke | (a_wealth >= target if target is not None else False)
+            if done.any():
+                gone = active[done]
+                wealth[gone] = a_wealth[done]
+                lengths[gone] = played + step
+                busted[gone] = broke[done]
+                reached[gone] = ~broke[done]
+                capped[gone] = a_capped[done]
+
+                staying = np.flatnonzero(~done)
+                active, a_wealth, a_capped, bet = active[staying], a_wealth[staying], a_capped[staying], bet[staying]
+                outcomes = np.take(outcomes, staying, axis=1)
+                progression.select(staying)
+
+                if not len(active):
+                    break
+
+            won = outcomes[step]
+            a_wealth += np.where(won, bet, -bet)
+            progression.settle(won)
+
+        played += steps
+
+    wealth[active] = a_wealth
+    capped[active] = a_capped
+    return SessionStats(progression.name, sessions, played, bankroll, busted, reached, capped, lengths, wealth)
+
+def compare(progressions: Iterable[Progression], seed: Optional[int] = None, **kwargs) -> Dict[str, SessionStats]:
+    # Every progression sees the same spins, so differences between them are
+    # not sampling noise.
+    return {progression.name: simulate(progression, seed=seed, **kwargs) for progression in progressions}
\ No newline at end of file
@@ -0,0 +1,262 @@
+import math
+
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from components import Spoke, Wheel
+
+def chi_square_sf(statistic: float, dof: int) -> float:
+    # Upper tail of the chi-square distribution, the regularized upper
+    # incomplete gamma Q(dof / 2, statistic / 2).
+    a, x = dof / 2, statistic / 2
+    if x <= 0:
+        return 1.0
+
+    if x < a + 1:
+        term = total = 1 / a
+        for n in range(1, 1000):
+            term *= x / (a + n)
+            total += term
+            if term < total * 1e-15:
+                break
+        return max(0.0, 1 - total * math.exp(-x + a * math.log(x) - math.lgamma(a)))
+
+    b = x + 1 - a
+    c = 1 / 1e-300
+    d = 1 / b
+    h = d
+    for n in range(1, 1000):
+        an = -n * (n - a)
+        b += 2
+        d = an * d + b
+        d = 1e-300 if abs(d) < 1e-300 else d
+        c = b + an / c
+        c = 1e-300 if abs(c) < 1e-300 else c
+        d = 1 / d
+        h *= d * c
+        if abs(d * c - 1) < 1e-15:
+            break
+    return min(1.0, math.exp(-x + a * math.log(x) - math.lgamma(a)) * h)
+
+class BiasReport(NamedTuple):
+    spins: int
+    chi_square: float
+    p_value: float
+    window_spins: int
+    window_chi_square: float
+    window_p_value: float
+    hot_pocket: Optional[str]
+    hot_sector: Optional[List[str]]
+    sector_z: float
+    sector_p_value: float
+
+    def biased(self, alpha: float = 0.001) -> bool:
+        return min(self.p_value, self.window_p_value, self.sector_p_value) < alpha
+
+    def __str__(self):
+        sector = "-".join(self.hot_sector) if self.hot_sector else None
+        return f"BiasReport(spins={self.spins}, chi2={self.chi_square:.1f} p={self.p_value:.3g}, window chi2={self.window_chi_square:.1f} p={self.window_p_value:.3g}, hot pocket={self.hot_pocket}, hot sector={sector} z={self.sector_z:.2f} p={self.sector_p_value:.3g})"
+
+class _Tally:
+    # Pocket counts, counts of every run of `width` neighboring pockets on
+    # the wheel, and the running sum of squared pocket counts that makes the
+    # chi-square statistic an O(1) update.
+    __slots__ = ('counts', 'sectors', 'squares', 'spins')
+
+    def __init__(self, pockets: int):
+        self.counts = [0] * pockets
+        self.sectors = [0] * pockets
+        self.squares = 0
+        self.spins = 0
+
+    def add(self, position: int, covers: Sequence[int]):
+        count = self.counts[position]
+        self.squares += 2 * count + 1
+        self.counts[position] = count + 1
+        for sector in covers:
+            self.sectors[sector] += 1
+        self.spins += 1
+
+    def remove(self, position: int, covers: Sequence[int]):
+        count = self.counts[position]
+        self.squares -= 2 * count - 1
+        self.counts[position] = count - 1
+        for sector in covers:
+            self.sectors[sector] -= 1
+        self.spins -= 1
+
+    def add_counts(self, delta: np.ndarray, width: int):
+        counts = np.array(self.counts, dtype=np.int64) + delta
+        sectors = sum(np.roll(counts, -offset) for offset in range(width))
+        self.counts = counts.tolist()
+        self.sectors = sectors.tolist()
+        self.squares = int((counts * counts).sum())
+        self.spins = int(counts.sum())
+
+class BiasDetector:
+    def __init__(self, wheel: Optional[Wheel] = None, window: int = 3800, sector: int = 5):
+        wheel = wheel or Wheel()
+        self._labels = [spoke.label for spoke in wheel.wheel]
+        self._positions = {label: position for position, label in enumerate(self._labels)}
+        pockets = len(self._labels)
+
+        if not 0 < sector < pockets:
+            raise ValueError(f"A sector must span between 1 and {pockets - 1} pockets, Value is {sector}.")
+        if window < 1:
+            raise ValueError(f"The rolling window must hold at least one spin, Value is {window}.")
+
+        self._pockets = pockets
+        self._sector = sector
+        self._window = window
+
+        # Sector j covers wheel positions j to j + sector - 1, so a spin at
+        # position p lands in the sectors starting at p - sector + 1 to p.
+        self._covers = [tuple((position - offset) % pockets for offset in range(sector)) for position in range(pockets)]
+
+        self._total = _Tally(pockets)
+        self._recent = _Tally(pockets)
+
+        # Positions of the last `window` spins, oldest at _head once full.
+        self._ring = bytearray(window)
+        self._head = 0
+        self._filled = 0
+
+    @property
+    def labels(self) -> List[str]:
+        return self._labels
+
+    @property
+    def spins(self) -> int:
+        return self._total.spins
+
+    @property
+    def window(self) -> int:
+        return self._window
+
+    @property
+    def counts(self) -> np.ndarray:
+        return np.array(self._total.counts)
+
+    @property
+    def window_counts(self) -> np.ndarray:
+        return np.array(self._recent.counts)
+
+    def encode(self, spins: Iterable[Union[Spoke, str]]) -> np.ndarray:
+        labels = np.array([spin.label if isinstance(spin, Spoke) else str(spin) for spin in spins])
+        if not labels.size:
+            return np.zeros(0, dtype=np.uint8)
+
+        # Labels are mapped through their distinct values, so a log costs one
+        # dictionary lookup per pocket rather than one per spin.
+        unique, inverse = np.unique(labels, return_inverse=True)
+        missing = [label for label in unique.tolist() if label not in self._positions]
+        if missing:
+            raise ValueError(f"Spins must be wheel labels such as '0' or '00', Values are {missing}.")
+        return np.array([self._positions[label] for label in unique.tolist()], dtype=np.uint8)[inverse]
+
+    def update(self, spin: Union[Spoke, str]):
+        label = spin.label if isinstance(spin, Spoke) else spin
+        if label not in self._positions:
+            raise ValueError(f"Spins must be wheel labels such as '0' or '00', Value is {label!r}.")
+        position = self._positions[label]
+
+        covers = self._covers[position]
+        self._total.add(position, covers)
+
+        head = self._head
+        if self._filled == self._window:
+            old = self._ring[head]
+            self._recent.remove(old, self._covers[old])
+        else:
+            self._filled += 1
+        self._recent.add(position, covers)
+
+        self._ring[head] = position
+        self._head = (head + 1) % self._window
+
+    def update_many(self, positions: np.ndarray):
+        positions = np.asarray(positions, dtype=np.uint8)
+        if not positions.size:
+            return
+
+        pockets, window = self._pockets, self._window
+        self._total.add_counts(np.bincount(positions, minlength=pockets), self._sector)
+        ring = np.frombuffer(self._ring, dtype=np.uint8)
+
+        if len(positions) >= window:
+            ring[:] = positions[-window:]
+            self._recent = _Tally(pockets)
+            self._recent.add_counts(np.bincount(ring, minlength=pockets), self._sector)
+            self._head, self._filled = 0, window
+            return
+
+        # Slots about to be overwritten hold the oldest spins once the ring
+        # is full; before that only the slots already written are evicted.
+        slots = (self._head + np.arange(len(positions))) % window
+        evicted = ring[slots] if self._filled == window else ring[slots[slots < self._filled]]
+        delta = np.bincount(positions, minlength=pockets) - np.bincount(evicted, minlength=pockets)
+        self._recent.add_counts(delta, self._sector)
+
+        ring[slots] = positions
+        self._head = (self._head + len(positions)) % window
+        self._filled = min(window, self._filled + len(positions))
+
+    def _chi_square(self, tally: _Tally) -> float:
+        if not tally.spins:
+            return 0.0
+        return self._pockets * tally.squares / tally.spins - tally.spins
+
+    def report(self) -> BiasReport:
+        pockets, total, recent = self._pockets, self._total, self._recent
+        chi_square = self._chi_square(total)
+        window_chi_square = self._chi_square(recent)
+
+        hot_pocket, hot_sector, z, sector_p = None, None, 0.0, 1.0
+        if total.spins:
+            hot = max(range(pockets), key=total.counts.__getitem__)
+            hot_pocket = self._labels[hot]
+
+            # The busiest sector is scored against a binomial count and the
+            # p-value is Bonferroni corrected for the sectors scanned.
+            share = self._sector / pockets
+            start = max(range(pockets), key=total.sectors.__getitem__)
+            expected = total.spins * share
+            z = (total.sectors[start] - expected) / math.sqrt(expected * (1 - share))
+            sector_p = min(1.0, pockets * 0.5 * math.erfc(z / math.sqrt(2)))
+            hot_sector = [self._labels[(start + offset) % pockets] for offset in range(self._sector)]
+
+        return BiasReport(
+            total.spins,
+            chi_square,
+            chi_square_sf(chi_square, pockets - 1) if total.spins else 1.0,
+            recent.spins,
+            window_chi_square,
+            chi_square_sf(window_chi_square, pockets - 1) if recent.spins else 1.0,
+            hot_pocket,
+            hot_sector,
+            z,
+            sector_p,
+        )
+
+    def scan(self, positions: np.ndarray, chunk: int = 3800) -> Iterator[BiasReport]:
+        positions = np.asarray(positions, dtype=np.uint8)
+        for start in range(0, len(positions), chunk):
+            self.update_many(positions[start:start + chunk])
+            yield self.report()
+
+    def reset(self):
+        self._total = _Tally(self._pockets)
+        self._recent = _Tally(self._pockets)
+        self._ring = bytearray(self._window)
+        self._head = 0
+        self._filled = 0
+
+    def __repr__(self):
+        return f"BiasDetector(spins={self.spins}, window={self._window}, sector={self._sector})"
+
+def read_log(path: str, detector: Optional[BiasDetector] = None) -> np.ndarray:
+    # One wheel label per line; blank lines are skipped.
+    detector = detector or BiasDetector()
+    with open(path) as file:
+        return detector.encode(line.strip() for line in file if line.strip())
\ No newline at end of file
@@ -1,7 +1,10 @@
-from typing import List
+from typing import List, Optional
 
 from components import *
 from games import *
+from games.blackjack.stats import BankrollAggregator
+from games.blackjack.checkpoint import Checkpointer
+from components.metrics import Registry, MetricsServer, MetricsFile, Progress
 
 def main():
     print("TESTING:")
@@ -10,49 +13,73 @@ def main():
     players: List[Player] = []
     player_limit = 6
     narrate_speed = 0
+    checkpoint_dir: Optional[str] = None
+    checkpoint_every = 1000
+    metrics_port: Optional[int] = None
+    metrics_file: Optional[str] = None
 
-    if local:
-        narrate_speed = 1.5
-        while len(players) < player_limit:
-            response = bool_input("\nWould you like to add a player? (Y/N)\n")
-            if response:
-                name = input("Player Name: ")
-                cash = int(input("Starting Cash: "))
-                players.append(Player(cash, name))
-            else:
-                break
+    metrics = Registry()
+    server = MetricsServer(metrics, metrics_port).start() if metrics_port else None
+    exporter = MetricsFile(metrics, metrics_file).start() if metrics_file else None
+
+    checkpoints = Checkpointer(checkpoint_dir, checkpoint_every) if checkpoint_dir else None
+    resumed = checkpoints.resume() if checkpoints is not None else None
 
-        if len(players) < player_limit:
+    if resumed is not None:
+        blackjack = resumed.table
+        blackjack.attach_metrics(metrics)
+        players, stats = resumed.extra
+        games = resumed.round
+        print(f"\nResuming from game # {games}...")
+    else:
+        if local:
+            narrate_speed = 1.5
             while len(players) < player_limit:
-                response = bool_input("\nWould you like to add an AI player? (Y/N)\n")
+                response = bool_input("\nWould you like to add a player? (Y/N)\n")
                 if response:
+                    name = input("Player Name: ")
                     cash = int(input("Starting Cash: "))
-                    players.append(AI(cash))
+                    players.append(Player(cash, name))
                 else:
                     break
-    else:
-        players.append(AI(1000, "Alejandro"))
-        players.append(AI(750))
-        players.append(AI(500))
-        players.append(AI(400))
-        players.append(AI(300))
-        players.append(AI(200))
-    
 
-    print("\nJoining game...")
-    
-    blackjack = BlackJack(25, narrate=True, narrate_speed=narrate_speed)
-    for player in players:
-        if not isinstance(player, AI):
-            player.buy_in()
-        blackjack.join(player)
+            if len(players) < player_limit:
+                while len(players) < player_limit:
+                    response = bool_input("\nWould you like to add an AI player? (Y/N)\n")
+                    if response:
+                        cash = int(input("Starting Cash: "))
+                        players.append(AI(cash))
+                    else:
+                        break
+        else:
+            players.append(AI(1000, "Alejandro"))
+            players.append(AI(750))
+            players.append(AI(500))
+            players.append(AI(400))
+            players.append(AI(300))
+            players.append(AI(200))
 
-    for seat in blackjack.seats_with_players:
-        print(repr(seat.player))
-    
-    print()
 
-    games = 0
+        print("\nJoining game...")
+
+        blackjack = BlackJack(25, narrate=True, narrate_speed=narrate_speed, metrics=metrics)
+        for player in players:
+            if not isinstance(player, AI):
+                player.buy_in()
+            blackjack.join(player)
+
+        for seat in blackjack.seats_with_players:
+            print(repr(seat.player))
+
+        print()
+
+        stats = BankrollAggregator()
+        stats.observe(blackjack, players)
+
+        games = 0
+
+    progress = Progress("Game", interval=0 if narrate_speed > 0 else 2.0)
+
     try:
         while True:
             games += 1
@@ -60,19 +87,33 @@ def main():
             if games > 10000:
                 break
             
-            if narrate_speed > 0 or True:
-                print(f"Game # {games}")
+            progress.update()
 
             if blackjack.play() == False:
                 break
 
+            stats.observe(blackjack, players)
+
+            if checkpoints is not None:
+                checkpoints.maybe_save(blackjack, games, (players, stats))
+
     except Exception as e:
         print(e)
         exit()
 
+    if checkpoints is not None:
+        checkpoints.wait()
+
+    if server is not None:
+        server.stop()
+    if exporter is not None:
+        exporter.stop()
+
     print(f"\nGames Player: {games}\n")
     for player in players:
         print(repr(player))
 
+    print(f"\n{stats.report()}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file